@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import warnings
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 
 from .client.default import DefaultConnectionProperties
-from .client.ssl import with_default_connector
-from .connection.base import BaseConnection
+from .client.ssl import create_default_connector, with_default_connector
+from .connection.base import DOWNLOAD_CHUNK_SIZE, BaseConnection
 from .enums.sender_action import SenderAction
 from .exceptions.max import InvalidToken
 from .loggers import logger_bot
@@ -44,12 +45,23 @@ from .methods.send_message import SendMessage
 from .methods.set_commands import SetCommands
 from .methods.subscribe_webhook import SubscribeWebhook
 from .methods.unsubscribe_webhook import UnsubscribeWebhook
+from .types.input_media import InputMediaStream, upload_type_for_mime
+from .utils.broadcast import DEFAULT_BROADCAST_CONCURRENCY, Broadcaster
 from .utils.message import process_input_media
+from .utils.readiness import FixedReadinessPolicy
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Iterable,
+        Sequence,
+    )
     from datetime import datetime
+    from pathlib import Path
 
+    from .client.metrics import ClientMetrics
+    from .connection.upload import ProgressCallback
     from .dispatcher import Dispatcher
     from .enums.parse_mode import ParseMode, TextFormat
     from .enums.update import UpdateType
@@ -87,6 +99,10 @@ if TYPE_CHECKING:
     from .types.message import Message, Messages, NewMessageLink
     from .types.updates.message_callback import MessageForCallback
     from .types.users import ChatAdmin, User
+    from .utils.broadcast import BroadcastStats
+    from .utils.entity_cache import BaseEntityCache
+    from .utils.readiness import ReadinessPolicy
+    from .utils.upload_cache import BaseUploadCache
 
 
 class Bot(BaseConnection):
@@ -113,6 +129,9 @@ class Bot(BaseConnection):
         after_upload_give_up_timeout: float | None = None,
         auto_check_subscriptions: bool = True,
         marker_updates: int | None = None,
+        entity_cache: BaseEntityCache | None = None,
+        upload_cache: BaseUploadCache | None = None,
+        readiness_policy: ReadinessPolicy | None = None,
     ):
         """
         Инициализирует экземпляр бота.
@@ -153,6 +172,21 @@ class Bot(BaseConnection):
                 метода start_polling.
             marker_updates: Маркер для получения
                 обновлений.
+            entity_cache: Кеш чатов и участников
+                для автозаполнения chat/from_user (например,
+                MemoryEntityCache). None — без кеша (по умолчанию).
+                Кеш обновляется по входящим событиям: смена
+                названия чата, добавление/удаление участников,
+                удаление бота из чата.
+            upload_cache: Кеш токенов загруженных файлов (например,
+                MemoryUploadCache). Повторная отправка того же файла
+                не загружает его заново. None — без кеша
+                (по умолчанию).
+            readiness_policy: Политика ожидания готовности вложений
+                после загрузки (например, AdaptiveReadinessPolicy).
+                None — фиксированные паузы
+                ``after_input_media_delay`` и
+                ``after_upload_retry_delay`` (по умолчанию).
         """
 
         super().__init__()
@@ -206,10 +240,42 @@ class Bot(BaseConnection):
         self.notify = notify
         self.disable_link_preview = disable_link_preview
         self.auto_requests = auto_requests
+        self.entity_cache = entity_cache
+        self.upload_cache = upload_cache
+        self._readiness_policy = readiness_policy
 
         self.dispatcher: Dispatcher | None = None
         self._me: User | None = None
 
+    @property
+    def readiness_policy(self) -> ReadinessPolicy:
+        """
+        Политика ожидания готовности вложений после загрузки.
+
+        Без явно заданной политики используются фиксированные паузы
+        ``after_input_media_delay`` и ``after_upload_retry_delay``.
+        """
+
+        if self._readiness_policy is not None:
+            return self._readiness_policy
+        return FixedReadinessPolicy(
+            self.after_input_media_delay, self.after_upload_retry_delay
+        )
+
+    @readiness_policy.setter
+    def readiness_policy(self, policy: ReadinessPolicy | None) -> None:
+        self._readiness_policy = policy
+
+    @property
+    def metrics(self) -> ClientMetrics | None:
+        """
+        Метрики запросов к API (``default_connection.metrics``).
+
+        None, если метрики не включены.
+        """
+
+        return self.default_connection.metrics
+
     def __repr__(self) -> str:
         return "Bot(token='***')"
 
@@ -323,7 +389,7 @@ class Bot(BaseConnection):
 
     async def close_session(self) -> None:
         """
-        Закрывает текущую сессию aiohttp.
+        Закрывает текущую сессию aiohttp и сессию загрузок.
 
         Returns:
             None
@@ -331,6 +397,8 @@ class Bot(BaseConnection):
 
         if self.session is not None:
             await self.session.close()
+        if self.upload_session is not None:
+            await self.upload_session.close()
 
     async def ensure_session(self) -> ClientSession:
         """
@@ -340,14 +408,92 @@ class Bot(BaseConnection):
             ClientSession: Активная aiohttp-сессия.
         """
         if not self.session or self.session.closed:
+            conn = self.default_connection
+            session_kwargs = with_default_connector(
+                conn.kwargs, conn.connector_options
+            )
+            session_kwargs.setdefault("json_serialize", conn.json_codec.dumps)
+            headers = self.headers
+            if not conn.accept_compressed:
+                headers = {**headers, "Accept-Encoding": "identity"}
             self.session = ClientSession(
                 base_url=self.api_url,
-                timeout=self.default_connection.timeout,
-                headers=self.headers,
-                **with_default_connector(self.default_connection.kwargs),
+                timeout=conn.timeout,
+                headers=headers,
+                **session_kwargs,
             )
         return self.session
 
+    async def ensure_upload_session(self) -> ClientSession:
+        """
+        Возвращает сессию для загрузки файлов, создавая её
+        при необходимости.
+
+        Сессия создаётся лениво и живёт до :meth:`close_session`.
+        У неё свой пул соединений (``upload_limit``,
+        ``upload_limit_per_host``) и таймаут ``upload_timeout``,
+        соединения с серверами загрузки переиспользуются между
+        файлами. Остальные параметры сессии (``trust_env``, ``proxy``,
+        ``auth`` и т.д.) берутся из ``default_connection.kwargs``.
+        Заголовок ``Authorization`` не отправляется.
+
+        Returns:
+            ClientSession: Активная aiohttp-сессия загрузок.
+        """
+        if not self.upload_session or self.upload_session.closed:
+            conn = self.default_connection
+            session_kwargs = dict(conn.kwargs)
+            connector = session_kwargs.pop("connector", None)
+            session_kwargs.setdefault("json_serialize", conn.json_codec.dumps)
+            session_kwargs.update(
+                timeout=conn.upload_timeout,
+                connector=connector
+                or create_default_connector(conn.upload_connector_options),
+                # Пользовательский connector принадлежит основной сессии
+                connector_owner=connector is None,
+            )
+            self.upload_session = ClientSession(**session_kwargs)
+        return self.upload_session
+
+    async def warm_up(self, connections: int | None = None) -> int:
+        """
+        Заранее открывает соединения с API, чтобы первые запросы
+        не тратили время на DNS, TCP и TLS.
+
+        Соединения остаются в пуле на ``keepalive_timeout`` секунд.
+        Ошибки прогрева не пробрасываются.
+
+        Args:
+            connections: Количество соединений. По умолчанию
+                ``default_connection.warm_up_connections``.
+
+        Returns:
+            int: Сколько соединений удалось открыть.
+        """
+
+        count = (
+            self.default_connection.warm_up_connections
+            if connections is None
+            else connections
+        )
+        if count <= 0:
+            return 0
+
+        session = await self.ensure_session()
+
+        async def _open() -> bool:
+            try:
+                async with session.head("/") as response:
+                    await response.read()
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger_bot.debug("Не удалось прогреть соединение: %r", e)
+                return False
+            return True
+
+        opened = sum(await asyncio.gather(*(_open() for _ in range(count))))
+        logger_bot.debug("Прогрето соединений с API: %d/%d", opened, count)
+        return opened
+
     async def send_message(
         self,
         chat_id: int | None = None,
@@ -365,6 +511,7 @@ class Bot(BaseConnection):
         notify: bool | None = None,
         disable_link_preview: bool | None = None,
         sleep_after_input_media: bool | None = True,
+        deadline: float | None = None,
     ) -> SendedMessage | None:
         """
         Отправляет сообщение в чат или пользователю.
@@ -387,6 +534,8 @@ class Bot(BaseConnection):
                 превью.
             sleep_after_input_media: Нужно ли делать
                 задержку после загрузки вложений.
+            deadline: Сколько секунд отведено на весь вызов,
+                включая загрузку вложений и retry.
 
         Returns:
             Optional[SendedMessage]: Отправленное сообщение или ошибка.
@@ -406,8 +555,68 @@ class Bot(BaseConnection):
                 disable_link_preview=disable_link_preview,
             ),
             sleep_after_input_media=sleep_after_input_media,
+            deadline=deadline,
         ).fetch()
 
+    async def broadcast(
+        self,
+        targets: Iterable[int] | AsyncIterable[int],
+        text: str | None = None,
+        attachments: list[
+            Attachment | InputMedia | InputMediaBuffer | AttachmentUpload
+        ]
+        | list[Attachments]
+        | None = None,
+        link: NewMessageLink | None = None,
+        format: TextFormat | None = None,
+        *,
+        recipient: Literal["chat_id", "user_id"] = "chat_id",
+        notify: bool | None = None,
+        disable_link_preview: bool | None = None,
+        concurrency: int = DEFAULT_BROADCAST_CONCURRENCY,
+        checkpoint: str | Path | None = None,
+        **kwargs: Any,
+    ) -> BroadcastStats:
+        """
+        Рассылает одно сообщение множеству получателей.
+
+        Вложения загружаются и тело запроса сериализуется один раз.
+        Подробности и остальные параметры — в
+        :class:`~maxapi.utils.broadcast.Broadcaster`.
+
+        Args:
+            targets: Идентификаторы получателей.
+            text: Текст сообщения.
+            attachments: Вложения.
+            link: Данные ссылки сообщения.
+            format: Режим форматирования текста.
+            recipient: ``chat_id`` или ``user_id``.
+            notify: Флаг уведомления.
+            disable_link_preview: Флаг генерации превью.
+            concurrency: Сколько отправок выполнять одновременно.
+            checkpoint: Файл прогресса для продолжения рассылки.
+            **kwargs: Параметры :class:`Broadcaster`.
+
+        Returns:
+            BroadcastStats: Итоговые счётчики рассылки.
+        """
+
+        broadcaster = Broadcaster(
+            self,
+            text=text,
+            attachments=attachments,
+            link=link,
+            format=self.resolve_format(format),
+            notify=self._resolve_notify(notify=notify),
+            disable_link_preview=self._resolve_disable_link_preview(
+                disable_link_preview=disable_link_preview,
+            ),
+            concurrency=concurrency,
+            checkpoint=checkpoint,
+            **kwargs,
+        )
+        return await broadcaster.run(targets, recipient=recipient)
+
     async def send_action(
         self,
         chat_id: int | None = None,
@@ -444,6 +653,7 @@ class Bot(BaseConnection):
         *,
         notify: bool | None = None,
         sleep_after_input_media: bool | None = True,
+        deadline: float | None = None,
     ) -> EditedMessage | None:
         """
         Редактирует существующее сообщение.
@@ -462,6 +672,8 @@ class Bot(BaseConnection):
                 текста.
             sleep_after_input_media: Нужно ли делать
                 задержку после загрузки вложений.
+            deadline: Сколько секунд отведено на весь вызов,
+                включая загрузку вложений и retry.
 
         Returns:
             Optional[EditedMessage]: Отредактированное сообщение
@@ -478,6 +690,7 @@ class Bot(BaseConnection):
             format=self.resolve_format(format, parse_mode),
             parse_mode=None,
             sleep_after_input_media=sleep_after_input_media,
+            deadline=deadline,
         ).fetch()
 
     async def delete_message(self, message_id: str) -> DeletedMessage:
@@ -786,6 +999,8 @@ class Bot(BaseConnection):
         callback_id: str,
         message: MessageForCallback | None = None,
         notification: str | None = None,
+        *,
+        deadline: float | None = None,
     ) -> SendedCallback:
         """
         Отправляет callback ответ.
@@ -796,6 +1011,8 @@ class Bot(BaseConnection):
             callback_id: ID callback.
             message: Сообщение для отправки.
             notification: Текст уведомления.
+            deadline: Сколько секунд отведено на весь вызов,
+                включая загрузку вложений и retry.
 
         Returns:
             SendedCallback: Результат отправки callback.
@@ -806,6 +1023,7 @@ class Bot(BaseConnection):
             callback_id=callback_id,
             message=message,
             notification=notification,
+            deadline=deadline,
         ).fetch()
 
     async def pin_message(
@@ -1124,7 +1342,7 @@ class Bot(BaseConnection):
         return await GetUploadURL(bot=self, type=type).fetch()
 
     async def upload_media(
-        self, media: InputMedia | InputMediaBuffer
+        self, media: InputMedia | InputMediaBuffer | InputMediaStream
     ) -> AttachmentUpload:
         """
         Загружает медиа и возвращает вложение с токеном.
@@ -1145,6 +1363,79 @@ class Bot(BaseConnection):
             att=media,
         )
 
+    async def relay_media(
+        self,
+        url: str,
+        type: UploadType | str | None = None,
+        *,
+        filename: str | None = None,
+        progress: ProgressCallback | None = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> AttachmentUpload:
+        """
+        Переслать файл по URL на сервер загрузки, не сохраняя его.
+
+        Скачивание и загрузка идут одновременно: куски из ответа
+        сразу уходят на сервер загрузки, на диск ничего не пишется,
+        а в памяти держится лишь несколько кусков. Подходит для
+        пересылки вложений из входящих сообщений в другие чаты.
+        При сетевой ошибке загрузка повторяется, файл при этом
+        скачивается заново.
+
+        Args:
+            url: URL файла (например, ``attachment.payload.url``).
+            type: Тип вложения. По умолчанию определяется
+                по ``Content-Type`` ответа.
+            filename: Имя файла. По умолчанию — из заголовков ответа.
+            progress: Колбэк прогресса загрузки.
+            chunk_size: Размер куска при чтении ответа.
+
+        Returns:
+            AttachmentUpload: Вложение с токеном для ``attachments``.
+
+        Raises:
+            DownloadFileError: Ошибка скачивания.
+            MaxUploadFileFailed: Ошибка загрузки.
+        """
+
+        response = await self._fetch_response(url)
+        pending = [response]
+
+        async def chunks() -> AsyncIterator[bytes]:
+            # первая попытка читает уже открытый ответ, повторы —
+            # новый запрос
+            resp = pending.pop() if pending else None
+            if resp is None:
+                resp = await self._fetch_response(url)
+            async for chunk in self._fetch_content_stream(
+                resp, chunk_size=chunk_size
+            ):
+                yield chunk
+
+        try:
+            headers = response.headers
+            content_type = (
+                response.content_type if "Content-Type" in headers else None
+            )
+            # сжатый ответ распаковывается, Content-Length к нему
+            # не относится
+            size = (
+                response.content_length
+                if headers.get("Content-Encoding", "identity") == "identity"
+                else None
+            )
+            media = InputMediaStream(
+                chunks,
+                type or upload_type_for_mime(content_type),
+                filename or self._capture_filename(response),
+                size=size,
+                content_type=content_type,
+                progress=progress,
+            )
+            return await self.upload_media(media)
+        finally:
+            response.release()
+
     async def set_commands(self, *commands: BotCommand) -> SettedCommands:
         """
         Добавляет, изменяет или удаляет команды бота.
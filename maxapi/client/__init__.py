@@ -1,6 +1,27 @@
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .codec import JsonCodec, get_json_codec
+from .deadline import deadline_scope
 from .default import DEFAULT_RETRY_STATUSES, DefaultConnectionProperties
+from .metrics import ClientMetrics, EndpointMetrics, Histogram
+from .priority import PriorityScheduler, RequestPriority, priority_scope
+from .rate_limiter import RateLimiter, RateLimiterStats
+from .single_flight import SingleFlight
 
 __all__ = [
     "DEFAULT_RETRY_STATUSES",
+    "CircuitBreaker",
+    "CircuitState",
+    "ClientMetrics",
     "DefaultConnectionProperties",
+    "EndpointMetrics",
+    "Histogram",
+    "JsonCodec",
+    "PriorityScheduler",
+    "RateLimiter",
+    "RateLimiterStats",
+    "RequestPriority",
+    "SingleFlight",
+    "deadline_scope",
+    "get_json_codec",
+    "priority_scope",
 ]
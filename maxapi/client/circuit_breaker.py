@@ -0,0 +1,232 @@
+"""Автоматический выключатель (circuit breaker) для запросов к API."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from ..exceptions.max import CircuitBreakerOpen
+from ..loggers import logger_connection
+from .endpoints import endpoint_label
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ..enums.api_path import ApiPath
+
+    StateListener = Callable[[str, "CircuitState", "CircuitState"], Any]
+
+
+class CircuitState(str, Enum):
+    """Состояние выключателя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class _Circuit:
+    state: CircuitState = CircuitState.CLOSED
+    outcomes: deque[tuple[float, bool]] = field(default_factory=deque)
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Выключатель запросов к API по хосту и эндпоинту.
+
+    Считает долю неудачных попыток (ошибки соединения, таймауты и
+    статусы из ``retry_on_statuses``) за последние ``window`` секунд.
+    Когда доля достигает ``failure_threshold`` (при минимум
+    ``min_requests`` попытках), выключатель размыкается: запросы
+    сразу завершаются :class:`~maxapi.exceptions.max.CircuitBreakerOpen`
+    без обращения к сети и без retry.
+
+    Через ``open_timeout`` секунд выключатель переходит в полуоткрытое
+    состояние и пропускает до ``half_open_max_calls`` пробных запросов.
+    Успешная проба замыкает его, неудачная — снова размыкает.
+
+    Args:
+        failure_threshold: Доля неудачных попыток (от 0 до 1).
+        min_requests: Минимум попыток в окне для оценки доли.
+        window: Окно подсчёта в секундах.
+        open_timeout: Сколько секунд выключатель остаётся открытым
+            перед пробой.
+        half_open_max_calls: Сколько пробных запросов пропускать
+            одновременно в полуоткрытом состоянии.
+        per_path: Отдельный выключатель на каждый эндпоинт
+            (``/messages``, ``/chats``...). False — один на хост.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: float = 0.5,
+        min_requests: int = 10,
+        window: float = 30.0,
+        open_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        per_path: bool = True,
+    ) -> None:
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold должен быть от 0 до 1")
+        if min_requests < 1:
+            raise ValueError("min_requests должен быть >= 1")
+        if window <= 0 or open_timeout <= 0:
+            raise ValueError("window и open_timeout должны быть > 0")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls должен быть >= 1")
+
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.per_path = per_path
+        self._circuits: dict[str, _Circuit] = {}
+        self._listeners: list[StateListener] = []
+
+    def key_for(self, api_url: str, path: ApiPath | str) -> str:
+        """Ключ выключателя для запроса ``path`` к ``api_url``."""
+
+        host = urlsplit(api_url).netloc or api_url
+        if not self.per_path:
+            return host
+        return f"{host}{endpoint_label(path)}"
+
+    def add_listener(self, listener: StateListener) -> None:
+        """
+        Подписаться на смену состояния.
+
+        Args:
+            listener: Функция ``(key, old_state, new_state)``. Вызывается
+                синхронно, поэтому должна быть быстрой (например,
+                переключать флаг сброса нагрузки).
+        """
+
+        self._listeners.append(listener)
+
+    def state(self, key: str) -> CircuitState:
+        """Текущее состояние выключателя ``key``."""
+
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CircuitState.CLOSED
+        if (
+            circuit.state is CircuitState.OPEN
+            and monotonic() - circuit.opened_at >= self.open_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return circuit.state
+
+    @property
+    def open_circuits(self) -> list[str]:
+        """Ключи выключателей, которые сейчас не замкнуты."""
+
+        return [
+            key
+            for key in self._circuits
+            if self.state(key) is not CircuitState.CLOSED
+        ]
+
+    def before_request(self, key: str) -> None:
+        """
+        Проверить, можно ли выполнить запрос.
+
+        Raises:
+            CircuitBreakerOpen: Выключатель открыт или все слоты
+                пробных запросов заняты.
+        """
+
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return
+
+        now = monotonic()
+        if circuit.state is CircuitState.OPEN:
+            remaining = circuit.opened_at + self.open_timeout - now
+            if remaining > 0:
+                raise CircuitBreakerOpen(key=key, retry_after=remaining)
+            self._transition(key, circuit, CircuitState.HALF_OPEN)
+
+        if circuit.probes >= self.half_open_max_calls:
+            raise CircuitBreakerOpen(key=key, retry_after=0.0)
+        circuit.probes += 1
+
+    def record(self, key: str, *, ok: bool | None) -> None:
+        """
+        Учесть результат попытки, разрешённой :meth:`before_request`.
+
+        Args:
+            key: Ключ выключателя.
+            ok: True — успех, False — сбой, None — результат
+                не относится к доступности API (например, 401).
+        """
+
+        circuit = self._circuits.setdefault(key, _Circuit())
+        now = monotonic()
+
+        if circuit.state is CircuitState.HALF_OPEN:
+            circuit.probes = max(circuit.probes - 1, 0)
+            if ok is True:
+                circuit.outcomes.clear()
+                self._transition(key, circuit, CircuitState.CLOSED)
+            elif ok is False:
+                circuit.opened_at = now
+                self._transition(key, circuit, CircuitState.OPEN)
+            return
+
+        if ok is None or circuit.state is not CircuitState.CLOSED:
+            return
+
+        outcomes = circuit.outcomes
+        outcomes.append((now, ok))
+        while outcomes and now - outcomes[0][0] > self.window:
+            outcomes.popleft()
+
+        if len(outcomes) < self.min_requests:
+            return
+        failures = sum(1 for _, success in outcomes if not success)
+        if failures / len(outcomes) >= self.failure_threshold:
+            circuit.opened_at = now
+            self._transition(key, circuit, CircuitState.OPEN)
+
+    def _transition(
+        self, key: str, circuit: _Circuit, new_state: CircuitState
+    ) -> None:
+        old_state = circuit.state
+        if old_state is new_state:
+            return
+        circuit.state = new_state
+        if new_state is CircuitState.OPEN:
+            circuit.probes = 0
+            logger_connection.warning(
+                "Circuit breaker %s открыт на %.1fс", key, self.open_timeout
+            )
+        else:
+            logger_connection.info(
+                "Circuit breaker %s: %s", key, new_state.value
+            )
+
+        for listener in self._listeners:
+            _notify(listener, key, old_state, new_state)
+
+
+def _notify(
+    listener: StateListener,
+    key: str,
+    old_state: CircuitState,
+    new_state: CircuitState,
+) -> None:
+    try:
+        listener(key, old_state, new_state)
+    except Exception:
+        logger_connection.exception(
+            "Ошибка в обработчике состояния circuit breaker"
+        )
@@ -0,0 +1,147 @@
+"""Настраиваемый JSON-кодек для запросов, вебхуков и контекста."""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+JSON_CODEC_NAMES: tuple[str, ...] = ("json", "orjson", "msgspec", "auto")
+
+
+class JsonCodec:
+    """
+    Пара функций сериализации и десериализации JSON.
+
+    ``dumps`` может возвращать как ``str``, так и ``bytes``
+    (как orjson и msgspec) — метод :meth:`dumps` всегда отдаёт ``str``,
+    что требуется aiohttp для ``json_serialize``.
+
+    Args:
+        dumps: Функция сериализации объекта в JSON.
+        loads: Функция разбора JSON из ``str`` или ``bytes``.
+        name: Имя кодека (для логов и отладки).
+    """
+
+    __slots__ = ("_dumps", "_loads", "name")
+
+    def __init__(
+        self,
+        dumps: Callable[[Any], str | bytes],
+        loads: Callable[[str | bytes], Any],
+        *,
+        name: str = "custom",
+    ) -> None:
+        self._dumps = dumps
+        self._loads = loads
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"JsonCodec(name={self.name!r})"
+
+    def dumps(self, obj: Any) -> str:
+        """Сериализовать объект в JSON-строку."""
+        data = self._dumps(obj)
+        return data.decode() if isinstance(data, bytes) else data
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Сериализовать объект в JSON-байты."""
+        data = self._dumps(obj)
+        return data if isinstance(data, bytes) else data.encode()
+
+    def loads(self, data: str | bytes | bytearray | memoryview) -> Any:
+        """Разобрать JSON из строки или байтов."""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return self._loads(data)  # type: ignore[arg-type]
+
+
+def stdlib_codec() -> JsonCodec:
+    """Кодек на стандартном модуле :mod:`json`."""
+    return JsonCodec(json.dumps, json.loads, name="json")
+
+
+def orjson_codec() -> JsonCodec:
+    """
+    Кодек на `orjson <https://github.com/ijl/orjson>`_.
+
+    Raises:
+        ImportError: Если orjson не установлен.
+    """
+    try:
+        import orjson  # noqa: PLC0415
+    except ImportError as exc:
+        raise ImportError(
+            "orjson is not installed. "
+            "Run: pip install orjson  or  pip install maxapi[orjson]"
+        ) from exc
+
+    return JsonCodec(orjson.dumps, orjson.loads, name="orjson")
+
+
+def msgspec_codec() -> JsonCodec:
+    """
+    Кодек на `msgspec <https://jcristharif.com/msgspec/>`_.
+
+    Raises:
+        ImportError: Если msgspec не установлен.
+    """
+    try:
+        import msgspec  # noqa: PLC0415
+    except ImportError as exc:
+        raise ImportError(
+            "msgspec is not installed. "
+            "Run: pip install msgspec  or  pip install maxapi[msgspec]"
+        ) from exc
+
+    return JsonCodec(msgspec.json.encode, msgspec.json.decode, name="msgspec")
+
+
+def get_json_codec(codec: JsonCodec | str | None = None) -> JsonCodec:
+    """
+    Получить кодек по имени или вернуть переданный.
+
+    Args:
+        codec: Экземпляр :class:`JsonCodec` или имя:
+            ``"json"`` (по умолчанию), ``"orjson"``, ``"msgspec"``
+            или ``"auto"`` — самый быстрый из установленных.
+
+    Returns:
+        JsonCodec: Кодек.
+
+    Raises:
+        ValueError: Неизвестное имя кодека.
+        ImportError: Библиотека выбранного кодека не установлена.
+    """
+
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None:
+        return STDLIB_CODEC
+    if codec not in JSON_CODEC_NAMES:
+        raise ValueError(
+            f"Неизвестный json_codec {codec!r}, "
+            f"допустимые значения: {', '.join(JSON_CODEC_NAMES)}"
+        )
+    return _named_codec(codec)
+
+
+@cache
+def _named_codec(name: str) -> JsonCodec:
+    if name == "orjson":
+        return orjson_codec()
+    if name == "msgspec":
+        return msgspec_codec()
+    if name == "auto":
+        if find_spec("orjson") is not None:
+            return orjson_codec()
+        if find_spec("msgspec") is not None:
+            return msgspec_codec()
+    return STDLIB_CODEC
+
+
+STDLIB_CODEC = stdlib_codec()
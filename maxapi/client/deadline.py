@@ -0,0 +1,83 @@
+"""Дедлайны запросов к API."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from ..exceptions.max import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_deadline: ContextVar[float | None] = ContextVar(
+    "maxapi_deadline", default=None
+)
+
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[float | None]:
+    """
+    Ограничить время всех запросов к API внутри блока.
+
+    Дедлайн учитывают HTTP-таймауты, паузы между retry и ожидание
+    готовности вложений в ``SendMessage``/``EditMessage``. Вложенный
+    дедлайн не может быть позже внешнего.
+
+    Пример::
+
+        with deadline_scope(2.0):
+            await bot.send_message(chat_id=1, text="...")
+
+    Args:
+        timeout: Сколько секунд отведено на блок. None — блок
+            не меняет текущий дедлайн.
+
+    Yields:
+        float | None: Момент дедлайна по ``time.monotonic()``.
+    """
+
+    current = _deadline.get()
+    if timeout is None:
+        yield current
+        return
+
+    expires_at = monotonic() + timeout
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield expires_at
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> float | None:
+    """Сколько секунд осталось до дедлайна; None — дедлайна нет."""
+
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - monotonic()
+
+
+def check_deadline(operation: str) -> float | None:
+    """
+    Проверить, что дедлайн не истёк.
+
+    Args:
+        operation: Описание операции для текста ошибки.
+
+    Returns:
+        float | None: Оставшееся время в секундах или None.
+
+    Raises:
+        DeadlineExceeded: Дедлайн истёк.
+    """
+
+    remaining = time_left()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"Истёк дедлайн запроса: {operation}")
+    return remaining
@@ -1,8 +1,32 @@
-from typing import Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
 
 from aiohttp import ClientTimeout
 
+from .codec import JsonCodec, get_json_codec
+from .endpoints import endpoint_label
+from .rate_limiter import RateLimiter
+from .single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from ..enums.api_path import ApiPath
+    from ..enums.http_method import HTTPMethod
+    from .circuit_breaker import CircuitBreaker
+    from .metrics import ClientMetrics
+    from .priority import PriorityScheduler
+
+    TimeoutProfileKey = ApiPath | str | tuple[HTTPMethod | str, ApiPath | str]
+
 DEFAULT_RETRY_STATUSES: tuple[int, ...] = (502, 503, 504)
+# Совпадают со значениями по умолчанию aiohttp.TCPConnector
+DEFAULT_DNS_CACHE_TTL = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+DEFAULT_UPLOAD_TIMEOUT = 5 * 60
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_ENRICH_CONCURRENCY = 10
 
 
 class DefaultConnectionProperties:
@@ -23,6 +47,62 @@ class DefaultConnectionProperties:
         retry_backoff_factor: Множитель для экспоненциальной
             задержки между попытками в секундах
             (по умолчанию 1.0, задержки: 1с, 2с, 4с).
+        rate_limit: Общий лимит запросов к API в секунду.
+            None — без ограничения (по умолчанию).
+        rate_limit_burst: Сколько запросов можно отправить подряд
+            без ожидания (по умолчанию равно ``rate_limit``).
+        path_rate_limits: Лимиты запросов в секунду по эндпоинтам,
+            например ``{ApiPath.UPDATES: 2}``.
+        coalesce_get_requests: Объединять одинаковые параллельные
+            GET-запросы в один HTTP-запрос (по умолчанию False).
+        json_codec: JSON-кодек для тел запросов и ответов API,
+            вебхуков и RedisContext: экземпляр ``JsonCodec`` или имя
+            (``"json"``, ``"orjson"``, ``"msgspec"``, ``"auto"``).
+            По умолчанию стандартный модуль ``json``.
+        limit: Максимальное количество одновременных соединений
+            в пуле (по умолчанию 100).
+        limit_per_host: Максимум соединений к одному хосту.
+            0 — без отдельного ограничения (по умолчанию).
+        ttl_dns_cache: Время кеширования DNS-ответов в секундах
+            (по умолчанию 10, как в aiohttp). None — кешировать
+            бессрочно.
+        keepalive_timeout: Сколько секунд держать простаивающее
+            соединение открытым для повторного использования
+            (по умолчанию 15, как в aiohttp). Переиспользованное
+            соединение не требует нового TLS-рукопожатия.
+        accept_compressed: Запрашивать сжатые ответы
+            (``Accept-Encoding: gzip, deflate``, по умолчанию True).
+            False — отправлять ``Accept-Encoding: identity``.
+        warm_up_connections: Сколько соединений с API открыть
+            заранее при запуске диспетчера (по умолчанию 0).
+        upload_timeout: Таймаут загрузки одного файла в секундах
+            (по умолчанию 5 * 60).
+        upload_limit: Максимум одновременных соединений с серверами
+            загрузки (по умолчанию 10). Пул загрузок отделён от пула
+            запросов к API.
+        upload_limit_per_host: Максимум соединений к одному серверу
+            загрузки. 0 — без отдельного ограничения (по умолчанию).
+        upload_concurrency: Сколько вложений одного сообщения
+            загружать параллельно (по умолчанию 4). 1 — загружать
+            по очереди.
+        enrich_concurrency: Сколько запросов чатов и участников
+            выполнять параллельно при дополнении батча событий
+            (по умолчанию 10).
+        circuit_breaker: Экземпляр CircuitBreaker. При открытом
+            выключателе запросы сразу завершаются ошибкой
+            ``CircuitBreakerOpen`` без retry. None — без выключателя
+            (по умолчанию).
+        path_timeouts: Таймауты (``total``) в секундах по эндпоинтам
+            или по паре (HTTP-метод, эндпоинт), например
+            ``{ApiPath.ANSWERS: 5, (HTTPMethod.POST, ApiPath.CHATS): 10}``.
+            Пара имеет приоритет над эндпоинтом, для остальных
+            запросов действует ``timeout``.
+        priority_scheduler: Экземпляр PriorityScheduler. Ограничивает
+            число одновременных запросов и отдаёт свободные слоты
+            сначала интерактивным запросам (обработчикам событий),
+            потом фоновым. None — без очереди (по умолчанию).
+        metrics: Экземпляр ClientMetrics для сбора метрик запросов
+            к API. None — метрики не собираются (по умолчанию).
         **kwargs: Дополнительные параметры, которые будут
             сохранены как есть.
 
@@ -32,6 +112,28 @@ class DefaultConnectionProperties:
         max_retries: Максимальное количество повторных попыток.
         retry_on_statuses: HTTP-статусы для retry.
         retry_backoff_factor: Множитель задержки.
+        rate_limiter: Экземпляр RateLimiter или None, если
+            ограничение частоты не задано. При включённом
+            ограничителе ответ 429 повторяется после паузы
+            из заголовка ``Retry-After``.
+        single_flight: Группа объединяемых GET-запросов или None.
+        json_codec: Экземпляр JsonCodec.
+        connector_options: Параметры пула соединений
+            для ``aiohttp.TCPConnector``.
+        accept_compressed: Запрашивать сжатые ответы.
+        warm_up_connections: Количество прогреваемых соединений.
+        upload_timeout: Экземпляр aiohttp.ClientTimeout для загрузок.
+        upload_connector_options: Параметры пула соединений
+            для серверов загрузки.
+        upload_concurrency: Лимит параллельных загрузок вложений
+            одного сообщения.
+        enrich_concurrency: Лимит параллельных запросов при
+            дополнении батча событий.
+        circuit_breaker: Экземпляр CircuitBreaker или None.
+        path_timeouts: Таймауты по эндпоинтам
+            (см. :meth:`timeout_for`).
+        priority_scheduler: Экземпляр PriorityScheduler или None.
+        metrics: Экземпляр ClientMetrics или None.
         kwargs: Дополнительные параметры.
     """
 
@@ -43,6 +145,26 @@ class DefaultConnectionProperties:
         max_retries: int = 3,
         retry_on_statuses: tuple[int, ...] = DEFAULT_RETRY_STATUSES,
         retry_backoff_factor: float = 1.0,
+        rate_limit: float | None = None,
+        rate_limit_burst: float | None = None,
+        path_rate_limits: Mapping[ApiPath | str, float] | None = None,
+        coalesce_get_requests: bool = False,
+        json_codec: JsonCodec | str | None = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        ttl_dns_cache: int | None = DEFAULT_DNS_CACHE_TTL,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        accept_compressed: bool = True,
+        warm_up_connections: int = 0,
+        upload_timeout: float = DEFAULT_UPLOAD_TIMEOUT,
+        upload_limit: int = 10,
+        upload_limit_per_host: int = 0,
+        upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        enrich_concurrency: int = DEFAULT_ENRICH_CONCURRENCY,
+        circuit_breaker: CircuitBreaker | None = None,
+        path_timeouts: Mapping[TimeoutProfileKey, float] | None = None,
+        priority_scheduler: PriorityScheduler | None = None,
+        metrics: ClientMetrics | None = None,
         **kwargs: Any,
     ):
         """
@@ -57,6 +179,32 @@ class DefaultConnectionProperties:
             retry_on_statuses: HTTP-статусы
                 для retry.
             retry_backoff_factor: Множитель задержки.
+            rate_limit: Общий лимит запросов в секунду.
+            rate_limit_burst: Размер всплеска общего лимита.
+            path_rate_limits: Лимиты по эндпоинтам.
+            coalesce_get_requests: Объединять одинаковые
+                параллельные GET-запросы.
+            json_codec: JSON-кодек или его имя.
+            limit: Лимит соединений в пуле.
+            limit_per_host: Лимит соединений к одному хосту.
+            ttl_dns_cache: Время кеширования DNS в секундах.
+            keepalive_timeout: Время жизни простаивающего
+                соединения в секундах.
+            accept_compressed: Запрашивать сжатые ответы.
+            warm_up_connections: Количество прогреваемых
+                соединений.
+            upload_timeout: Таймаут загрузки файла в секундах.
+            upload_limit: Лимит соединений с серверами загрузки.
+            upload_limit_per_host: Лимит соединений к одному
+                серверу загрузки.
+            upload_concurrency: Лимит параллельных загрузок
+                вложений одного сообщения.
+            enrich_concurrency: Лимит параллельных запросов
+                при дополнении батча событий.
+            circuit_breaker: Выключатель запросов к API.
+            path_timeouts: Таймауты по эндпоинтам.
+            priority_scheduler: Очередь запросов по приоритетам.
+            metrics: Метрики запросов к API.
             **kwargs: Дополнительные параметры.
         """
         self.timeout = ClientTimeout(total=timeout, sock_connect=sock_connect)
@@ -65,4 +213,79 @@ class DefaultConnectionProperties:
         self.max_retries = max_retries
         self.retry_on_statuses = retry_on_statuses
         self.retry_backoff_factor = retry_backoff_factor
+        self.rate_limiter: RateLimiter | None = None
+        if rate_limit is not None or path_rate_limits:
+            self.rate_limiter = RateLimiter(
+                rate_limit,
+                burst=rate_limit_burst,
+                path_rates=path_rate_limits,
+            )
+        self.single_flight: SingleFlight | None = (
+            SingleFlight() if coalesce_get_requests else None
+        )
+        self.json_codec = get_json_codec(json_codec)
+        if warm_up_connections < 0:
+            raise ValueError("warm_up_connections должен быть >= 0")
+        self.connector_options: dict[str, Any] = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": ttl_dns_cache,
+            "keepalive_timeout": keepalive_timeout,
+        }
+        self.accept_compressed = accept_compressed
+        self.warm_up_connections = warm_up_connections
+        self.upload_timeout = ClientTimeout(
+            total=upload_timeout, sock_connect=sock_connect
+        )
+        self.upload_connector_options: dict[str, Any] = {
+            **self.connector_options,
+            "limit": upload_limit,
+            "limit_per_host": upload_limit_per_host,
+        }
+        if upload_concurrency < 1:
+            raise ValueError("upload_concurrency должен быть >= 1")
+        self.upload_concurrency = upload_concurrency
+        if enrich_concurrency < 1:
+            raise ValueError("enrich_concurrency должен быть >= 1")
+        self.enrich_concurrency = enrich_concurrency
+        self.circuit_breaker = circuit_breaker
+        self.priority_scheduler = priority_scheduler
+        self.metrics = metrics
+        self.path_timeouts: dict[tuple[str | None, str], ClientTimeout] = {}
+        for key, total in (path_timeouts or {}).items():
+            if total <= 0:
+                raise ValueError("таймауты path_timeouts должны быть > 0")
+            method, path = key if isinstance(key, tuple) else (None, key)
+            self.path_timeouts[
+                (_method_name(method), endpoint_label(path))
+            ] = ClientTimeout(total=total, sock_connect=sock_connect)
         self.kwargs = kwargs
+
+    def timeout_for(
+        self, method: HTTPMethod | str, path: str
+    ) -> ClientTimeout:
+        """
+        Таймаут запроса с учётом ``path_timeouts``.
+
+        Args:
+            method: HTTP-метод запроса.
+            path: Путь запроса.
+
+        Returns:
+            ClientTimeout: Таймаут профиля или общий ``timeout``.
+        """
+
+        if not self.path_timeouts:
+            return self.timeout
+        label = endpoint_label(path)
+        return (
+            self.path_timeouts.get((_method_name(method), label))
+            or self.path_timeouts.get((None, label))
+            or self.timeout
+        )
+
+
+def _method_name(method: HTTPMethod | str | None) -> str | None:
+    if method is None:
+        return None
+    return str(getattr(method, "value", method)).upper()
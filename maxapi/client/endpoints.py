@@ -0,0 +1,47 @@
+"""Сопоставление путей запросов с эндпоинтами API."""
+
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+from ..enums.api_path import ApiPath
+
+_API_PATHS: dict[str, ApiPath] = {item.value: item for item in ApiPath}
+
+
+def resolve_api_path(path: ApiPath | str) -> ApiPath | None:
+    """
+    Определить эндпоинт API по пути запроса.
+
+    Путь сводится к первому сегменту, поэтому ``/chats/123/members``
+    и ``/chats/123`` относятся к :attr:`ApiPath.CHATS`.
+
+    Args:
+        path: Путь запроса или ApiPath.
+
+    Returns:
+        ApiPath | None: Эндпоинт или None, если путь не распознан.
+    """
+
+    if isinstance(path, ApiPath):
+        return path
+
+    segment = urlsplit(path).path.strip("/").split("/", 1)[0]
+    return _API_PATHS.get(f"/{segment}")
+
+
+def endpoint_label(path: ApiPath | str) -> str:
+    """
+    Вернуть стабильное имя эндпоинта для ключей лимитов и метрик.
+
+    Args:
+        path: Путь запроса или ApiPath.
+
+    Returns:
+        str: Значение ApiPath или исходный путь без query-строки.
+    """
+
+    api_path = resolve_api_path(path)
+    if api_path is not None:
+        return api_path.value
+    return urlsplit(str(path)).path or str(path)
@@ -0,0 +1,370 @@
+"""Метрики HTTP-клиента: задержки, retry и статусы ответов по эндпоинтам."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from .endpoints import endpoint_label
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from ..enums.api_path import ApiPath
+    from ..enums.http_method import HTTPMethod
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass(slots=True)
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин.
+
+    Attributes:
+        buckets: Верхние границы корзин по возрастанию
+            (корзина ``+Inf`` подразумевается).
+        counts: Число наблюдений в каждой корзине (не накопленное),
+            последний элемент — ``+Inf``.
+        sum: Сумма наблюдений.
+        count: Число наблюдений.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Добавить наблюдение."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценить квантиль линейной интерполяцией внутри корзины
+        (как ``histogram_quantile`` в Prometheus).
+
+        Args:
+            q: Квантиль от 0 до 1.
+
+        Returns:
+            float: Оценка; 0 без наблюдений. Если квантиль попадает
+                в корзину ``+Inf``, возвращается последняя граница.
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError("q должен быть от 0 до 1")
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1] if self.buckets else math.inf
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1] if self.buckets else math.inf
+
+    def copy(self) -> Histogram:
+        """Независимая копия."""
+        return Histogram(self.buckets, list(self.counts), self.sum, self.count)
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """
+    Метрики одного эндпоинта (пары HTTP-метод и путь).
+
+    Attributes:
+        method: HTTP-метод.
+        endpoint: Эндпоинт (значение ApiPath или путь без query).
+        in_flight: Сколько запросов выполняется прямо сейчас.
+        requests: Сколько вызовов ``request`` завершилось.
+        latency: Длительность вызова в секундах вместе с retry
+            и ожиданием в очередях.
+        responses: Число HTTP-попыток по статусу ответа; ``"error"``
+            — ошибка соединения, ``"timeout"`` — таймаут.
+        retries: Число повторов по причине: статус (``"503"``,
+            ``"429"``), ``"connection"`` или код ошибки API
+            (``"attachment.not.ready"``).
+        bytes_out: Отправлено байт тела запросов (с учётом retry).
+        bytes_in: Получено байт тела ответов.
+    """
+
+    method: str
+    endpoint: str
+    in_flight: int = 0
+    requests: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+    responses: Counter[str] = field(default_factory=Counter)
+    retries: Counter[str] = field(default_factory=Counter)
+    bytes_out: int = 0
+    bytes_in: int = 0
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Учесть вызов: ``in_flight`` на время блока и его длительность."""
+
+        self.in_flight += 1
+        started = monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.requests += 1
+            self.latency.observe(monotonic() - started)
+
+    def copy(self) -> EndpointMetrics:
+        """Независимая копия."""
+        return EndpointMetrics(
+            self.method,
+            self.endpoint,
+            self.in_flight,
+            self.requests,
+            self.latency.copy(),
+            Counter(self.responses),
+            Counter(self.retries),
+            self.bytes_out,
+            self.bytes_in,
+        )
+
+
+class ClientMetrics:
+    """
+    Метрики запросов бота к API.
+
+    Подключаются через ``DefaultConnectionProperties(metrics=...)`` и
+    доступны как ``bot.metrics``. Без них запросы не измеряются и
+    ничего не стоят. Собирает по каждому эндпоинту гистограмму
+    задержек, число выполняющихся запросов, retry, статусы ответов
+    и объём тел запросов и ответов. Данные читаются через
+    :meth:`snapshot` или выгружаются в текстовом формате Prometheus
+    (:meth:`render_prometheus`).
+
+    Здесь же учитываются решения
+    :class:`~maxapi.utils.admission.AdmissionController` по входящим
+    событиям (:attr:`events`).
+
+    Args:
+        buckets: Границы корзин гистограммы задержек в секундах.
+        namespace: Префикс имён метрик Prometheus.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        namespace: str = "maxapi",
+    ) -> None:
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets должны строго возрастать")
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+        self.events: Counter[tuple[str, str]] = Counter()
+
+    def endpoint(
+        self, method: HTTPMethod | str, path: ApiPath | str
+    ) -> EndpointMetrics:
+        """
+        Метрики эндпоинта (создаются при первом обращении).
+
+        Args:
+            method: HTTP-метод.
+            path: Путь запроса или ApiPath; ``/chats/1`` и
+                ``/chats/2`` относятся к одному эндпоинту.
+
+        Returns:
+            EndpointMetrics: Изменяемый объект метрик.
+        """
+
+        key = (str(getattr(method, "value", method)), endpoint_label(path))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointMetrics(
+                *key, latency=Histogram(self.buckets)
+            )
+        return stats
+
+    def record_retry(
+        self, method: HTTPMethod | str, path: ApiPath | str, reason: str
+    ) -> None:
+        """Учесть повтор запроса по причине ``reason``."""
+        self.endpoint(method, path).retries[reason] += 1
+
+    def record_event(self, update_type: str, decision: str) -> None:
+        """
+        Учесть решение по входящему событию.
+
+        Args:
+            update_type: Тип события.
+            decision: Решение (``admitted``, ``shed``, ``rejected``,
+                ``expired``).
+        """
+        self.events[update_type, decision] += 1
+
+    def snapshot(self) -> dict[tuple[str, str], EndpointMetrics]:
+        """
+        Копия метрик всех эндпоинтов.
+
+        Returns:
+            dict[tuple[str, str], EndpointMetrics]: Ключ — пара
+                (HTTP-метод, эндпоинт).
+        """
+        return {key: stats.copy() for key, stats in self._endpoints.items()}
+
+    def reset(self) -> None:
+        """Сбросить все метрики."""
+        self._endpoints.clear()
+        self.events.clear()
+
+    def render_prometheus(self) -> str:
+        """
+        Метрики в текстовом формате Prometheus (0.0.4).
+
+        Отдавайте с заголовком ``Content-Type:``
+        :data:`PROMETHEUS_CONTENT_TYPE`.
+
+        Returns:
+            str: Текст для эндпоинта ``/metrics``.
+        """
+
+        endpoints = sorted(self._endpoints.values(), key=_sort_key)
+        families = (
+            (
+                "requests_in_flight",
+                "gauge",
+                "Выполняющиеся запросы к API.",
+                (f"{_labels(s)} {s.in_flight}" for s in endpoints),
+            ),
+            (
+                "request_duration_seconds",
+                "histogram",
+                "Длительность запросов к API вместе с retry.",
+                _histogram_samples(endpoints),
+            ),
+            (
+                "responses_total",
+                "counter",
+                "HTTP-попытки по статусу ответа.",
+                _counter_samples(endpoints, "responses", "status"),
+            ),
+            (
+                "retries_total",
+                "counter",
+                "Повторы запросов к API.",
+                _counter_samples(endpoints, "retries", "reason"),
+            ),
+            (
+                "request_bytes_total",
+                "counter",
+                "Отправлено байт тел запросов.",
+                (f"{_labels(s)} {s.bytes_out}" for s in endpoints),
+            ),
+            (
+                "response_bytes_total",
+                "counter",
+                "Получено байт тел ответов.",
+                (f"{_labels(s)} {s.bytes_in}" for s in endpoints),
+            ),
+            (
+                "dispatcher_events_total",
+                "counter",
+                "Решения по входящим событиям.",
+                _event_samples(self.events),
+            ),
+        )
+
+        lines: list[str] = []
+        for name, kind, help_text, samples in families:
+            full = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            lines.extend(f"{full}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_samples(endpoints: Iterable[EndpointMetrics]) -> Iterator[str]:
+    for stats in endpoints:
+        hist = stats.latency
+        cumulative = 0
+        bounds = (*hist.buckets, math.inf)
+        for bound, count in zip(bounds, hist.counts, strict=True):
+            cumulative += count
+            le = _format_float(bound)
+            yield f"_bucket{_labels(stats, le=le)} {cumulative}"
+        yield f"_sum{_labels(stats)} {_format_float(hist.sum)}"
+        yield f"_count{_labels(stats)} {hist.count}"
+
+
+def _counter_samples(
+    endpoints: Iterable[EndpointMetrics], attr: str, label: str
+) -> Iterator[str]:
+    for stats in endpoints:
+        counter: Counter[str] = getattr(stats, attr)
+        for value, count in sorted(counter.items()):
+            yield f"{_labels(stats, **{label: value})} {count}"
+
+
+def _event_samples(events: Counter[tuple[str, str]]) -> Iterator[str]:
+    for (update_type, decision), count in sorted(events.items()):
+        body = (
+            f'update_type="{_escape(update_type)}",'
+            f'decision="{_escape(decision)}"'
+        )
+        yield f"{{{body}}} {count}"
+
+
+def _sort_key(stats: EndpointMetrics) -> tuple[str, str]:
+    return stats.endpoint, stats.method
+
+
+def _labels(stats: EndpointMetrics, **extra: str) -> str:
+    pairs = {"method": stats.method, "endpoint": stats.endpoint, **extra}
+    body = ",".join(
+        f'{key}="{_escape(value)}"' for key, value in pairs.items()
+    )
+    return f"{{{body}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
@@ -0,0 +1,176 @@
+"""Приоритеты исходящих запросов к API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Mapping
+
+
+class RequestPriority(IntEnum):
+    """Полоса приоритета запроса; меньше — важнее."""
+
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BACKGROUND = 2
+
+
+DEFAULT_PRIORITY_WEIGHTS: dict[RequestPriority, int] = {
+    RequestPriority.INTERACTIVE: 8,
+    RequestPriority.DEFAULT: 4,
+    RequestPriority.BACKGROUND: 1,
+}
+
+_priority: ContextVar[RequestPriority] = ContextVar(
+    "maxapi_priority", default=RequestPriority.DEFAULT
+)
+
+
+@contextmanager
+def priority_scope(
+    priority: RequestPriority | None,
+) -> Iterator[RequestPriority]:
+    """
+    Задать приоритет всех запросов к API внутри блока.
+
+    ``Dispatcher`` обрабатывает события с ``INTERACTIVE``, рассылки
+    (:class:`~maxapi.utils.broadcast.Broadcaster`) — с ``BACKGROUND``.
+    Вложенный блок переопределяет внешний.
+
+    Args:
+        priority: Приоритет. None — блок не меняет текущий.
+
+    Yields:
+        RequestPriority: Действующий приоритет.
+    """
+
+    if priority is None:
+        yield _priority.get()
+        return
+
+    token = _priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> RequestPriority:
+    """Приоритет запросов в текущем контексте."""
+    return _priority.get()
+
+
+class PriorityScheduler:
+    """
+    Ограничение одновременных запросов с очередями по приоритетам.
+
+    Запрос занимает слот на время отправки и чтения ответа (вместе
+    с ожиданием в ``rate_limiter``). Когда свободных слотов нет,
+    запросы ждут в очереди своей полосы. Освободившийся слот
+    достаётся самой приоритетной непустой очереди; чтобы фоновые
+    запросы не голодали, при конкуренции полосы обслуживаются
+    пропорционально ``weights`` (по умолчанию на 8 интерактивных
+    запросов приходится 4 обычных и 1 фоновый).
+
+    Args:
+        max_concurrency: Сколько запросов выполняется одновременно.
+            Разумно держать его не больше ``limit`` коннектора.
+        weights: Доля слотов каждой полосы при конкуренции.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        *,
+        weights: Mapping[RequestPriority, int] | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency должен быть >= 1")
+        weights = {**DEFAULT_PRIORITY_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError("веса приоритетов должны быть >= 1")
+
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+        self._active = 0
+        self._queues: dict[RequestPriority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._credits = dict(weights)
+
+    @property
+    def active(self) -> int:
+        """Сколько слотов занято."""
+        return self._active
+
+    def waiting(self, priority: RequestPriority | None = None) -> int:
+        """Сколько запросов ждут слота (всего или в полосе)."""
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: RequestPriority | None = None
+    ) -> AsyncIterator[None]:
+        """
+        Занять слот на время блока.
+
+        Args:
+            priority: Полоса запроса; по умолчанию — из контекста
+                (:func:`priority_scope`).
+        """
+
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: RequestPriority | None = None) -> None:
+        """Дождаться свободного слота в полосе ``priority``."""
+
+        if priority is None:
+            priority = _priority.get()
+        if self._active < self.max_concurrency and not self.waiting():
+            self._active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # слот уже передан этой задаче — отдаём следующему
+                self.release()
+            else:
+                with suppress(ValueError):
+                    self._queues[priority].remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Освободить слот и передать его следующему в очереди."""
+
+        while (waiter := self._next_waiter()) is not None:
+            if not waiter.done():
+                # слот переходит ожидающему, счётчик не меняется
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _next_waiter(self) -> asyncio.Future[None] | None:
+        ready = [p for p in RequestPriority if self._queues[p]]
+        if not ready:
+            return None
+        if all(self._credits[p] <= 0 for p in ready):
+            self._credits = dict(self.weights)
+        priority = next(p for p in ready if self._credits[p] > 0)
+        self._credits[priority] -= 1
+        return self._queues[priority].popleft()
@@ -0,0 +1,272 @@
+"""Клиентское ограничение частоты запросов к API."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from time import monotonic, time
+from typing import TYPE_CHECKING
+
+from ..loggers import logger_connection
+from .endpoints import endpoint_label
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from ..enums.api_path import ApiPath
+
+GLOBAL_BUCKET = "*"
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def parse_retry_after(
+    value: str | None, default: float = DEFAULT_RETRY_AFTER
+) -> float:
+    """
+    Разобрать заголовок ``Retry-After``.
+
+    Поддерживаются оба формата из RFC 9110: число секунд и HTTP-дата.
+
+    Args:
+        value: Значение заголовка.
+        default: Задержка, если заголовок отсутствует или некорректен.
+
+    Returns:
+        float: Задержка в секундах (не меньше 0).
+    """
+
+    if not isinstance(value, str) or not value.strip():
+        return default
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        seconds = retry_at.timestamp() - time()
+
+    if not math.isfinite(seconds):
+        return default
+    return max(seconds, 0.0)
+
+
+@dataclass(slots=True)
+class RateLimiterStats:
+    """
+    Статистика ожидания в очереди одного bucket.
+
+    Attributes:
+        acquired: Сколько запросов прошло через bucket.
+        delayed: Сколько из них ждали освобождения токена.
+        waiting: Сколько запросов ждут прямо сейчас.
+        total_wait: Суммарное время ожидания в секундах.
+        max_wait: Максимальное время ожидания в секундах.
+        throttled: Сколько раз сервер ответил 429.
+    """
+
+    acquired: int = 0
+    delayed: int = 0
+    waiting: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    throttled: int = 0
+
+    @property
+    def avg_wait(self) -> float:
+        """Среднее время ожидания одного запроса в секундах."""
+        if not self.acquired:
+            return 0.0
+        return self.total_wait / self.acquired
+
+
+class TokenBucket:
+    """
+    Асинхронный token bucket.
+
+    Токены пополняются со скоростью ``rate`` в секунду до ``burst``.
+    Ожидающие запросы обслуживаются в порядке поступления.
+
+    Args:
+        rate: Допустимое количество запросов в секунду.
+        burst: Размер «всплеска» — сколько запросов можно отправить
+            подряд без ожидания (по умолчанию ``max(1, rate)``).
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        if not math.isfinite(rate) or rate <= 0:
+            raise ValueError("rate должен быть положительным числом")
+        if burst is None:
+            burst = max(1.0, rate)
+        if burst < 1:
+            raise ValueError("burst должен быть >= 1")
+
+        self.rate = rate
+        self.burst = float(burst)
+        self.stats = RateLimiterStats()
+        self._tokens = self.burst
+        self._updated_at = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def _next_delay(self, now: float) -> float:
+        """Сколько ждать до следующего токена (0 — токен доступен)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> float:
+        """
+        Дождаться токена.
+
+        Returns:
+            float: Время ожидания в секундах.
+        """
+
+        started = monotonic()
+        self.stats.waiting += 1
+        try:
+            async with self._lock:
+                delay = self._next_delay(monotonic())
+                while delay:
+                    await asyncio.sleep(delay)
+                    delay = self._next_delay(monotonic())
+                self._tokens -= 1
+        finally:
+            self.stats.waiting -= 1
+
+        waited = monotonic() - started
+        self.stats.acquired += 1
+        self.stats.total_wait += waited
+        if waited > 0.001:
+            self.stats.delayed += 1
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        return waited
+
+    def pause(self, delay: float) -> None:
+        """
+        Приостановить выдачу токенов на ``delay`` секунд.
+
+        Используется при ответе 429: после паузы bucket стартует
+        с пустым запасом, чтобы не повторить всплеск.
+        """
+
+        now = monotonic()
+        self._paused_until = max(self._paused_until, now + delay)
+        self._tokens = 0.0
+        self._updated_at = max(self._updated_at, self._paused_until)
+        self.stats.throttled += 1
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов к API.
+
+    Каждый запрос проходит через bucket своего эндпоинта (если для него
+    задан лимит) и через общий bucket (если задан общий RPS).
+
+    Args:
+        rate: Общий лимит запросов в секунду. None — без общего лимита.
+        burst: Размер всплеска для общего bucket.
+        path_rates: Лимиты по эндпоинтам, например
+            ``{ApiPath.UPDATES: 2, ApiPath.MESSAGES: 25}``.
+            Ключ — ApiPath или путь, который сводится к ApiPath
+            по первому сегменту.
+
+    Пример::
+
+        limiter = RateLimiter(30, path_rates={ApiPath.UPDATES: 2})
+        await limiter.acquire("/chats/123")
+        limiter.stats()["*"].avg_wait
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        *,
+        burst: float | None = None,
+        path_rates: Mapping[ApiPath | str, float] | None = None,
+    ) -> None:
+        self._global = (
+            TokenBucket(rate, burst=burst) if rate is not None else None
+        )
+        self._buckets: dict[str, TokenBucket] = {
+            endpoint_label(path): TokenBucket(path_rate)
+            for path, path_rate in (path_rates or {}).items()
+        }
+
+    def _bucket_for(self, path: ApiPath | str) -> TokenBucket | None:
+        if not self._buckets:
+            return None
+        return self._buckets.get(endpoint_label(path))
+
+    async def acquire(self, path: ApiPath | str) -> float:
+        """
+        Дождаться разрешения на запрос к ``path``.
+
+        Args:
+            path: Путь запроса.
+
+        Returns:
+            float: Суммарное время ожидания в секундах.
+        """
+
+        waited = 0.0
+        bucket = self._bucket_for(path)
+        if bucket is not None:
+            waited += await bucket.acquire()
+        if self._global is not None:
+            waited += await self._global.acquire()
+
+        if waited > 0.001:
+            logger_connection.debug(
+                "Запрос %s ждал лимита %.3fс", endpoint_label(path), waited
+            )
+        return waited
+
+    def on_rate_limited(self, path: ApiPath | str, delay: float) -> bool:
+        """
+        Учесть ответ 429 от сервера.
+
+        Приостанавливает bucket эндпоинта, а если его нет — общий bucket.
+
+        Args:
+            path: Путь запроса, получившего 429.
+            delay: Задержка из ``Retry-After`` в секундах.
+
+        Returns:
+            bool: False, если подходящего bucket нет и ждать
+            должен вызывающий код.
+        """
+
+        bucket = self._bucket_for(path) or self._global
+        if bucket is None:
+            return False
+        bucket.pause(delay)
+        return True
+
+    def stats(self) -> dict[str, RateLimiterStats]:
+        """
+        Статистика по всем bucket.
+
+        Returns:
+            dict[str, RateLimiterStats]: Ключ ``"*"`` — общий bucket,
+            остальные — значения ApiPath.
+        """
+
+        result = {key: bucket.stats for key, bucket in self._buckets.items()}
+        if self._global is not None:
+            result[GLOBAL_BUCKET] = self._global.stats
+        return result
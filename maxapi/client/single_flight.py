@@ -0,0 +1,113 @@
+"""Объединение одинаковых параллельных запросов (single-flight)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+ResultT = TypeVar("ResultT")
+
+
+class SingleFlight:
+    """
+    Группа запросов, выполняемых не более одного раза одновременно.
+
+    Пока запрос с ключом ``key`` выполняется, остальные вызовы с тем же
+    ключом не создают новый запрос, а ждут результат первого. После
+    завершения ключ освобождается — результат не кешируется.
+
+    Запрос выполняется в отдельной задаче, поэтому отмена одного из
+    ожидающих не отменяет запрос для остальных.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, func: Callable[[], Awaitable[ResultT]]
+    ) -> ResultT:
+        """
+        Выполнить ``func`` или дождаться уже выполняющегося вызова.
+
+        Args:
+            key: Ключ запроса.
+            func: Фабрика корутины, выполняющей запрос.
+
+        Returns:
+            Результат ``func`` (общий для всех ожидающих).
+        """
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Ошибка уже доставлена ожидающим; забираем её, чтобы не было
+        # "Task exception was never retrieved", если все они отменены.
+        if not task.cancelled():
+            task.exception()
+
+
+def make_request_key(
+    method: str,
+    url: str,
+    model: Any,
+    *,
+    bot_key: Hashable,
+    is_return_raw: bool,
+    kwargs: dict[str, Any],
+) -> Hashable | None:
+    """
+    Построить ключ single-flight для запроса.
+
+    Ключ строится только для запросов без тела и дополнительных
+    параметров aiohttp, кроме ``params``.
+
+    Args:
+        bot_key: Идентификатор бота. ``DefaultConnectionProperties``
+            может быть общим для нескольких ботов, а ответ зависит
+            от токена, поэтому запросы разных ботов не объединяются.
+
+    Returns:
+        Hashable | None: Ключ или None, если запрос нельзя объединять.
+    """
+
+    if set(kwargs) - {"params"}:
+        return None
+
+    params: list[tuple[str, Any]] = []
+    for name, value in (kwargs.get("params") or {}).items():
+        item = tuple(value) if isinstance(value, list) else value
+        if not isinstance(item, Hashable):
+            return None
+        params.append((name, item))
+
+    key = (
+        bot_key,
+        method,
+        url,
+        model,
+        is_return_raw,
+        tuple(sorted(params)),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import ssl
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiohttp import TCPConnector
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
 RUSSIAN_TRUSTED_CA_BUNDLE = Path(__file__).with_name("russiantrustedca.pem")
 
 
@@ -19,24 +23,42 @@ def create_default_ssl_context() -> ssl.SSLContext:
     return ssl_context
 
 
-def create_default_connector() -> TCPConnector:
-    """Создать TCPConnector с доверенным CA для API MAX."""
+@cache
+def default_ssl_context() -> ssl.SSLContext:
+    """
+    Общий для процесса SSL-контекст с доверенным российским CA.
+
+    CA-бандл читается один раз; все connector'ы библиотеки используют
+    этот контекст.
+    """
+
+    return create_default_ssl_context()
+
+
+def create_default_connector(
+    connector_options: Mapping[str, Any] | None = None,
+) -> TCPConnector:
+    """
+    Создать TCPConnector с доверенным CA для API MAX.
 
-    return TCPConnector(ssl=create_default_ssl_context())
+    Args:
+        connector_options: Параметры пула соединений для
+            ``TCPConnector`` (``limit_per_host``, ``ttl_dns_cache``,
+            ``keepalive_timeout`` и т.д.).
+    """
 
+    return TCPConnector(ssl=default_ssl_context(), **(connector_options or {}))
 
-def with_default_connector(kwargs: dict[str, Any]) -> dict[str, Any]:
+
+def with_default_connector(
+    kwargs: dict[str, Any],
+    connector_options: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
     """Добавить connector по умолчанию, если он не задан явно."""
 
     session_kwargs = dict(kwargs)
     if "connector" not in session_kwargs:
-        session_kwargs["connector"] = create_default_connector()
+        session_kwargs["connector"] = create_default_connector(
+            connector_options
+        )
     return session_kwargs
-
-
-def connector_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
-    """Вернуть только connector для временной aiohttp-сессии."""
-
-    if "connector" in kwargs:
-        return {"connector": kwargs["connector"]}
-    return {"connector": create_default_connector()}
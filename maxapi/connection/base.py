@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import functools
 import mimetypes
 import re
+from contextlib import nullcontext
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -13,36 +15,73 @@ from urllib.parse import unquote
 import aiofiles
 import aiofiles.os
 import backoff
-import puremagic
 from aiohttp import (
     ClientConnectionError,
+    ClientPayloadError,
     ClientResponse,
     ClientSession,
+    ClientTimeout,
     FormData,
 )
-from puremagic.main import PureError
 
-from ..client.ssl import connector_kwargs
+from ..client.deadline import check_deadline, deadline_scope, time_left
+from ..client.endpoints import resolve_api_path
+from ..client.priority import (
+    RequestPriority,
+    current_priority,
+    priority_scope,
+)
+from ..client.rate_limiter import parse_retry_after
+from ..client.single_flight import make_request_key
 from ..enums.api_path import ApiPath
+from ..enums.http_method import HTTPMethod
 from ..enums.update import UpdateType
 from ..exceptions.download_file import DownloadFileError
-from ..exceptions.max import InvalidToken, MaxApiError, MaxConnection
+from ..exceptions.max import (
+    DeadlineExceeded,
+    InvalidToken,
+    MaxApiError,
+    MaxConnection,
+    MaxUploadFileFailed,
+)
 from ..loggers import logger_bot
 from ..types.bot_mixin import BotMixin
+from ..types.input_media import guess_mime, sniff_mime
 from ..utils.runtime import bind_bot
+from .download import (
+    DEFAULT_MIN_PARALLEL_SIZE,
+    PART_SUFFIX,
+    STATE_SUFFIX,
+    ByteRange,
+    DownloadState,
+    expected_size,
+    plan_ranges,
+    ranged_size,
+    response_validator,
+)
+from .upload import AsyncStreamPayload, StreamPayload
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Callable,
+        Sequence,
+    )
 
     from backoff.types import Details
     from pydantic import BaseModel
 
     from ..bot import Bot
-    from ..enums.http_method import HTTPMethod
+    from ..client.metrics import EndpointMetrics
     from ..enums.upload_type import UploadType
+    from .upload import ProgressCallback
 
 
 DOWNLOAD_CHUNK_SIZE = 65536
+# Больше этого размера буфер download_bytes_io растёт по мере чтения,
+# а не выделяется заранее по заявленному Content-Length
+DOWNLOAD_MAX_PREALLOCATE = 64 * 1024 * 1024
 
 
 class _RetryableServerError(Exception):
@@ -53,6 +92,10 @@ class _RetryableServerError(Exception):
         super().__init__(f"Server error {status}")
 
 
+class _RangeNotSupported(Exception):
+    """Сервер ответил 200 на запрос диапазона."""
+
+
 class NamedBytesIO(BytesIO):
     """
     BytesIO с поддержкой атрибута .name для единообразия с файловыми объектами.
@@ -68,6 +111,24 @@ class NamedBytesIO(BytesIO):
         self.name = name  # Соответствует протоколу typing.BinaryIO
 
 
+def _decode_body(body: bytes, loads: Callable[[bytes], Any]) -> Any:
+    """Разобрать JSON-тело ответа; пустое тело — None."""
+    if not body.strip():
+        return None
+    return loads(body)
+
+
+def _upload_form(payload: StreamPayload) -> FormData:
+    form = FormData(quote_fields=False)
+    form.add_field(
+        name="data",
+        value=payload,
+        filename=payload.filename,
+        content_type=payload.content_type,
+    )
+    return form
+
+
 def _on_backoff(details: Details) -> None:
     """Логирование при retry.
 
@@ -94,6 +155,46 @@ def _on_backoff(details: Details) -> None:
         )
 
 
+def _count_retry(stats: EndpointMetrics, details: Details) -> None:
+    """Учесть retry из backoff в метриках эндпоинта."""
+    exc = details["exception"]  # type: ignore[typeddict-item]
+    if isinstance(exc, _RetryableServerError):
+        stats.retries[str(exc.status)] += 1
+    else:
+        stats.retries["connection"] += 1
+
+
+def _encode_body(
+    kwargs: dict[str, Any], dumps: Callable[[Any], bytes]
+) -> tuple[dict[str, Any], int]:
+    """
+    Подготовить тело запроса к учёту в метриках.
+
+    ``json`` сериализуется один раз и передаётся в aiohttp как ``data``,
+    чтобы размер не считался повторной сериализацией.
+
+    Returns:
+        tuple[dict[str, Any], int]: Аргументы запроса и размер тела
+            в байтах.
+    """
+    data = kwargs.get("data")
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return kwargs, len(data)
+    if isinstance(data, str):
+        return kwargs, len(data.encode())
+    if kwargs.get("json") is None:
+        return kwargs, 0
+
+    body = dumps(kwargs["json"])
+    encoded = {name: value for name, value in kwargs.items() if name != "json"}
+    encoded["data"] = body
+    encoded["headers"] = {
+        **(kwargs.get("headers") or {}),
+        "Content-Type": "application/json",
+    }
+    return encoded, len(body)
+
+
 class BaseConnection(BotMixin):
     """
     Базовый класс для всех методов API.
@@ -114,11 +215,13 @@ class BaseConnection(BotMixin):
         Атрибуты:
             bot: Экземпляр бота.
             session: aiohttp-сессия.
+            upload_session: aiohttp-сессия для серверов загрузки.
             after_input_media_delay: Задержка после ввода медиа.
         """
 
         self.bot: Bot | None = None
         self.session: ClientSession | None = None
+        self.upload_session: ClientSession | None = None
         self.after_input_media_delay: float = self.AFTER_MEDIA_INPUT_DELAY
         self.api_url = self.API_URL
 
@@ -139,16 +242,47 @@ class BaseConnection(BotMixin):
         model: BaseModel | Any = None,
         *,
         is_return_raw: bool = False,
+        deadline: float | None = None,
+        priority: RequestPriority | None = None,
         **kwargs: Any,
     ) -> Any | BaseModel:
         """
         Выполняет HTTP-запрос к API с автоматическим retry
         при серверных ошибках.
 
+        Таймаут запроса берётся из ``path_timeouts`` (если для
+        эндпоинта задан профиль) или общего ``timeout``. При заданном
+        дедлайне (``deadline`` или :func:`~maxapi.client.deadline_scope`)
+        HTTP-таймаут и паузы между retry не выходят за него, а по его
+        истечении выбрасывается ``DeadlineExceeded``.
+
         При получении HTTP-статуса из списка ``retry_on_statuses``
         (по умолчанию 502, 503, 504) запрос повторяется до
         ``max_retries`` раз с экспоненциальной задержкой.
 
+        Если задан ``priority_scheduler``, запрос ждёт свободный слот
+        в очереди своего приоритета: обработчики событий получают
+        слоты раньше фоновых задач вроде рассылок.
+
+        Если в ``default_connection`` задан ``circuit_breaker``, при
+        открытом выключателе запрос сразу завершается ошибкой
+        ``CircuitBreakerOpen`` без обращения к сети и без retry.
+
+        Если в ``default_connection`` настроен ``rate_limiter``, перед
+        каждой попыткой запрос ждёт свободный токен, а ответ 429
+        повторяется (до ``max_retries`` раз) после паузы из заголовка
+        ``Retry-After``.
+
+        При ``coalesce_get_requests=True`` одинаковые параллельные
+        GET-запросы (кроме ``/updates``) объединяются: HTTP-запрос
+        и валидация модели выполняются один раз, а все вызывающие
+        получают один и тот же объект результата.
+
+        Тело ответа читается как байты и валидируется в ``model``
+        напрямую (``model_validate_json``). Промежуточный dict
+        разбирается ``json_codec`` только при ``is_return_raw=True``,
+        наличии обработчиков ``raw_api_response`` и для ошибок.
+
         Args:
             method: HTTP-метод (GET, POST и т.д.).
             path: Путь до конечной точки.
@@ -156,6 +290,10 @@ class BaseConnection(BotMixin):
                 десериализации ответа, если is_return_raw=False.
             is_return_raw: Если True — вернуть сырой
                 ответ, иначе — результат десериализации.
+            deadline: Сколько секунд отведено на запрос вместе
+                со всеми retry.
+            priority: Приоритет запроса для ``priority_scheduler``;
+                по умолчанию — из :func:`~maxapi.client.priority_scope`.
             **kwargs: Дополнительные параметры (query, headers, json).
 
         Returns:
@@ -164,30 +302,209 @@ class BaseConnection(BotMixin):
         Raises:
             RuntimeError: Если бот не инициализирован.
             MaxConnection: Ошибка соединения.
+            CircuitBreakerOpen: Выключатель эндпоинта открыт.
+            DeadlineExceeded: Истёк дедлайн запроса.
             InvalidToken: Ошибка авторизации (401).
             MaxApiError: Ошибка API (после исчерпания retry).
         """
 
+        if deadline is not None or priority is not None:
+            with deadline_scope(deadline), priority_scope(priority):
+                return await self.request(
+                    method, path, model, is_return_raw=is_return_raw, **kwargs
+                )
+
         bot = self._ensure_bot()
+        url = path.value if isinstance(path, ApiPath) else path
+
+        flight = bot.default_connection.single_flight
+        if (
+            flight is not None
+            and method == HTTPMethod.GET
+            and resolve_api_path(url) is not ApiPath.UPDATES
+        ):
+            key = make_request_key(
+                method.value,
+                url,
+                model,
+                bot_key=id(bot),
+                is_return_raw=is_return_raw,
+                kwargs=kwargs,
+            )
+            if key is not None:
+                return await flight.do(
+                    key,
+                    functools.partial(
+                        self._send_request,
+                        bot,
+                        method,
+                        url,
+                        model,
+                        is_return_raw=is_return_raw,
+                        **kwargs,
+                    ),
+                )
+
+        return await self._send_request(
+            bot, method, url, model, is_return_raw=is_return_raw, **kwargs
+        )
+
+    async def _send_request(
+        self,
+        bot: Bot,
+        method: HTTPMethod,
+        url: str,
+        model: BaseModel | Any,
+        *,
+        is_return_raw: bool,
+        **kwargs: Any,
+    ) -> Any | BaseModel:
+        """Выполнить запрос из :meth:`request` (retry, лимиты, парсинг)."""
+
+        metrics = bot.default_connection.metrics
+        if metrics is None:
+            return await self._perform_request(
+                bot,
+                method,
+                url,
+                model,
+                None,
+                is_return_raw=is_return_raw,
+                **kwargs,
+            )
+
+        stats = metrics.endpoint(method, url)
+        with stats.track():
+            return await self._perform_request(
+                bot,
+                method,
+                url,
+                model,
+                stats,
+                is_return_raw=is_return_raw,
+                **kwargs,
+            )
+
+    async def _perform_request(
+        self,
+        bot: Bot,
+        method: HTTPMethod,
+        url: str,
+        model: BaseModel | Any,
+        stats: EndpointMetrics | None,
+        *,
+        is_return_raw: bool,
+        **kwargs: Any,
+    ) -> Any | BaseModel:
         conn = bot.default_connection
         retry_statuses = conn.retry_on_statuses
+        limiter = conn.rate_limiter
+        scheduler = conn.priority_scheduler
+        priority = current_priority()
+        breaker = conn.circuit_breaker
+        breaker_key = (
+            breaker.key_for(bot.api_url, url) if breaker is not None else ""
+        )
+        profile_timeout = conn.timeout_for(method, url)
+        operation = f"{method.value} {url}"
+        body_size = 0
+        if stats is not None:
+            kwargs, body_size = _encode_body(
+                kwargs, conn.json_codec.dumps_bytes
+            )
+        on_backoff: list[Callable[[Details], None]] = [_on_backoff]
+        if stats is not None:
+            on_backoff.append(lambda details: _count_retry(stats, details))
+
+        def _request_kwargs() -> dict[str, Any]:
+            remaining = check_deadline(operation)
+            if "timeout" in kwargs:
+                return kwargs
+            timeout = profile_timeout
+            if remaining is not None and (
+                timeout.total is None or remaining < timeout.total
+            ):
+                timeout = ClientTimeout(
+                    total=remaining, sock_connect=timeout.sock_connect
+                )
+            if timeout is conn.timeout:
+                return kwargs
+            return {**kwargs, "timeout": timeout}
+
+        async def _send_with_limits(session: ClientSession) -> Any:
+            throttled = 0
+            while True:
+                async with (
+                    scheduler.slot(priority)
+                    if scheduler is not None
+                    else nullcontext()
+                ):
+                    if limiter is not None:
+                        await limiter.acquire(url)
 
-        url = path.value if isinstance(path, ApiPath) else path
+                    resp = await session.request(
+                        method=method.value,
+                        url=url,
+                        **_request_kwargs(),
+                    )
+                    if stats is not None:
+                        stats.responses[str(resp.status)] += 1
+                        stats.bytes_out += body_size
+                    if scheduler is not None:
+                        # слот держим до конца чтения ответа
+                        await resp.read()
+
+                if (
+                    limiter is None
+                    or resp.status != 429
+                    or throttled >= conn.max_retries
+                ):
+                    return resp
+
+                throttled += 1
+                if stats is not None:
+                    stats.retries["429"] += 1
+                delay = parse_retry_after(resp.headers.get("Retry-After"))
+                await resp.read()
+                logger_bot.warning(
+                    "Лимит запросов к %s (429), попытка %d, жду %.1fс",
+                    url,
+                    throttled,
+                    delay,
+                )
+                if not limiter.on_rate_limited(url, delay):
+                    await asyncio.sleep(delay)
 
         @backoff.on_exception(
             backoff.expo,
             (ClientConnectionError, _RetryableServerError),
             max_tries=conn.max_retries + 1,
+            # None (нет дедлайна) backoff поддерживает, но не в типах
+            max_time=time_left,  # type: ignore[arg-type]
             factor=conn.retry_backoff_factor,
-            on_backoff=_on_backoff,
+            on_backoff=on_backoff,
         )
         async def _do_request() -> Any:
             session = await bot.ensure_session()
-            resp = await session.request(
-                method=method.value,
-                url=url,
-                **kwargs,
-            )
+            if breaker is not None:
+                breaker.before_request(breaker_key)
+            ok: bool | None = None
+            try:
+                resp = await _send_with_limits(session)
+                if resp.status != 401:
+                    ok = resp.status not in retry_statuses
+            except (ClientConnectionError, asyncio.TimeoutError) as e:
+                ok = False
+                if stats is not None:
+                    stats.responses[
+                        "error"
+                        if isinstance(e, ClientConnectionError)
+                        else "timeout"
+                    ] += 1
+                raise
+            finally:
+                if breaker is not None:
+                    breaker.record(breaker_key, ok=ok)
 
             if resp.status == 401:
                 await session.close()
@@ -201,26 +518,58 @@ class BaseConnection(BotMixin):
 
         try:
             response = await _do_request()
-        except ClientConnectionError as e:
-            raise MaxConnection(f"Ошибка при отправке запроса: {e}") from e
-        except _RetryableServerError as e:
-            raise MaxApiError(code=e.status, raw={"error": str(e)}) from e
+        except (
+            ClientConnectionError,
+            _RetryableServerError,
+            asyncio.TimeoutError,
+        ) as e:
+            remaining = time_left()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(
+                    f"Истёк дедлайн запроса: {operation}"
+                ) from e
+            if isinstance(e, ClientConnectionError):
+                raise MaxConnection(f"Ошибка при отправке запроса: {e}") from e
+            if isinstance(e, _RetryableServerError):
+                raise MaxApiError(code=e.status, raw={"error": str(e)}) from e
+            raise
+
+        loads = conn.json_codec.loads
+        body = await response.read()
+        if stats is not None:
+            stats.bytes_in += len(body)
+        # dict ответа нужен только обработчикам raw_api_response
+        dispatcher = bot.dispatcher
+        if (
+            dispatcher is not None
+            and not dispatcher.has_raw_response_handlers()
+        ):
+            dispatcher = None
 
         if not response.ok:
-            raw = await response.json()
-            if bot.dispatcher:
+            try:
+                raw = _decode_body(body, loads)
+            except ValueError:
+                raw = {"error": body.decode(errors="replace")}
+            if dispatcher is not None:
                 asyncio.create_task(
-                    bot.dispatcher.handle_raw_response(
+                    dispatcher.handle_raw_response(
                         UpdateType.RAW_API_RESPONSE, raw
                     )
                 )
             raise MaxApiError(code=response.status, raw=raw)
 
-        raw = await response.json()
+        if not is_return_raw and dispatcher is None:
+            # Быстрый путь: pydantic разбирает байты сам,
+            # без промежуточного dict.
+            result = model.model_validate_json(body)
+            return bind_bot(result, bot)
+
+        raw = _decode_body(body, loads)
 
-        if bot.dispatcher:
+        if dispatcher is not None:
             asyncio.create_task(
-                bot.dispatcher.handle_raw_response(
+                dispatcher.handle_raw_response(
                     UpdateType.RAW_API_RESPONSE, raw
                 )
             )
@@ -228,55 +577,64 @@ class BaseConnection(BotMixin):
         if is_return_raw:
             return raw
 
-        model = model(**raw)  # type: ignore
+        result = model.model_validate(raw)
 
-        return bind_bot(model, bot)
+        return bind_bot(result, bot)
 
-    async def upload_file(self, url: str, path: str, type: UploadType) -> str:
+    async def upload_file(
+        self,
+        url: str,
+        path: str,
+        type: UploadType,
+        *,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> str:
         """
         Загружает файл на сервер.
 
+        Файл читается с диска кусками по мере отправки, поэтому
+        память на загрузку не зависит от размера файла. При обрыве
+        соединения или статусе из ``retry_on_statuses`` загрузка
+        повторяется с начала (до ``max_retries`` раз).
+
         Args:
             url: URL загрузки.
             path: Путь к файлу.
             type: Тип файла.
+            content_type: MIME-тип; по умолчанию — по расширению.
+            progress: Колбэк прогресса, получает
+                :class:`~maxapi.connection.upload.UploadProgress`.
 
         Returns:
             str: Сырой .text() ответ от сервера.
         """
 
-        async with aiofiles.open(path, "rb") as f:
-            file_data = await f.read()
-
-        path_object = Path(path)
-        basename = path_object.name
-
-        form = FormData(quote_fields=False)
-        form.add_field(
-            name="data",
-            value=file_data,
-            filename=basename,
-            content_type=mimetypes.guess_type(path)[0] or f"{type.value}/*",
-        )
+        basename = Path(path).name
+        content_type = content_type or guess_mime(path) or f"{type.value}/*"
+
+        def make_form(attempt: int) -> FormData:
+            return _upload_form(
+                StreamPayload(
+                    path,
+                    filename=basename,
+                    content_type=content_type,
+                    progress=progress,
+                    attempt=attempt,
+                )
+            )
 
-        bot = self._ensure_bot()
-
-        session = bot.session
-        if session is not None and not session.closed:
-            async with session.post(url=url, data=form) as response:
-                return await response.text()
-        else:
-            async with (
-                ClientSession(
-                    timeout=bot.default_connection.timeout,
-                    **connector_kwargs(bot.default_connection.kwargs),
-                ) as temp_session,
-                temp_session.post(url=url, data=form) as response,
-            ):
-                return await response.text()
+        return await self._post_upload(url, make_form)
 
     async def upload_file_buffer(
-        self, filename: str, url: str, buffer: bytes, type: UploadType
+        self,
+        filename: str,
+        url: str,
+        buffer: bytes,
+        type: UploadType,
+        *,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
     ) -> str:
         """
         Загружает файл из буфера.
@@ -286,49 +644,144 @@ class BaseConnection(BotMixin):
             url: URL загрузки.
             buffer: Буфер данных.
             type: Тип файла.
+            content_type: MIME-тип; по умолчанию определяется
+                по сигнатуре буфера.
+            progress: Колбэк прогресса, получает
+                :class:`~maxapi.connection.upload.UploadProgress`.
 
         Returns:
             str: Сырой .text() ответ от сервера.
         """
 
-        try:
-            matches = puremagic.magic_string(buffer[:4096])
-            if matches:
-                mime_type = matches[0].mime_type
-                ext = mimetypes.guess_extension(mime_type) or ""
-            else:
-                mime_type = f"{type.value}/*"
-                ext = ""
-        except (OSError, ValueError, AttributeError, PureError):
+        mime_type = content_type
+        if mime_type is None:
+            # разбор сигнатуры — в потоке, результат кешируется
+            mime_type = await asyncio.to_thread(sniff_mime, buffer)
+        if mime_type is not None:
+            ext = mimetypes.guess_extension(mime_type) or ""
+        else:
             mime_type = f"{type.value}/*"
             ext = ""
 
         basename = f"{filename}{ext}"
 
-        form = FormData(quote_fields=False)
-        form.add_field(
-            name="data",
-            value=buffer,
-            filename=basename,
-            content_type=mime_type,
-        )
+        def make_form(attempt: int) -> FormData:
+            return _upload_form(
+                StreamPayload(
+                    buffer,
+                    filename=basename,
+                    content_type=mime_type,
+                    progress=progress,
+                    attempt=attempt,
+                )
+            )
+
+        return await self._post_upload(url, make_form)
+
+    async def upload_file_stream(
+        self,
+        filename: str,
+        url: str,
+        source: AsyncIterable[bytes] | Callable[[], AsyncIterable[bytes]],
+        type: UploadType,
+        *,
+        size: int | None = None,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> str:
+        """
+        Загружает файл из асинхронного потока байт.
+
+        Куски отправляются по мере поступления из ``source``; в памяти
+        держится не больше ``RELAY_BUFFER_CHUNKS`` кусков. Повтор
+        загрузки возможен, только если ``source`` — функция,
+        создающая новый поток.
+
+        Args:
+            filename: Имя файла.
+            url: URL загрузки.
+            source: Асинхронный итератор кусков или функция без
+                аргументов, возвращающая новый итератор.
+            type: Тип файла.
+            size: Размер файла, если известен.
+            content_type: MIME-тип; по умолчанию — по имени файла.
+            progress: Колбэк прогресса, получает
+                :class:`~maxapi.connection.upload.UploadProgress`.
+
+        Returns:
+            str: Сырой .text() ответ от сервера.
+
+        Raises:
+            MaxUploadFileFailed: Нужен повтор, а поток одноразовый.
+        """
+
+        mime_type = content_type or guess_mime(filename) or f"{type.value}/*"
+
+        def make_form(attempt: int) -> FormData:
+            if callable(source):
+                stream = source()
+            elif attempt > 1:
+                raise MaxUploadFileFailed(
+                    "Ошибка при загрузке файла: одноразовый поток "
+                    "уже прочитан, повтор невозможен"
+                )
+            else:
+                stream = source
+            return _upload_form(
+                AsyncStreamPayload(
+                    stream,
+                    filename=filename,
+                    content_type=mime_type,
+                    size=size,
+                    progress=progress,
+                    attempt=attempt,
+                )
+            )
+
+        return await self._post_upload(url, make_form)
+
+    async def _post_upload(
+        self, url: str, make_form: Callable[[int], FormData]
+    ) -> str:
+        """
+        Отправить файл на сервер загрузки через пул загрузок бота.
+
+        Форма собирается заново на каждую попытку: тело запроса
+        потоковое и не может быть отправлено повторно.
+        """
 
         bot = self._ensure_bot()
+        session = await bot.ensure_upload_session()
+        conn = bot.default_connection
+        attempt = 0
 
-        session = bot.session
-        if session is not None and not session.closed:
-            async with session.post(url=url, data=form) as response:
-                return await response.text()
-        else:
-            async with (
-                ClientSession(
-                    timeout=bot.default_connection.timeout,
-                    **connector_kwargs(bot.default_connection.kwargs),
-                ) as temp_session,
-                temp_session.post(url=url, data=form) as response,
-            ):
+        @backoff.on_exception(
+            backoff.expo,
+            (ClientConnectionError, _RetryableServerError),
+            max_tries=conn.max_retries + 1,
+            factor=conn.retry_backoff_factor,
+            on_backoff=_on_backoff,
+        )
+        async def _do_upload() -> str:
+            nonlocal attempt
+            attempt += 1
+            async with session.post(
+                url=url, data=make_form(attempt)
+            ) as response:
+                if response.status in conn.retry_on_statuses:
+                    await response.read()
+                    raise _RetryableServerError(response.status)
                 return await response.text()
 
+        try:
+            return await _do_upload()
+        except ClientConnectionError as e:
+            raise MaxConnection(f"Ошибка при загрузке файла: {e}") from e
+        except _RetryableServerError as e:
+            raise MaxUploadFileFailed(
+                f"Ошибка при загрузке файла: HTTP {e.status}"
+            ) from e
+
     async def _fetch_response(self, url: str) -> ClientResponse:
         bot = self._ensure_bot()
         session = await bot.ensure_session()
@@ -384,6 +837,22 @@ class BaseConnection(BotMixin):
         Raises:
             DownloadFileError: при ошибке запроса или недопустимом статусе.
         """
+        self._check_download_response(response)
+
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+        finally:
+            response.release()
+
+    @staticmethod
+    def _check_download_response(response: ClientResponse) -> None:
+        """
+        Проверить, что ответ можно читать.
+
+        Raises:
+            DownloadFileError: response освобождён или статус ошибочный.
+        """
         if getattr(response, "_released", False):
             raise DownloadFileError("response уже освобождён")
 
@@ -393,12 +862,6 @@ class BaseConnection(BotMixin):
                 f"Ошибка при скачивании: HTTP {response.status}"
             )
 
-        try:
-            async for chunk in response.content.iter_chunked(chunk_size):
-                yield chunk
-        finally:
-            response.release()
-
     @staticmethod
     def _get_image_id(r: str) -> str | None:
         """
@@ -552,6 +1015,8 @@ class BaseConnection(BotMixin):
         *,
         filename: Path | str | None = None,
         chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        parallel: int = 1,
+        min_parallel_size: int = DEFAULT_MIN_PARALLEL_SIZE,
     ) -> Path:
         """
         Скачивает файл по URL и сохраняет на диск.
@@ -565,6 +1030,16 @@ class BaseConnection(BotMixin):
         Метод работает не через общий ``request()``, поскольку
         ответом является бинарный поток, а не JSON.
 
+        При ``parallel > 1`` файл от ``min_parallel_size`` байт,
+        для которого сервер объявил ``Accept-Ranges: bytes`` и
+        ``Content-Length``, скачивается ``parallel`` диапазонами
+        по отдельным соединениям в заранее выделенный файл
+        ``<имя>.part``. Каждый диапазон повторяется независимо. Если
+        скачивание прервалось, файл ``<имя>.part`` и состояние
+        ``<имя>.part.state.json`` остаются, и повторный вызов с тем же
+        URL и каталогом продолжит с места остановки. Если сервер
+        не поддерживает диапазоны, файл скачивается одним потоком.
+
         Если файл существует, то возвращает новый свободный путь для сохранения
 
         Windows style:
@@ -580,6 +1055,10 @@ class BaseConnection(BotMixin):
                 или значение по умолчанию.
             chunk_size: Размер чанка при потоковом чтении
                 (по умолчанию 64 КБ).
+            parallel: Число параллельных диапазонов; 1 — одним
+                потоком (по умолчанию).
+            min_parallel_size: Минимальный размер файла
+                для параллельного режима (по умолчанию 8 МБ).
 
         Returns:
             Path: Полный путь к скачанному файлу.
@@ -612,6 +1091,26 @@ class BaseConnection(BotMixin):
                 filename = self._capture_filename(response)
 
             final_path = self._check_file_exists(dest / filename)
+            size = (
+                ranged_size(response, min_parallel_size)
+                if parallel > 1
+                else None
+            )
+            if size is not None:
+                validator = response_validator(response)
+                # тело первого ответа не нужно, диапазоны качаем заново
+                response.close()
+                if await self._download_ranges(
+                    url,
+                    final_path,
+                    size=size,
+                    validator=validator,
+                    parts=parallel,
+                    chunk_size=chunk_size,
+                ):
+                    return final_path
+                response = await self._fetch_response(url)
+
             async with aiofiles.open(final_path, "wb") as f:
                 async for chunk in self._fetch_content_stream(
                     response, chunk_size=chunk_size
@@ -627,11 +1126,157 @@ class BaseConnection(BotMixin):
 
         return final_path
 
+    async def _download_ranges(
+        self,
+        url: str,
+        final_path: Path,
+        *,
+        size: int,
+        validator: str | None,
+        parts: int,
+        chunk_size: int,
+    ) -> bool:
+        """
+        Скачать файл диапазонами в ``final_path``.
+
+        Returns:
+            bool: False, если сервер не поддерживает диапазоны
+                (ничего не записано).
+
+        Raises:
+            DownloadFileError: Диапазон не скачан после всех retry;
+                ``.part`` и состояние остаются для продолжения.
+        """
+
+        bot = self._ensure_bot()
+        session = await bot.ensure_session()
+        part_path = final_path.with_name(final_path.name + PART_SUFFIX)
+        state_path = part_path.with_name(part_path.name + STATE_SUFFIX)
+
+        state = None
+        if part_path.exists():
+            state = await DownloadState.load(
+                state_path, url=url, size=size, validator=validator
+            )
+        if state is None:
+            state = DownloadState(
+                state_path, url, size, validator, plan_ranges(size, parts)
+            )
+            async with aiofiles.open(part_path, "wb") as f:
+                await f.truncate(size)
+            await state.save()
+        else:
+            logger_bot.info(
+                "Продолжаю скачивание %s с %d из %d байт",
+                final_path.name,
+                state.done,
+                size,
+            )
+
+        tasks = [
+            asyncio.ensure_future(
+                self._download_range(
+                    session, url, part_path, byte_range, state, chunk_size
+                )
+            )
+            for byte_range in state.ranges
+            if byte_range.remaining > 0
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except _RangeNotSupported:
+            logger_bot.info(
+                "Сервер не отдаёт диапазоны %s, качаю одним потоком", url
+            )
+            await _cancel_all(tasks)
+            part_path.unlink(missing_ok=True)
+            state.remove()
+            return False
+        except BaseException:
+            await _cancel_all(tasks)
+            await state.save()
+            raise
+
+        part_path.replace(final_path)
+        state.remove()
+        return True
+
+    async def _download_range(
+        self,
+        session: ClientSession,
+        url: str,
+        part_path: Path,
+        byte_range: ByteRange,
+        state: DownloadState,
+        chunk_size: int,
+    ) -> None:
+        """Скачать один диапазон, повторяя с места обрыва."""
+
+        conn = self._ensure_bot().default_connection
+
+        @backoff.on_exception(
+            backoff.expo,
+            (
+                ClientConnectionError,
+                ClientPayloadError,
+                _RetryableServerError,
+                asyncio.TimeoutError,
+            ),
+            max_tries=conn.max_retries + 1,
+            factor=conn.retry_backoff_factor,
+            on_backoff=_on_backoff,
+        )
+        async def _fetch_rest() -> None:
+            resp = await session.request(
+                "GET", url, headers={"Range": byte_range.header}
+            )
+            try:
+                if resp.status == 200:
+                    raise _RangeNotSupported
+                if resp.status in conn.retry_on_statuses:
+                    raise _RetryableServerError(resp.status)
+                if resp.status != 206:
+                    raise DownloadFileError(
+                        f"Ошибка при скачивании диапазона: HTTP {resp.status}"
+                    )
+                # без буфера: записанное сразу попадает в файл
+                # и состояние не опережает данные на диске
+                async with aiofiles.open(part_path, "r+b", buffering=0) as f:
+                    await f.seek(byte_range.offset)
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        data = chunk[: byte_range.remaining]
+                        await f.write(data)
+                        byte_range.done += len(data)
+                        await state.save(force=False)
+                        if not byte_range.remaining:
+                            break
+            finally:
+                resp.release()
+
+            if byte_range.remaining:
+                raise ClientPayloadError(
+                    f"Диапазон {byte_range.header} оборвался"
+                )
+
+        try:
+            await _fetch_rest()
+        except (
+            ClientConnectionError,
+            ClientPayloadError,
+            asyncio.TimeoutError,
+        ) as e:
+            raise DownloadFileError(f"Network error: {e}") from e
+        except _RetryableServerError as e:
+            raise DownloadFileError(
+                f"Ошибка при скачивании файла: HTTP {e.status}"
+            ) from e
+
     async def download_bytes_io(
         self,
         url: str,
         *,
         chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_preallocate: int = DOWNLOAD_MAX_PREALLOCATE,
     ) -> NamedBytesIO:
         """
         Скачивает файл по URL и возвращает file-like объект в памяти.
@@ -639,15 +1284,23 @@ class BaseConnection(BotMixin):
         Внимание: весь файл загружается в оперативную память.
         Не используйте для файлов >100–200 МБ без контроля.
 
+        Если сервер сообщил ``Content-Length`` не больше
+        ``max_preallocate``, буфер выделяется один раз под весь файл
+        и заполняется по мере скачивания, без перевыделений при росте.
+        Больший заявленный размер не выделяется заранее: буфер растёт
+        по мере поступления данных.
+
         Args:
             url: URL файла.
             chunk_size: Размер чанка при потоковом чтении.
+            max_preallocate: Максимальный размер буфера, выделяемого
+                заранее по ``Content-Length``, в байтах.
 
         Returns:
             NamedBytesIO: Содержимое файла с атрибутом .name.
             Наследуется от io.BytesIO
             Для zero-copy передачи используйте .getbuffer(),
-            для получения bytes — .read() или .getvalue().
+            для получения bytes без копирования — .getvalue().
 
         Raises:
             DownloadFileError: при ошибке скачивания.
@@ -655,14 +1308,24 @@ class BaseConnection(BotMixin):
         bio = NamedBytesIO()
 
         response = await self._fetch_response(url)
+        self._check_download_response(response)
         bio.name = self._capture_filename(response)
 
+        size = expected_size(response)
+        if size and size <= max_preallocate:
+            # запись за концом растягивает буфер сразу до нужного размера
+            bio.seek(size - 1)
+            bio.write(b"\0")
+            bio.seek(0)
+
         async for chunk in self._fetch_content_stream(
             response,
             chunk_size=chunk_size,
         ):
             bio.write(chunk)
 
+        # ответ мог оказаться короче заявленного
+        bio.truncate()
         bio.seek(0)  # обязательно переходим в начало
 
         return bio
@@ -672,16 +1335,20 @@ class BaseConnection(BotMixin):
         url: str,
         *,
         chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_preallocate: int = DOWNLOAD_MAX_PREALLOCATE,
     ) -> bytes:
         """
         Скачивает файл по URL и возвращает bytes в памяти.
 
         Внимание: весь файл загружается в оперативную память.
         Не используйте для файлов >100–200 МБ без контроля.
+        Содержимое не копируется повторно: пиковый расход памяти
+        примерно равен размеру файла.
 
         Args:
             url: URL файла.
             chunk_size: Размер чанка при потоковом чтении.
+            max_preallocate: См. :meth:`download_bytes_io`.
 
         Returns:
             bytes: Содержимое файла
@@ -689,6 +1356,46 @@ class BaseConnection(BotMixin):
         Raises:
             DownloadFileError: при ошибке скачивания.
         """
-        bio = await self.download_bytes_io(url=url, chunk_size=chunk_size)
+        bio = await self.download_bytes_io(
+            url=url, chunk_size=chunk_size, max_preallocate=max_preallocate
+        )
+
+        # getvalue() отдаёт внутренний буфер BytesIO без копии
+        return bio.getvalue()
+
+    async def iter_download(
+        self,
+        url: str,
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> AsyncIterator[memoryview]:
+        """
+        Скачивает файл по URL, отдавая его кусками.
+
+        Для обработки данных по мере поступления (хеширование,
+        разбор, пересылка) без накопления файла в памяти. Куски
+        отдаются как ``memoryview`` без копирования.
+
+        Args:
+            url: URL файла.
+            chunk_size: Размер чанка при потоковом чтении.
+
+        Yields:
+            memoryview: Очередной кусок файла.
+
+        Raises:
+            DownloadFileError: при ошибке скачивания.
+        """
+        response = await self._fetch_response(url)
+
+        async for chunk in self._fetch_content_stream(
+            response,
+            chunk_size=chunk_size,
+        ):
+            yield memoryview(chunk)
+
 
-        return bio.read()
+async def _cancel_all(tasks: Sequence[asyncio.Future[Any]]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
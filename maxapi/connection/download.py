@@ -0,0 +1,209 @@
+"""Параллельное скачивание файлов по диапазонам (HTTP Range)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import aiofiles
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from aiohttp import ClientResponse
+
+DEFAULT_MIN_PARALLEL_SIZE = 8 * 1024 * 1024
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".state.json"
+STATE_SAVE_INTERVAL = 1.0
+
+
+@dataclass(slots=True)
+class ByteRange:
+    """
+    Диапазон байт файла.
+
+    Attributes:
+        start: Первый байт.
+        end: Последний байт (включительно).
+        done: Сколько байт диапазона уже записано на диск.
+    """
+
+    start: int
+    end: int
+    done: int = 0
+
+    @property
+    def offset(self) -> int:
+        """Позиция, с которой продолжать скачивание."""
+        return self.start + self.done
+
+    @property
+    def remaining(self) -> int:
+        """Сколько байт осталось скачать."""
+        return self.end - self.offset + 1
+
+    @property
+    def header(self) -> str:
+        """Значение заголовка ``Range`` для оставшейся части."""
+        return f"bytes={self.offset}-{self.end}"
+
+
+def plan_ranges(size: int, parts: int) -> list[ByteRange]:
+    """
+    Разбить файл на ``parts`` примерно равных диапазонов.
+
+    Args:
+        size: Размер файла в байтах.
+        parts: Число диапазонов.
+
+    Returns:
+        list[ByteRange]: Диапазоны по порядку.
+    """
+
+    step = math.ceil(size / parts)
+    return [
+        ByteRange(start, min(start + step, size) - 1)
+        for start in range(0, size, step)
+    ]
+
+
+def ranged_size(response: ClientResponse, min_size: int) -> int | None:
+    """
+    Размер файла, если его имеет смысл качать по диапазонам.
+
+    Сервер должен объявить ``Accept-Ranges: bytes`` и
+    ``Content-Length``, а ответ не должен быть сжат (иначе диапазоны
+    относятся к сжатому представлению, см. :func:`expected_size`).
+
+    Args:
+        response: Ответ на обычный GET.
+        min_size: Минимальный размер для параллельного режима.
+
+    Returns:
+        int | None: Размер файла или None.
+    """
+
+    if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None
+    size = expected_size(response)
+    if size is None or size < min_size:
+        return None
+    return size
+
+
+def expected_size(response: ClientResponse) -> int | None:
+    """
+    Размер тела ответа после чтения, если он известен заранее.
+
+    Сжатый ответ aiohttp распаковывает на лету, и ``Content-Length``
+    к распакованным данным не относится.
+
+    Args:
+        response: Ответ сервера.
+
+    Returns:
+        int | None: Размер в байтах или None.
+    """
+
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    return response.content_length
+
+
+def response_validator(response: ClientResponse) -> str | None:
+    """``ETag`` или ``Last-Modified`` ответа — признак версии файла."""
+    return response.headers.get("ETag") or response.headers.get(
+        "Last-Modified"
+    )
+
+
+@dataclass(slots=True)
+class DownloadState:
+    """
+    Состояние скачивания, сохраняемое рядом с файлом.
+
+    Позволяет продолжить прерванное скачивание с тех же позиций,
+    если URL, размер и версия файла (``ETag``/``Last-Modified``)
+    не изменились.
+
+    Attributes:
+        path: Путь к файлу состояния.
+        url: URL файла.
+        size: Размер файла.
+        validator: Версия файла или None.
+        ranges: Диапазоны с прогрессом.
+    """
+
+    path: Path
+    url: str
+    size: int
+    validator: str | None
+    ranges: list[ByteRange]
+    _saved_at: float = field(default=0.0, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    @property
+    def done(self) -> int:
+        """Сколько байт скачано."""
+        return sum(r.done for r in self.ranges)
+
+    @classmethod
+    async def load(
+        cls, path: Path, *, url: str, size: int, validator: str | None
+    ) -> DownloadState | None:
+        """
+        Прочитать состояние, если оно относится к тому же файлу.
+
+        Returns:
+            DownloadState | None: Состояние или None, если файла нет,
+                он повреждён или описывает другую версию.
+        """
+
+        try:
+            async with aiofiles.open(path) as f:
+                data: dict[str, Any] = json.loads(await f.read())
+            ranges = [ByteRange(*r) for r in data["ranges"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if (
+            data.get("url") != url
+            or data.get("size") != size
+            or data.get("validator") != validator
+        ):
+            return None
+        return cls(path, url, size, validator, ranges)
+
+    async def save(self, *, force: bool = True) -> None:
+        """
+        Записать состояние на диск.
+
+        Args:
+            force: False — не чаще раза в ``STATE_SAVE_INTERVAL`` секунд.
+        """
+
+        now = monotonic()
+        if not force and now - self._saved_at < STATE_SAVE_INTERVAL:
+            return
+        self._saved_at = now
+        async with self._lock:
+            # снимок под блокировкой: более старый не перезапишет новый
+            data = {
+                "url": self.url,
+                "size": self.size,
+                "validator": self.validator,
+                "ranges": [[r.start, r.end, r.done] for r in self.ranges],
+            }
+            tmp = self.path.with_suffix(".tmp")
+            async with aiofiles.open(tmp, "w") as f:
+                await f.write(json.dumps(data))
+            tmp.replace(self.path)
+
+    def remove(self) -> None:
+        """Удалить файл состояния."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,201 @@
+"""Потоковая загрузка файлов на серверы загрузки."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import aiofiles
+from aiohttp.payload import Payload
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+    )
+
+    from aiohttp.abc import AbstractStreamWriter
+
+    ProgressCallback = Callable[["UploadProgress"], Awaitable[Any] | Any]
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+RELAY_BUFFER_CHUNKS = 4
+
+
+@dataclass(slots=True)
+class UploadProgress:
+    """
+    Состояние загрузки одного файла.
+
+    Attributes:
+        filename: Имя загружаемого файла.
+        sent: Сколько байт отправлено в текущей попытке.
+        total: Размер файла в байтах.
+            0 — размер заранее неизвестен (потоковый источник).
+        elapsed: Время с начала текущей попытки в секундах.
+        attempt: Номер попытки (с 1). При повторе загрузка
+            начинается с начала, ``sent`` сбрасывается.
+    """
+
+    filename: str
+    sent: int
+    total: int
+    elapsed: float
+    attempt: int = 1
+
+    @property
+    def fraction(self) -> float:
+        """Доля отправленных байт от 0 до 1."""
+        return self.sent / self.total if self.total else 1.0
+
+    @property
+    def speed(self) -> float:
+        """Средняя скорость отправки в байтах в секунду."""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class StreamPayload(Payload):
+    """
+    Часть multipart-формы, отправляемая кусками по ``chunk_size``.
+
+    Файл с диска читается лениво, поэтому память на загрузку
+    не зависит от его размера. Размер известен заранее, так что
+    запрос уходит с ``Content-Length``, без chunked-кодирования.
+
+    Args:
+        source: Путь к файлу или буфер с данными.
+        filename: Имя файла в форме.
+        content_type: MIME-тип части.
+        chunk_size: Размер куска в байтах.
+        progress: Колбэк прогресса (обычная функция или корутина),
+            вызывается после каждого куска.
+        attempt: Номер попытки для :class:`UploadProgress`.
+    """
+
+    def __init__(
+        self,
+        source: str | bytes,
+        *,
+        filename: str,
+        content_type: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        attempt: int = 1,
+    ) -> None:
+        super().__init__(source, content_type=content_type, filename=filename)
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._attempt = attempt
+        self._size = (
+            Path(source).stat().st_size
+            if isinstance(source, str)
+            else len(source)
+        )
+
+    async def _iter_chunks(self) -> AsyncIterator[bytes | memoryview]:
+        if isinstance(self._value, str):
+            async with aiofiles.open(self._value, "rb") as f:
+                while chunk := await f.read(self._chunk_size):
+                    yield chunk
+            return
+
+        view = memoryview(self._value)
+        for offset in range(0, len(view), self._chunk_size):
+            yield view[offset : offset + self._chunk_size]
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        started = monotonic()
+        sent = 0
+        async for chunk in self._iter_chunks():
+            await writer.write(chunk)
+            sent += len(chunk)
+            if self._progress is not None:
+                result = self._progress(
+                    UploadProgress(
+                        filename=self.filename or "",
+                        sent=sent,
+                        total=self._size or 0,
+                        elapsed=monotonic() - started,
+                        attempt=self._attempt,
+                    )
+                )
+                if inspect.isawaitable(result):
+                    await result
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        if isinstance(self._value, str):
+            return Path(self._value).read_bytes().decode(encoding, errors)
+        return bytes(self._value).decode(encoding, errors)
+
+
+class AsyncStreamPayload(StreamPayload):
+    """
+    Часть multipart-формы из асинхронного потока байт.
+
+    Источник читается в отдельной задаче через очередь из
+    ``buffer_chunks`` кусков: чтение источника (например, скачивание)
+    и отправка на сервер загрузки идут одновременно, а в памяти
+    держится не больше ``buffer_chunks`` кусков. Если размер
+    неизвестен, часть отправляется с chunked-кодированием.
+
+    Args:
+        source: Асинхронный итератор кусков.
+        filename: Имя файла в форме.
+        content_type: MIME-тип части.
+        size: Размер в байтах, если известен.
+        buffer_chunks: Сколько кусков держать в буфере.
+        progress: Колбэк прогресса.
+        attempt: Номер попытки для :class:`UploadProgress`.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[bytes],
+        *,
+        filename: str,
+        content_type: str,
+        size: int | None = None,
+        buffer_chunks: int = RELAY_BUFFER_CHUNKS,
+        progress: ProgressCallback | None = None,
+        attempt: int = 1,
+    ) -> None:
+        # размер берётся из аргумента, а не из источника
+        Payload.__init__(
+            self, source, content_type=content_type, filename=filename
+        )
+        self._buffer_chunks = buffer_chunks
+        self._progress = progress
+        self._attempt = attempt
+        self._size = size
+
+    async def _iter_chunks(self) -> AsyncIterator[bytes | memoryview]:
+        queue: asyncio.Queue[bytes | BaseException | None] = asyncio.Queue(
+            self._buffer_chunks
+        )
+
+        async def pump() -> None:
+            try:
+                async for chunk in self._value:
+                    await queue.put(chunk)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.ensure_future(pump())
+        try:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        raise TypeError("Потоковое вложение нельзя декодировать")
@@ -1,7 +1,7 @@
 import asyncio
-import json
 from typing import Any
 
+from ..client.codec import JsonCodec, get_json_codec
 from ..context.base import BaseContext
 from ..context.state_machine import State
 
@@ -116,6 +116,14 @@ class RedisContext(BaseContext):
     """
     Контекст хранения данных пользователя в Redis.
     Требует установленной библиотеки redis: pip install redis
+
+    Данные сериализуются ``json_codec`` (``JsonCodec`` или имя:
+    ``"json"``, ``"orjson"``, ``"msgspec"``, ``"auto"``), который
+    передаётся через параметры хранилища диспетчера::
+
+        Dispatcher(
+            storage=RedisContext, redis_client=redis, json_codec="orjson"
+        )
     """
 
     def __init__(
@@ -124,10 +132,12 @@ class RedisContext(BaseContext):
         user_id: int | None,
         redis_client: Any,  # redis.asyncio.Redis
         key_prefix: str = "maxapi",
+        json_codec: JsonCodec | str | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(chat_id, user_id, **kwargs)
         self.redis = redis_client
+        self.json_codec = get_json_codec(json_codec)
         self.prefix = f"{key_prefix}:{chat_id}:{user_id}"
         self.data_key = f"{self.prefix}:data"
         self.state_key = f"{self.prefix}:state"
@@ -135,11 +145,11 @@ class RedisContext(BaseContext):
     async def get_data(self) -> dict[str, Any]:
         data = await self.redis.get(self.data_key)
         await self._touch_redis_ttl()
-        return json.loads(data) if data else {}
+        return self.json_codec.loads(data) if data else {}
 
     async def set_data(self, data: dict[str, Any]) -> None:
         ttl_ms = _ttl_to_ms(self.ttl)
-        payload = json.dumps(data)
+        payload = self.json_codec.dumps(data)
         if ttl_ms is None:
             await self.redis.set(self.data_key, payload)
         else:
@@ -175,14 +185,12 @@ class RedisContext(BaseContext):
             lua_script,
             1,
             self.data_key,
-            json.dumps(kwargs),
+            self.json_codec.dumps(kwargs),
             str(ttl_ms) if ttl_ms is not None else "",
         )
         if ttl_ms is not None:
             await self.redis.pexpire(self.state_key, ttl_ms)
-        if isinstance(result, bytes):
-            result = result.decode("utf-8")
-        return json.loads(result) if result else {}
+        return self.json_codec.loads(result) if result else {}
 
     async def set_state(self, state: State | str | None = None) -> None:
         if state is None:
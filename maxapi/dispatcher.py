@@ -7,12 +7,14 @@ import warnings
 from asyncio.exceptions import TimeoutError as AsyncioTimeoutError
 from collections import OrderedDict
 from collections.abc import Hashable
+from contextlib import suppress
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 from warnings import warn
 
 from aiohttp import ClientConnectorError
 
+from .client.priority import RequestPriority, priority_scope
 from .context import BaseContext, ContextManager, MemoryContext
 from .enums.update import UpdateType
 from .exceptions.dispatcher import HandlerException, MiddlewareException
@@ -25,11 +27,12 @@ from .types.bot_mixin import BotMixin
 from .types.error_event import ErrorEvent as ErrorEventObject
 from .utils.commands import extract_commands
 from .utils.time import from_ms, to_ms
+from .utils.updates import CACHE_UPDATE_TYPES
 from .webhook import DEFAULT_HOST, DEFAULT_PATH, DEFAULT_PORT, BaseMaxWebhook
 from .webhook.aiohttp import AiohttpMaxWebhook
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
     from magic_filter import MagicFilter
 
@@ -37,10 +40,16 @@ if TYPE_CHECKING:
     from .filters.filter import BaseFilter
     from .filters.middleware import BaseMiddleware, HandlerCallable
     from .types.updates import UpdateUnion
+    from .utils.admission import AdmissionController
+    from .utils.worker_pool import KeyedWorkerPool
 
 CONNECTION_RETRY_DELAY = 30
 GET_UPDATES_RETRY_DELAY = 5
 CONTEXTS_MAX_SIZE = 10_000
+# Служебные типы: API их не присылает, фильтровать по ним нельзя
+_LOCAL_UPDATE_TYPES = frozenset(
+    {UpdateType.ON_STARTED, UpdateType.RAW_API_RESPONSE}
+)
 
 _FilterKwargSpec = tuple[str | None, frozenset[str] | None]
 
@@ -99,6 +108,8 @@ class Dispatcher(BotMixin):
         storage: Any = MemoryContext,
         *,
         use_create_task: bool = False,
+        worker_pool: KeyedWorkerPool | None = None,
+        admission: AdmissionController | None = None,
         **storage_kwargs: Any,
     ) -> None:
         """
@@ -108,6 +119,16 @@ class Dispatcher(BotMixin):
             router_id: Идентификатор роутера для логов.
             use_create_task: Флаг, отвечающий за параллелизацию
                 обработок событий.
+            worker_pool: Пул воркеров для параллельной обработки
+                событий. События одного чата и пользователя
+                (``event.get_ids()``) обрабатываются по порядку,
+                число одновременно принятых событий ограничено.
+                Имеет приоритет над ``use_create_task``.
+            admission: Контроллер нагрузки: ограничивает число
+                выполняющихся обработчиков, очередь и возраст событий
+                и сбрасывает события при перегрузке. Принятые события
+                выполняются в ``worker_pool``, если он задан. Имеет
+                приоритет над ``use_create_task``.
             storage: Класс контекста для хранения
                 данных (MemoryContext, RedisContext и т.д.).
             **storage_kwargs: Дополнительные аргументы для
@@ -135,6 +156,10 @@ class Dispatcher(BotMixin):
         self.on_started_func: Callable | None = None
         self.polling = False
         self.use_create_task = use_create_task
+        self.worker_pool = worker_pool
+        self.admission = admission
+        if admission is not None and admission.worker_pool is None:
+            admission.worker_pool = worker_pool
         self._cached_router_entries: (
             list[
                 tuple[
@@ -149,6 +174,7 @@ class Dispatcher(BotMixin):
         self._global_mw_chain: HandlerCallable | None = None
         self._background_tasks: set[asyncio.Task] = set()
         self._ready: bool = False
+        self._polling_types: Sequence[UpdateType] | None = None
 
         self.message_created = Event(
             update_type=UpdateType.MESSAGE_CREATED, router=self
@@ -391,6 +417,10 @@ class Dispatcher(BotMixin):
 
         self.bot = bot
         self.bot.dispatcher = self
+        if self.admission is not None and self.admission.metrics is None:
+            self.admission.metrics = bot.metrics
+
+        await bot.warm_up()
 
         if self.polling and bot.auto_check_subscriptions:
             await self._check_subscriptions(bot)
@@ -998,6 +1028,26 @@ class Dispatcher(BotMixin):
                 router=router,
             ) from e
 
+    def has_raw_response_handlers(self) -> bool:
+        """
+        Проверяет, зарегистрирован ли хотя бы один обработчик
+        ``raw_api_response``.
+
+        Если обработчиков нет, ответы API разбираются сразу в модели,
+        без промежуточного dict.
+        """
+        entries = (
+            self._cached_router_entries
+            if self._cached_router_entries is not None
+            else self._iter_unique_routers(self.routers)
+        )
+        return any(
+            self._find_matching_handlers(
+                router=router, event_type=UpdateType.RAW_API_RESPONSE
+            )
+            for router, *_ in entries
+        )
+
     async def handle_raw_response(
         self, event_type: UpdateType, raw_data: dict[str, Any]
     ) -> None:
@@ -1427,9 +1477,17 @@ class Dispatcher(BotMixin):
         Основной обработчик события. Применяет фильтры, middleware
         и вызывает нужный handler.
 
+        Запросы к API внутри обработки получают приоритет
+        ``RequestPriority.INTERACTIVE`` (см. ``priority_scheduler``
+        в ``DefaultConnectionProperties``).
+
         Args:
             event_object: Событие.
         """
+        with priority_scope(RequestPriority.INTERACTIVE):
+            await self._handle_event(event_object)
+
+    async def _handle_event(self, event_object: UpdateUnion) -> None:
         router_id = None
         process_info = "нет данных"
 
@@ -1525,10 +1583,16 @@ class Dispatcher(BotMixin):
                 e,
             )
 
-    async def _fetch_updates_once(self, bot: Bot) -> dict | None:
+    async def _fetch_updates_once(
+        self, bot: Bot, marker: int | None = None
+    ) -> dict | None:
         """
         Делает один запрос get_updates.
 
+        Args:
+            bot: Экземпляр бота.
+            marker: Маркер запроса; None — ``bot.marker_updates``.
+
         Returns:
             dict | None: словарь событий или None при recoverable-ошибке.
 
@@ -1536,7 +1600,10 @@ class Dispatcher(BotMixin):
             InvalidToken: при неверном токене бота.
         """
         try:
-            return await bot.get_updates(marker=bot.marker_updates)
+            return await bot.get_updates(
+                marker=bot.marker_updates if marker is None else marker,
+                types=self._polling_types,
+            )
         except AsyncioTimeoutError:
             return None
         except (MaxConnection, ClientConnectorError) as e:
@@ -1575,11 +1642,14 @@ class Dispatcher(BotMixin):
         *,
         skip_updates: bool,
     ) -> None:
-        """Обрабатывает полученные от API события."""
-        try:
-            bot = self._ensure_bot()
-            bot.marker_updates = events.get("marker")
+        """
+        Обрабатывает полученные от API события.
 
+        Маркер батча сохраняется в ``bot.marker_updates`` после
+        обработки (в том числе неудачной), но не при отмене.
+        """
+        bot = self._ensure_bot()
+        try:
             processed_events = await process_update_request(
                 events=events, bot=bot
             )
@@ -1593,7 +1663,13 @@ class Dispatcher(BotMixin):
                     )
                     continue
 
-                if self.use_create_task:
+                if self.admission is not None:
+                    await self.admission.submit(event, self.handle, wait=True)
+                elif self.worker_pool is not None:
+                    await self.worker_pool.submit(
+                        event.get_ids(), self.handle, event
+                    )
+                elif self.use_create_task:
                     task = asyncio.create_task(self.handle(event))
                     self._background_tasks.add(task)
                     task.add_done_callback(self._on_background_task_done)
@@ -1611,8 +1687,116 @@ class Dispatcher(BotMixin):
                 e,
             )
 
+        bot.marker_updates = events.get("marker")
+
+    async def _prefetch_updates(
+        self, bot: Bot, queue: asyncio.Queue[dict | None]
+    ) -> None:
+        """
+        Цикл получения обновлений для конвейерного polling.
+
+        Ведёт собственный маркер, не дожидаясь обработки батчей, и
+        кладёт их в ограниченную очередь: при заполненной очереди
+        следующий запрос не отправляется, пока обработчик не заберёт
+        батч. По завершении кладёт в очередь None, если есть место.
+        """
+        marker = bot.marker_updates
+        try:
+            while self.polling:
+                events = await self._fetch_updates_once(bot, marker)
+                if events is None:
+                    continue
+                marker = events.get("marker", marker)
+                await queue.put(events)
+        finally:
+            with suppress(asyncio.QueueFull):
+                queue.put_nowait(None)
+
+    async def _poll_pipelined(
+        self,
+        bot: Bot,
+        current_timestamp: int,
+        *,
+        skip_updates: bool,
+        prefetch: int,
+    ) -> None:
+        """
+        Конвейерный polling: следующий батч запрашивается, пока
+        обрабатывается текущий.
+
+        Батчи, полученные, но не обработанные к остановке, отбрасываются:
+        ``bot.marker_updates`` на них не продвинут, и при следующем
+        запуске они будут получены снова.
+        """
+        queue: asyncio.Queue[dict | None] = asyncio.Queue(prefetch)
+        fetcher = asyncio.create_task(self._prefetch_updates(bot, queue))
+        try:
+            while self.polling:
+                events = await queue.get()
+                if events is None or not self.polling:
+                    break
+                await self._dispatch_fetched_events(
+                    events, current_timestamp, skip_updates=skip_updates
+                )
+        finally:
+            fetcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await fetcher
+
+    def resolve_update_types(
+        self, bot: Bot | None = None
+    ) -> list[UpdateType] | None:
+        """
+        Типы событий, на которые есть обработчики, — фильтр ``types``
+        для get_updates.
+
+        Учитываются обработчики всех роутеров и ``update_types``
+        outer-мидлварей диспетчера. Если у ``bot`` включён
+        ``entity_cache``, добавляются события, по которым кеш
+        обновляется (:data:`~maxapi.utils.updates.CACHE_UPDATE_TYPES`).
+
+        Args:
+            bot: Бот, для которого запрашиваются события.
+
+        Returns:
+            list[UpdateType] | None: Отсортированный список или None —
+                фильтр не нужен: обработчиков нет, есть обработчики
+                ``raw_api_response`` (им нужен полный ответ API) или
+                outer-мидлварь с ``update_types = None``.
+        """
+        types: set[UpdateType] = set()
+        for middleware in self.outer_middlewares:
+            if middleware.update_types is None:
+                return None
+            types.update(middleware.update_types)
+
+        entries = (
+            self._cached_router_entries
+            if self._cached_router_entries is not None
+            else self._iter_unique_routers([self, *self.routers])
+        )
+        for router, *_ in entries:
+            if router.handlers_by_type is not None:
+                types.update(router.handlers_by_type)
+            else:
+                types.update(h.update_type for h in router.event_handlers)
+
+        if UpdateType.RAW_API_RESPONSE in types:
+            return None
+        types -= _LOCAL_UPDATE_TYPES
+        if not types:
+            return None
+        if bot is not None and bot.entity_cache is not None:
+            types |= CACHE_UPDATE_TYPES
+        return sorted(types)
+
     async def start_polling(
-        self, bot: Bot, *, skip_updates: bool = False
+        self,
+        bot: Bot,
+        *,
+        skip_updates: bool = False,
+        prefetch: int = 0,
+        types: Sequence[UpdateType] | Literal["auto"] | None = "auto",
     ) -> None:
         """
         Запускает цикл получения обновлений (long polling).
@@ -1620,13 +1804,43 @@ class Dispatcher(BotMixin):
         Args:
             bot: Экземпляр бота.
             skip_updates: Флаг, отвечающий за обработку старых событий.
+            prefetch: Сколько полученных батчей может ждать обработки.
+                0 — последовательный режим: следующий запрос отправляется
+                после обработки текущего батча. Больше 0 — конвейерный
+                режим: запрос следующего батча идёт параллельно с
+                обработкой текущего, ``bot.marker_updates`` продвигается
+                только после обработки.
+            types: Типы запрашиваемых событий. ``"auto"`` — только те,
+                на которые есть обработчики, и нужные кешу сущностей
+                (:meth:`resolve_update_types`); None — все типы.
+
+        Raises:
+            ValueError: Если ``prefetch`` отрицательный.
         """
+        if prefetch < 0:
+            raise ValueError("prefetch не может быть отрицательным")
+
         self.polling = True
 
         await self.__ready(bot)
 
+        if types == "auto":
+            types = self.resolve_update_types(bot)
+        self._polling_types = types
+        if types is not None:
+            logger_dp.info("Запрашиваются события типов: %s", ", ".join(types))
+
         current_timestamp = to_ms(datetime.now())
 
+        if prefetch:
+            await self._poll_pipelined(
+                bot,
+                current_timestamp,
+                skip_updates=skip_updates,
+                prefetch=prefetch,
+            )
+            return
+
         while self.polling:
             events = await self._fetch_updates_once(bot)
             if events is None:
@@ -1639,8 +1853,9 @@ class Dispatcher(BotMixin):
         """
         Останавливает цикл получения обновлений (long polling).
 
-        Дожидается завершения всех фоновых задач (use_create_task=True),
-        запущенных до момента остановки.
+        Дожидается завершения всех фоновых задач (use_create_task=True)
+        и событий, принятых пулом воркеров или контроллером нагрузки,
+        до момента остановки.
         """
         if self.polling:
             self.polling = False
@@ -1657,6 +1872,12 @@ class Dispatcher(BotMixin):
             )
             logger_dp.info("Все фоновые задачи завершены")
 
+        if self.admission is not None:
+            await self.admission.join()
+
+        if self.worker_pool is not None:
+            await self.worker_pool.close()
+
     async def startup(self, bot: Bot) -> None:
         """
         Инициализирует диспетчер: сохраняет бота, подготавливает
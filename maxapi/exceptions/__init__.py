@@ -1,7 +1,13 @@
 from .base import MaxError
-from .dispatcher import HandlerException, MiddlewareException
+from .dispatcher import (
+    DispatcherOverloaded,
+    HandlerException,
+    MiddlewareException,
+)
 from .download_file import DownloadFileError, NotAvailableForDownload
 from .max import (
+    CircuitBreakerOpen,
+    DeadlineExceeded,
     InvalidToken,
     MaxApiError,
     MaxConnection,
@@ -10,6 +16,9 @@ from .max import (
 )
 
 __all__ = [
+    "CircuitBreakerOpen",
+    "DeadlineExceeded",
+    "DispatcherOverloaded",
     "DownloadFileError",
     "HandlerException",
     "InvalidToken",
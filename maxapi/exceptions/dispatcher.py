@@ -53,3 +53,26 @@ class MiddlewareException(MaxError):
         return "MiddlewareException(" + ", ".join(parts) + ")"
 
     __repr__ = __str__
+
+
+@dataclass(slots=True)
+class DispatcherOverloaded(MaxError):
+    """
+    Событие не принято: диспетчер перегружен.
+
+    Вебхук отвечает на такое событие 503 с заголовком ``Retry-After``,
+    и MAX повторяет доставку позже.
+
+    Attributes:
+        update_type: Тип отклонённого события.
+        retry_after: Через сколько секунд повторить доставку.
+    """
+
+    update_type: str
+    retry_after: float
+
+    def __str__(self) -> str:
+        return (
+            f"Диспетчер перегружен, событие {self.update_type} "
+            f"отклонено, повтор через {self.retry_after:.0f}с"
+        )
@@ -18,6 +18,10 @@ class MaxUploadFileFailed(MaxError): ...
 class MaxIconParamsException(MaxError): ...
 
 
+class DeadlineExceeded(MaxError, TimeoutError):
+    """Истёк дедлайн запроса (``deadline=`` или ``deadline_scope``)."""
+
+
 @dataclass(slots=True)
 class MaxApiError(MaxError):
     """Ошибка, пришедшая от сервера API Макса (не-2xx ответ)."""
@@ -27,3 +31,24 @@ class MaxApiError(MaxError):
 
     def __str__(self) -> str:
         return f"Ошибка от API: {self.code=} {self.raw=}"
+
+
+@dataclass(slots=True)
+class CircuitBreakerOpen(MaxConnection):
+    """
+    Запрос не выполнен: circuit breaker для эндпоинта открыт.
+
+    Attributes:
+        key: Ключ выключателя (хост и эндпоинт).
+        retry_after: Через сколько секунд выключатель пропустит
+            пробный запрос.
+    """
+
+    key: str
+    retry_after: float
+
+    def __str__(self) -> str:
+        return (
+            f"Circuit breaker {self.key} открыт, "
+            f"повтор через {self.retry_after:.1f}с"
+        )
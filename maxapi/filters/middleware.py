@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
-from typing import TYPE_CHECKING, Any, TypeAlias
+from collections.abc import Awaitable, Callable, Collection
+from typing import TYPE_CHECKING, Any, ClassVar, TypeAlias
 
 if TYPE_CHECKING:
+    from ..enums.update import UpdateType
     from ..types.updates import UpdateUnion
 
 #: Звено middleware-цепочки или финальный обработчик события.
@@ -18,8 +19,18 @@ class BaseMiddleware:
     Базовый класс для мидлварей.
 
     Используется для обработки события до и после вызова хендлера.
+
+    Attributes:
+        update_types: Типы событий, которые нужны мидлвари помимо
+            тех, на которые есть хендлеры. Учитывается для outer-мидлварей
+            диспетчера при выборе ``types`` для long polling
+            (см. :meth:`Dispatcher.resolve_update_types`). None — все
+            типы: такая мидлварь отключает фильтр. Мидлварям, которым
+            достаточно обрабатываемых хендлерами событий, задайте ``()``.
     """
 
+    update_types: ClassVar[Collection[UpdateType] | None] = None
+
     async def __call__(
         self,
         handler: HandlerCallable,
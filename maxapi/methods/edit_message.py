@@ -5,16 +5,20 @@ import time
 import warnings
 from typing import TYPE_CHECKING, Any, cast
 
+from ..client.deadline import deadline_scope, time_left
 from ..connection.base import BaseConnection
 from ..enums.api_path import ApiPath
 from ..enums.http_method import HTTPMethod
 from ..enums.parse_mode import ParseMode, TextFormat
-from ..exceptions.max import MaxApiError
+from ..exceptions.max import DeadlineExceeded, MaxApiError
 from ..loggers import logger_bot
 from ..types.attachments.attachment import Attachment
 from ..types.attachments.upload import AttachmentUpload
 from ..types.input_media import InputMedia, InputMediaBuffer
-from ..utils.message import process_input_media
+from ..utils.message import (
+    forget_cached_uploads,
+    process_input_media_batch,
+)
 from .types.edited_message import EditedMessage
 
 if TYPE_CHECKING:
@@ -43,6 +47,8 @@ class EditMessage(BaseConnection):
             (например, Markdown, HTML).
         parse_mode: Устаревший формат разметки текста
             (например, Markdown, HTML).
+        deadline: Сколько секунд отведено на редактирование вместе
+            с загрузкой вложений, ожиданием их готовности и retry.
     """
 
     def __init__(
@@ -61,6 +67,7 @@ class EditMessage(BaseConnection):
         *,
         notify: bool | None = None,
         sleep_after_input_media: bool | None = True,
+        deadline: float | None = None,
     ):
         if text is not None and len(text) >= 4000:
             raise ValueError("text должен быть меньше 4000 символов")
@@ -92,6 +99,35 @@ class EditMessage(BaseConnection):
             format if format is not None else parse_mode
         )
         self.sleep_after_input_media = sleep_after_input_media
+        self.deadline = deadline
+
+    async def _build_attachments(
+        self,
+        bot: Bot,
+        input_medias: list[InputMedia | InputMediaBuffer],
+        cache_hits: list[InputMedia | InputMediaBuffer] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Загрузить вложения и собрать их JSON в исходном порядке."""
+
+        uploads = iter(
+            await process_input_media_batch(
+                base_connection=self,
+                bot=bot,
+                attachments=input_medias,
+                cache_hits=cache_hits,
+            )
+        )
+        attachments: list[dict[str, Any]] = []
+        for att in self.attachments or ():
+            if isinstance(att, (InputMedia, InputMediaBuffer)):
+                attachments.append(next(uploads).model_dump())
+            elif isinstance(att, Attachment) and isinstance(
+                att.payload, AttachmentUpload
+            ):
+                attachments.append(att.payload.model_dump())
+            else:
+                attachments.append(att.model_dump())
+        return attachments
 
     async def fetch(self) -> EditedMessage | None:
         """
@@ -104,6 +140,10 @@ class EditMessage(BaseConnection):
             EditedMessage: Обновлённое сообщение.
         """
 
+        with deadline_scope(self.deadline):
+            return await self._fetch()
+
+    async def _fetch(self) -> EditedMessage | None:
         bot = self._ensure_bot()
 
         params = bot.params.copy()
@@ -115,23 +155,16 @@ class EditMessage(BaseConnection):
         if self.text is not None:
             json["text"] = self.text
 
-        has_input_media = False
-
-        if self.attachments:
-            for att in self.attachments:
-                if isinstance(att, (InputMedia, InputMediaBuffer)):
-                    has_input_media = True
-
-                    input_media = await process_input_media(
-                        base_connection=self, bot=bot, att=att
-                    )
-                    json["attachments"].append(input_media.model_dump())
-                elif isinstance(att, Attachment) and isinstance(
-                    att.payload, AttachmentUpload
-                ):
-                    json["attachments"].append(att.payload.model_dump())
-                else:
-                    json["attachments"].append(att.model_dump())
+        input_medias = [
+            att
+            for att in self.attachments or ()
+            if isinstance(att, (InputMedia, InputMediaBuffer))
+        ]
+        has_input_media = bool(input_medias)
+        cache_hits: list[InputMedia | InputMediaBuffer] = []
+        json["attachments"] = await self._build_attachments(
+            bot, input_medias, cache_hits
+        )
 
         if self.link is not None:
             json["link"] = self.link.model_dump()
@@ -140,14 +173,22 @@ class EditMessage(BaseConnection):
         if self.format is not None:
             json["format"] = self.format
 
+        readiness = bot.readiness_policy
+        initial_delay = 0.0
         if has_input_media and self.sleep_after_input_media:
-            await asyncio.sleep(bot.after_input_media_delay)
+            initial_delay = readiness.initial_delay(input_medias)
+            remaining = time_left()
+            if remaining is not None and initial_delay >= remaining:
+                # пауза не помещается в дедлайн: пробуем сразу
+                initial_delay = 0.0
+            await asyncio.sleep(initial_delay)
 
         attempts = bot.after_upload_attempts
-        retry_delay = bot.after_upload_retry_delay
         give_up_timeout = bot.after_upload_give_up_timeout
 
         response = None
+        reuploaded = False
+        waited = initial_delay
 
         start_time = time.monotonic()
         for attempt in range(attempts):
@@ -164,6 +205,7 @@ class EditMessage(BaseConnection):
                     isinstance(e.raw, dict)
                     and e.raw.get("code") == "attachment.not.ready"
                 ):
+                    retry_delay = readiness.retry_delay(attempt, input_medias)
                     elapsed = time.monotonic() - start_time
                     if (
                         give_up_timeout is not None
@@ -175,16 +217,50 @@ class EditMessage(BaseConnection):
                             f" ({give_up_timeout}с),"
                             f" прошло {elapsed:.1f}с"
                         ) from e
+                    remaining = time_left()
+                    if remaining is not None and retry_delay >= remaining:
+                        raise DeadlineExceeded(
+                            "Истёк дедлайн ожидания готовности медиа"
+                        ) from e
+                    metrics = bot.default_connection.metrics
+                    if metrics is not None:
+                        metrics.record_retry(
+                            HTTPMethod.PUT,
+                            ApiPath.MESSAGES,
+                            "attachment.not.ready",
+                        )
                     logger_bot.info(
                         f"Ошибка при отправке загруженного медиа,"
                         f" попытка {attempt + 1},"
                         f" жду {retry_delay} секунды"
                     )
                     await asyncio.sleep(retry_delay)
+                    waited += retry_delay
+                    continue
+                elif (
+                    not reuploaded
+                    and e.code in (400, 404)
+                    and cache_hits
+                    and await forget_cached_uploads(bot, cache_hits)
+                ):
+                    logger_bot.info(
+                        "API отклонил токены из кеша загрузок,"
+                        " загружаю вложения заново"
+                    )
+                    reuploaded = True
+                    json["attachments"] = await self._build_attachments(
+                        bot, input_medias
+                    )
                     continue
                 else:
                     raise e
 
+            if has_input_media:
+                readiness.record_ready(
+                    input_medias,
+                    elapsed=waited,
+                    attempts=attempt + 1,
+                )
             break
 
         if response is None:
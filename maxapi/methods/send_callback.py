@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, cast
 
+from ..client.deadline import deadline_scope
 from ..connection.base import BaseConnection
 from ..enums.api_path import ApiPath
 from ..enums.http_method import HTTPMethod
@@ -9,7 +10,7 @@ from ..methods.types.sended_callback import SendedCallback
 from ..types.attachments.attachment import Attachment
 from ..types.attachments.upload import AttachmentUpload
 from ..types.input_media import InputMedia, InputMediaBuffer
-from ..utils.message import process_input_media
+from ..utils.message import process_input_media_batch
 
 if TYPE_CHECKING:
     from ..bot import Bot
@@ -28,6 +29,8 @@ class SendCallback(BaseConnection):
         callback_id: Идентификатор callback.
         message: Сообщение для отправки. Может быть None.
         notification: Текст уведомления. Может быть None.
+        deadline: Сколько секунд отведено на ответ вместе с загрузкой
+            вложений и retry.
     """
 
     def __init__(
@@ -36,12 +39,14 @@ class SendCallback(BaseConnection):
         callback_id: str,
         message: MessageForCallback | None = None,
         notification: str | None = None,
+        deadline: float | None = None,
     ):
         super().__init__()
         self.bot = bot
         self.callback_id = callback_id
         self.message = message
         self.notification = notification
+        self.deadline = deadline
 
     async def fetch(self) -> SendedCallback:
         """
@@ -53,6 +58,10 @@ class SendCallback(BaseConnection):
             SendedCallback: Объект с результатом отправки callback.
         """
 
+        with deadline_scope(self.deadline):
+            return await self._fetch()
+
+    async def _fetch(self) -> SendedCallback:
         bot = self._ensure_bot()
 
         params = bot.params.copy()
@@ -68,15 +77,21 @@ class SendCallback(BaseConnection):
             )
             if self.message.attachments is not None:
                 message_json["attachments"] = []
+                uploads = iter(
+                    await process_input_media_batch(
+                        base_connection=self,
+                        bot=bot,
+                        attachments=[
+                            att
+                            for att in self.message.attachments
+                            if isinstance(att, InputMedia | InputMediaBuffer)
+                        ],
+                    )
+                )
                 for att in self.message.attachments:
                     if isinstance(att, InputMedia | InputMediaBuffer):
-                        input_media = await process_input_media(
-                            base_connection=self,
-                            bot=bot,
-                            att=att,
-                        )
                         message_json["attachments"].append(
-                            input_media.model_dump()
+                            next(uploads).model_dump()
                         )
                     elif isinstance(att, Attachment) and isinstance(
                         att.payload, AttachmentUpload
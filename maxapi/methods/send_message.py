@@ -3,11 +3,12 @@ import time
 import warnings
 from typing import TYPE_CHECKING, Any, cast
 
+from ..client.deadline import deadline_scope, time_left
 from ..connection.base import BaseConnection
 from ..enums.api_path import ApiPath
 from ..enums.http_method import HTTPMethod
 from ..enums.parse_mode import ParseMode, TextFormat
-from ..exceptions.max import MaxApiError
+from ..exceptions.max import DeadlineExceeded, MaxApiError
 from ..loggers import logger_bot
 from ..types.attachments import Attachments
 from ..types.attachments.attachment import Attachment
@@ -15,7 +16,10 @@ from ..types.attachments.buttons.attachment_button import AttachmentButton
 from ..types.attachments.upload import AttachmentUpload
 from ..types.input_media import InputMedia, InputMediaBuffer
 from ..types.message import NewMessageLink
-from ..utils.message import process_input_media
+from ..utils.message import (
+    forget_cached_uploads,
+    process_input_media_batch,
+)
 from .types.sended_message import SendedMessage
 
 if TYPE_CHECKING:
@@ -47,6 +51,8 @@ class SendMessage(BaseConnection):
         parse_mode: Режим форматирования текста
             (например, Markdown, HTML).
         disable_link_preview: Флаг генерации превью.
+        deadline: Сколько секунд отведено на отправку вместе
+            с загрузкой вложений, ожиданием их готовности и retry.
     """
 
     def __init__(
@@ -67,6 +73,7 @@ class SendMessage(BaseConnection):
         notify: bool | None = None,
         disable_link_preview: bool | None = None,
         sleep_after_input_media: bool | None = True,
+        deadline: float | None = None,
     ):
         if text is not None and not (len(text) < 4000):
             raise ValueError("text должен быть меньше 4000 символов")
@@ -100,6 +107,86 @@ class SendMessage(BaseConnection):
         )
         self.disable_link_preview = disable_link_preview
         self.sleep_after_input_media = sleep_after_input_media
+        self.deadline = deadline
+
+    async def _build_attachments(
+        self,
+        bot: "Bot",
+        input_medias: list[InputMedia | InputMediaBuffer],
+        cache_hits: list[InputMedia | InputMediaBuffer] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Загрузить вложения и собрать их JSON в исходном порядке."""
+
+        uploads = iter(
+            await process_input_media_batch(
+                base_connection=self,
+                bot=bot,
+                attachments=input_medias,
+                cache_hits=cache_hits,
+            )
+        )
+        attachments: list[dict[str, Any]] = []
+        for att in self.attachments or ():
+            if isinstance(att, AttachmentButton) and not any(
+                att.payload.buttons
+            ):
+                continue
+
+            if isinstance(att, (InputMedia, InputMediaBuffer)):
+                attachments.append(next(uploads).model_dump())
+            elif isinstance(att, Attachment) and isinstance(
+                att.payload, AttachmentUpload
+            ):
+                attachments.append(att.payload.model_dump())
+            else:
+                attachments.append(att.model_dump())
+        return attachments
+
+    def input_medias(self) -> list[InputMedia | InputMediaBuffer]:
+        """Вложения, которые нужно загрузить перед отправкой."""
+
+        return [
+            att
+            for att in self.attachments or ()
+            if isinstance(att, (InputMedia, InputMediaBuffer))
+        ]
+
+    async def build_json(
+        self,
+        bot: "Bot",
+        input_medias: list[InputMedia | InputMediaBuffer],
+        cache_hits: list[InputMedia | InputMediaBuffer] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Собрать тело запроса ``POST /messages``, загрузив вложения.
+
+        Args:
+            bot: Экземпляр бота.
+            input_medias: Результат :meth:`input_medias`.
+            cache_hits: Список, в который добавляются вложения,
+                токены которых взяты из кеша загрузок.
+
+        Returns:
+            dict[str, Any]: Тело запроса без получателя.
+        """
+
+        json: dict[str, Any] = {}
+        if self.text is not None:
+            json["text"] = self.text
+
+        json["attachments"] = await self._build_attachments(
+            bot, input_medias, cache_hits
+        )
+
+        if self.link is not None:
+            json["link"] = self.link.model_dump()
+
+        if self.notify is not None:
+            json["notify"] = self.notify
+
+        if self.format is not None:
+            json["format"] = self.format
+        return json
 
     async def fetch(self) -> SendedMessage | None:
         """
@@ -112,12 +199,14 @@ class SendMessage(BaseConnection):
             SendedMessage или Error
         """
 
+        with deadline_scope(self.deadline):
+            return await self._fetch()
+
+    async def _fetch(self) -> SendedMessage | None:
         bot = self._ensure_bot()
 
         params = bot.params.copy()
 
-        json: dict[str, Any] = {"attachments": []}
-
         if self.chat_id:
             params["chat_id"] = self.chat_id
         elif self.user_id:
@@ -128,49 +217,29 @@ class SendMessage(BaseConnection):
                 self.disable_link_preview
             ).lower()
 
-        if self.text is not None:
-            json["text"] = self.text
-
-        has_input_media = False
-
-        if self.attachments:
-            for att in self.attachments:
-                if isinstance(att, AttachmentButton) and not any(
-                    att.payload.buttons
-                ):
-                    continue
-
-                if isinstance(att, (InputMedia, InputMediaBuffer)):
-                    has_input_media = True
-
-                    input_media = await process_input_media(
-                        base_connection=self, bot=bot, att=att
-                    )
-                    json["attachments"].append(input_media.model_dump())
-                elif isinstance(att, Attachment) and isinstance(
-                    att.payload, AttachmentUpload
-                ):
-                    json["attachments"].append(att.payload.model_dump())
-                else:
-                    json["attachments"].append(att.model_dump())
-
-        if self.link is not None:
-            json["link"] = self.link.model_dump()
-
-        if self.notify is not None:
-            json["notify"] = self.notify
-
-        if self.format is not None:
-            json["format"] = self.format
+        input_medias = self.input_medias()
+        has_input_media = bool(input_medias)
+        # повторная загрузка имеет смысл, только если API отклонил
+        # токены, взятые из кеша, а не загруженные только что
+        cache_hits: list[InputMedia | InputMediaBuffer] = []
+        json = await self.build_json(bot, input_medias, cache_hits)
 
+        readiness = bot.readiness_policy
+        initial_delay = 0.0
         if has_input_media and self.sleep_after_input_media:
-            await asyncio.sleep(bot.after_input_media_delay)
+            initial_delay = readiness.initial_delay(input_medias)
+            remaining = time_left()
+            if remaining is not None and initial_delay >= remaining:
+                # пауза не помещается в дедлайн: пробуем сразу
+                initial_delay = 0.0
+            await asyncio.sleep(initial_delay)
 
         attempts = bot.after_upload_attempts
-        retry_delay = bot.after_upload_retry_delay
         give_up_timeout = bot.after_upload_give_up_timeout
 
         response = None
+        reuploaded = False
+        waited = initial_delay
         start_time = time.monotonic()
         for attempt in range(attempts):
             try:
@@ -186,6 +255,7 @@ class SendMessage(BaseConnection):
                     isinstance(e.raw, dict)
                     and e.raw.get("code") == "attachment.not.ready"
                 ):
+                    retry_delay = readiness.retry_delay(attempt, input_medias)
                     elapsed = time.monotonic() - start_time
                     if (
                         give_up_timeout is not None
@@ -197,16 +267,50 @@ class SendMessage(BaseConnection):
                             f" ({give_up_timeout}с),"
                             f" прошло {elapsed:.1f}с"
                         ) from e
+                    remaining = time_left()
+                    if remaining is not None and retry_delay >= remaining:
+                        raise DeadlineExceeded(
+                            "Истёк дедлайн ожидания готовности медиа"
+                        ) from e
+                    metrics = bot.default_connection.metrics
+                    if metrics is not None:
+                        metrics.record_retry(
+                            HTTPMethod.POST,
+                            ApiPath.MESSAGES,
+                            "attachment.not.ready",
+                        )
                     logger_bot.info(
                         f"Ошибка при отправке загруженного медиа,"
                         f" попытка {attempt + 1},"
                         f" жду {retry_delay} секунды"
                     )
                     await asyncio.sleep(retry_delay)
+                    waited += retry_delay
+                    continue
+                elif (
+                    not reuploaded
+                    and e.code in (400, 404)
+                    and cache_hits
+                    and await forget_cached_uploads(bot, cache_hits)
+                ):
+                    logger_bot.info(
+                        "API отклонил токены из кеша загрузок,"
+                        " загружаю вложения заново"
+                    )
+                    reuploaded = True
+                    json["attachments"] = await self._build_attachments(
+                        bot, input_medias
+                    )
                     continue
                 else:
                     raise e
 
+            if has_input_media:
+                readiness.record_ready(
+                    input_medias,
+                    elapsed=waited,
+                    attempts=attempt + 1,
+                )
             break
 
         if response is None:
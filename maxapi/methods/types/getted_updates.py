@@ -6,7 +6,7 @@ from ...types.updates import (
     UpdateUnion,
     UpdateUnionAdapter,
 )
-from ...utils.updates import enrich_event
+from ...utils.updates import enrich_event, enrich_events
 
 if TYPE_CHECKING:
     from ...bot import Bot
@@ -14,16 +14,29 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-async def get_update_model(event: dict, bot: "Bot") -> UpdateUnion | None:
-    """Конвертировать словарь с событием в модель обновления."""
+def parse_update(event: dict) -> UpdateUnion | None:
+    """
+    Провалидировать событие без дополнения данными из API.
+
+    Returns:
+        UpdateUnion | None: Модель события или None для неизвестного
+            типа события.
+    """
     try:
-        event_object = UpdateUnionAdapter.validate_python(event)
+        return UpdateUnionAdapter.validate_python(event)
     except ValueError:
         # Пришло новое событие, которое данная библиотека пока
         # не умеет обрабатывать. Возвращаем None, чтобы обработать это
         # в вызывающем коде и не ломать процесс получения обновлений
         return None
 
+
+async def get_update_model(event: dict, bot: "Bot") -> UpdateUnion | None:
+    """Конвертировать словарь с событием в модель обновления."""
+    event_object = parse_update(event)
+    if event_object is None:
+        return None
+
     return await enrich_event(event_object=event_object, bot=bot)
 
 
@@ -31,21 +44,28 @@ async def process_update_request(
     events: dict[str, Any],
     bot: "Bot",
 ) -> list[UpdateUnion]:
-    """Конвертировать словарь с обновлениями в список моделей."""
+    """
+    Конвертировать словарь с обновлениями в список моделей.
+
+    Чаты и участники для всего батча запрашиваются параллельно
+    (см. :func:`~maxapi.utils.updates.enrich_events`).
+    """
     events_models = []
 
     for event in events["updates"]:
-        event_model = await get_update_model(event, bot)
-        if event_model is None:
-            update_type = event["update_type"]
+        try:
+            event_model = UpdateUnionAdapter.validate_python(event)
+        except ValueError:
             logger.warning(
-                UNKNOWN_UPDATE_DISCLAIMER.format(update_type=update_type)
+                UNKNOWN_UPDATE_DISCLAIMER.format(
+                    update_type=event["update_type"]
+                )
             )
             continue
 
         events_models.append(event_model)
 
-    return events_models
+    return await enrich_events(events_models, bot)
 
 
 async def process_update_webhook(
@@ -32,6 +32,7 @@ __all__ = [
     "Icon",
     "InputMedia",
     "InputMediaBuffer",
+    "InputMediaStream",
     "LazyRef",
     "LinkButton",
     "LinkedMessage",
@@ -125,7 +126,7 @@ from ..types.updates.message_removed import MessageRemoved
 from ..types.updates.user_added import UserAdded
 from ..types.updates.user_removed import UserRemoved
 from ..types.users import ChatAdmin, User
-from .input_media import InputMedia, InputMediaBuffer
+from .input_media import InputMedia, InputMediaBuffer, InputMediaStream
 
 if TYPE_CHECKING:
     from ..methods.types.sended_message import SendedMessage
@@ -22,6 +22,7 @@ __all__ = [
     "InlineButtonUnion",
     "InputMedia",
     "InputMediaBuffer",
+    "InputMediaStream",
     "LinkButton",
     "Location",
     "MessageButton",
@@ -41,7 +42,7 @@ __all__ = [
     "VideoUrl",
 ]
 
-from ..input_media import InputMedia, InputMediaBuffer
+from ..input_media import InputMedia, InputMediaBuffer, InputMediaStream
 from .attachment import (
     Attachment,
     ButtonsPayload,
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
 
+from ..utils.entity_cache import get_chat_cached
 from .bot_mixin import BotMixin
 
 if TYPE_CHECKING:
@@ -91,7 +92,7 @@ class ChatRef(LazyRef["Chat"]):
         self.chat_id = chat_id
         super().__init__(
             bot=bot,
-            fetcher=lambda: bot.get_chat_by_id(chat_id),
+            fetcher=lambda: get_chat_cached(bot, chat_id),
             setter=setter,
             description=f"chat_id={chat_id}",
         )
@@ -1,12 +1,94 @@
 from __future__ import annotations
 
+import asyncio
+import mimetypes
+import os
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import puremagic
 
 from ..enums.upload_type import UploadType
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, Callable
+
+    from ..connection.upload import ProgressCallback
+
+    StreamSource = AsyncIterable[bytes] | Callable[[], AsyncIterable[bytes]]
+
 READ_FILE_CHUNK_SIZE = 4096
+MIME_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=MIME_CACHE_SIZE)
+def _sniff_sample(sample: bytes) -> str | None:
+    try:
+        matches = puremagic.magic_string(sample)
+    except Exception:
+        return None
+    return matches[0].mime_type if matches else None
+
+
+@lru_cache(maxsize=MIME_CACHE_SIZE)
+def _sniff_file(path: str, size: int, mtime_ns: int) -> str | None:
+    # size и mtime_ns — часть ключа кеша: изменённый файл
+    # определяется заново
+    with Path(path).open("rb") as f:
+        return sniff_mime(f.read(READ_FILE_CHUNK_SIZE))
+
+
+def sniff_mime(data: bytes) -> str | None:
+    """
+    Определяет MIME-тип по сигнатуре в начале данных.
+
+    Учитываются первые ``READ_FILE_CHUNK_SIZE`` байт; результат
+    кешируется по их содержимому.
+
+    Args:
+        data: Содержимое файла.
+    Returns:
+        str | None: MIME-тип или None, если определить не удалось.
+    """
+    return _sniff_sample(bytes(data[:READ_FILE_CHUNK_SIZE]))
+
+
+def sniff_file_mime(path: str | os.PathLike[str]) -> str | None:
+    """
+    Определяет MIME-тип файла по сигнатуре.
+
+    Результат кешируется по пути, размеру и времени изменения файла.
+    Функция блокирующая: из асинхронного кода вызывайте её через
+    ``asyncio.to_thread``.
+
+    Args:
+        path: Путь к файлу.
+    Returns:
+        str | None: MIME-тип или None, если определить не удалось.
+    """
+    stat = Path(path).stat()
+    return _sniff_file(os.fspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=MIME_CACHE_SIZE)
+def guess_mime(filename: str) -> str | None:
+    """
+    MIME-тип по расширению имени файла (с кешем).
+
+    Args:
+        filename: Имя или путь файла.
+    Returns:
+        str | None: MIME-тип или None.
+    """
+    return mimetypes.guess_type(filename)[0]
+
+
+def clear_mime_cache() -> None:
+    """Очищает кеши определения MIME-типов."""
+    _sniff_sample.cache_clear()
+    _sniff_file.cache_clear()
+    guess_mime.cache_clear()
 
 
 def detect_file_type(data: bytes) -> UploadType:
@@ -20,15 +102,19 @@ def detect_file_type(data: bytes) -> UploadType:
                     определить или при определении произошла ошибка,
                     возвращается ``UploadType.FILE``.
     """
-    try:
-        matches = puremagic.magic_string(data)
-        if matches:
-            mime_type = matches[0].mime_type
-        else:
-            mime_type = None
-    except Exception:
-        mime_type = None
+    return upload_type_for_mime(sniff_mime(data))
+
+
+def upload_type_for_mime(mime_type: str | None) -> UploadType:
+    """
+    Определяет тип загрузки по MIME-типу.
 
+    Args:
+        mime_type: MIME-тип или None.
+    Returns:
+        UploadType: Тип загрузки; для неизвестных типов —
+                    ``UploadType.FILE``.
+    """
     if mime_type is None:
         return UploadType.FILE
     if mime_type.startswith("video/"):
@@ -54,6 +140,16 @@ def validate_uploading_type(type: UploadType | str) -> UploadType:
     return type
 
 
+def _hinted_type(
+    type: UploadType | str | None, content_type: str | None
+) -> UploadType | None:
+    if type is not None:
+        return validate_uploading_type(type)
+    if content_type is not None:
+        return upload_type_for_mime(content_type)
+    return None
+
+
 class InputMedia:
     """
     Класс для представления медиафайла.
@@ -62,31 +158,64 @@ class InputMedia:
         path: Путь к файлу.
         type: Тип файла, определенный на основе содержимого
             (MIME-типа) или указанный вручную.
+        content_type: MIME-тип, указанный вручную, или None.
+        progress: Колбэк прогресса загрузки.
     """
 
-    def __init__(self, path: str, type: UploadType | str | None = None):
+    def __init__(
+        self,
+        path: str,
+        type: UploadType | str | None = None,
+        *,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
+    ):
         """
         Инициализирует объект медиафайла.
 
+        Файл при создании не читается: тип определяется при загрузке
+        (чтение и разбор сигнатуры — вне event loop) и кешируется по
+        пути, размеру и времени изменения файла.
+
         Args:
             path: Путь к файлу.
             type: Тип файла. Если не указан,
                 определяется автоматически.
+            content_type: MIME-тип файла. Если указан, используется
+                при загрузке, а без ``type`` задаёт и тип вложения —
+                содержимое файла тогда не анализируется.
+            progress: Колбэк прогресса загрузки (функция или
+                корутина), получает ``UploadProgress`` после
+                каждого отправленного куска файла.
         """
 
         self.path = path
+        self.content_type = content_type
+        self.progress = progress
+        self._type = _hinted_type(type, content_type)
 
-        if type is not None:
-            self.type = validate_uploading_type(type)
-        else:
-            self.type = detect_file_type(InputMedia._read_file_sample(path))
+    @property
+    def type(self) -> UploadType:
+        """
+        Тип файла.
+
+        Без подсказок определяется при первом обращении чтением
+        файла; в асинхронном коде используйте :meth:`detect_type`.
+        """
+        if self._type is None:
+            self._type = upload_type_for_mime(sniff_file_mime(self.path))
+        return self._type
 
-    @staticmethod
-    def _read_file_sample(
-        path: str, size: int = READ_FILE_CHUNK_SIZE
-    ) -> bytes:
-        with Path(path).open("rb") as f:
-            return f.read(size)
+    @type.setter
+    def type(self, value: UploadType | str) -> None:
+        self._type = validate_uploading_type(value)
+
+    async def detect_type(self) -> UploadType:
+        """Определяет тип файла, не блокируя event loop."""
+        if self._type is None:
+            mime_type = await asyncio.to_thread(sniff_file_mime, self.path)
+            self._type = upload_type_for_mime(mime_type)
+        return self._type
 
 
 class InputMediaBuffer:
@@ -97,6 +226,8 @@ class InputMediaBuffer:
         buffer: Буфер с содержимым файла.
         type: Тип файла, определенный на основе содержимого
             (MIME-типа) или указанный вручную.
+        content_type: MIME-тип, указанный вручную, или None.
+        progress: Колбэк прогресса загрузки.
     """
 
     def __init__(
@@ -104,6 +235,9 @@ class InputMediaBuffer:
         buffer: bytes,
         filename: str | None = None,
         type: UploadType | str | None = None,
+        *,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
     ):
         """
         Инициализирует объект медиафайла из буфера.
@@ -114,12 +248,97 @@ class InputMediaBuffer:
                 присваивается uuid4).
             type: Тип файла. Если не указан,
                 определяется автоматически.
+            content_type: MIME-тип файла. Если указан, сигнатура
+                буфера не разбирается ни для типа, ни при загрузке.
+            progress: Колбэк прогресса загрузки (функция или
+                корутина), получает ``UploadProgress`` после
+                каждого отправленного куска.
         """
 
         self.filename = filename
         self.buffer = buffer
+        self.content_type = content_type
+        self.progress = progress
+        self._type = _hinted_type(type, content_type)
+
+    @property
+    def type(self) -> UploadType:
+        """
+        Тип файла.
+
+        Без подсказок определяется при первом обращении; в асинхронном
+        коде используйте :meth:`detect_type`.
+        """
+        if self._type is None:
+            self._type = detect_file_type(self.buffer)
+        return self._type
+
+    @type.setter
+    def type(self, value: UploadType | str) -> None:
+        self._type = validate_uploading_type(value)
+
+    async def detect_type(self) -> UploadType:
+        """Определяет тип файла, не блокируя event loop."""
+        if self._type is None:
+            mime_type = await asyncio.to_thread(sniff_mime, self.buffer)
+            self._type = upload_type_for_mime(mime_type)
+        return self._type
+
+
+class InputMediaStream:
+    """
+    Класс для представления медиафайла из асинхронного потока байт.
+
+    Файл отправляется на сервер загрузки по мере чтения потока,
+    не сохраняясь целиком ни на диске, ни в памяти.
+
+    Attributes:
+        source: Асинхронный итератор байт или функция, которая
+            его создаёт.
+        type: Тип файла.
+        filename: Имя файла.
+        size: Размер в байтах или None.
+        content_type: MIME-тип или None.
+        progress: Колбэк прогресса загрузки.
+    """
+
+    def __init__(
+        self,
+        source: StreamSource,
+        type: UploadType | str,
+        filename: str | None = None,
+        *,
+        size: int | None = None,
+        content_type: str | None = None,
+        progress: ProgressCallback | None = None,
+    ):
+        """
+        Инициализирует объект потокового медиафайла.
+
+        Args:
+            source: Асинхронный итератор кусков файла или функция
+                без аргументов, возвращающая новый итератор. С функцией
+                загрузку можно повторить при сетевой ошибке, с готовым
+                итератором — только одна попытка.
+            type: Тип файла (по потоку его заранее не определить).
+            filename: Название файла (по умолчанию
+                присваивается uuid4).
+            size: Размер файла, если известен. Без него файл
+                отправляется с chunked-кодированием.
+            content_type: MIME-тип файла. По умолчанию
+                угадывается по имени файла.
+            progress: Колбэк прогресса загрузки (функция или
+                корутина), получает ``UploadProgress`` после
+                каждого отправленного куска.
+        """
+
+        self.source = source
+        self.type = validate_uploading_type(type)
+        self.filename = filename
+        self.size = size
+        self.content_type = content_type
+        self.progress = progress
 
-        if type is not None:
-            self.type = validate_uploading_type(type)
-        else:
-            self.type = detect_file_type(buffer)
+    async def detect_type(self) -> UploadType:
+        """Тип потокового файла всегда задан явно."""
+        return self.type
@@ -1,3 +1,16 @@
+from .admission import (
+    AdmissionController,
+    AdmissionDecision,
+    DropOldestPolicy,
+    OverloadPolicy,
+    PriorityDropPolicy,
+    RejectPolicy,
+)
+from .broadcast import (
+    Broadcaster,
+    BroadcastStats,
+    BroadcastStatus,
+)
 from .deep_linking import (
     create_deep_link,
     create_start_link,
@@ -5,14 +18,47 @@ from .deep_linking import (
     decode_payload,
     encode_payload,
 )
+from .entity_cache import BaseEntityCache, CacheStats, MemoryEntityCache
 from .message_link import (
     build_message_link,
     chatid_seq_to_mid,
     link_to_chatid_seq,
     mid_to_chatid_seq,
 )
+from .readiness import (
+    AdaptiveReadinessPolicy,
+    FixedReadinessPolicy,
+    ReadinessPolicy,
+)
+from .upload_cache import (
+    BaseUploadCache,
+    FileUploadCache,
+    MemoryUploadCache,
+    RedisUploadCache,
+)
+from .worker_pool import KeyedWorkerPool
 
 __all__ = [
+    "AdaptiveReadinessPolicy",
+    "AdmissionController",
+    "AdmissionDecision",
+    "BaseEntityCache",
+    "BaseUploadCache",
+    "BroadcastStats",
+    "BroadcastStatus",
+    "Broadcaster",
+    "CacheStats",
+    "DropOldestPolicy",
+    "FileUploadCache",
+    "FixedReadinessPolicy",
+    "KeyedWorkerPool",
+    "MemoryEntityCache",
+    "MemoryUploadCache",
+    "OverloadPolicy",
+    "PriorityDropPolicy",
+    "ReadinessPolicy",
+    "RedisUploadCache",
+    "RejectPolicy",
     "build_message_link",
     "chatid_seq_to_mid",
     "create_deep_link",
@@ -0,0 +1,310 @@
+"""Контроль нагрузки диспетчера: лимиты и сброс событий при перегрузке."""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from enum import Enum
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from ..enums.update import UpdateType
+from ..loggers import logger_dp
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping, Sequence
+
+    from ..client.metrics import ClientMetrics
+    from ..types.updates import UpdateUnion
+    from .worker_pool import KeyedWorkerPool
+
+    EventHandler = Callable[[UpdateUnion], Awaitable[Any]]
+
+DEFAULT_RETRY_AFTER = 5.0
+DEFAULT_UPDATE_PRIORITY = 2
+DEFAULT_UPDATE_PRIORITIES: dict[UpdateType, int] = {
+    UpdateType.MESSAGE_CALLBACK: 3,
+    UpdateType.MESSAGE_CREATED: 3,
+    UpdateType.BOT_STARTED: 3,
+    UpdateType.MESSAGE_EDITED: 1,
+    UpdateType.MESSAGE_REMOVED: 1,
+    UpdateType.CHAT_TITLE_CHANGED: 1,
+    UpdateType.DIALOG_MUTED: 1,
+    UpdateType.DIALOG_UNMUTED: 1,
+}
+
+
+class AdmissionDecision(str, Enum):
+    """
+    Решение контроллера по событию.
+
+    ``QUEUED`` — событие поставлено в очередь; затем оно учитывается
+    ещё раз как ``ADMITTED`` (запущено), ``SHED`` или ``EXPIRED``.
+    Остальные решения окончательные, по одному на событие.
+    """
+
+    QUEUED = "queued"
+    ADMITTED = "admitted"
+    SHED = "shed"
+    REJECTED = "rejected"
+    EXPIRED = "expired"
+
+
+class OverloadPolicy(ABC):
+    """
+    Политика выбора события для сброса, когда очередь заполнена.
+    """
+
+    @abstractmethod
+    def select_victim(
+        self, queued: Sequence[UpdateUnion], incoming: UpdateUnion
+    ) -> UpdateUnion | None:
+        """
+        Выбрать событие для сброса.
+
+        Args:
+            queued: События в очереди, от старых к новым.
+            incoming: Новое событие.
+
+        Returns:
+            UpdateUnion | None: Событие из ``queued`` или ``incoming``
+                — оно сбрасывается; None — новое событие отклоняется
+                (вебхук отвечает 503, polling ждёт места в очереди).
+        """
+
+
+class DropOldestPolicy(OverloadPolicy):
+    """Сбрасывать самое старое событие в очереди."""
+
+    def select_victim(
+        self, queued: Sequence[UpdateUnion], incoming: UpdateUnion
+    ) -> UpdateUnion | None:
+        return queued[0] if queued else incoming
+
+
+class PriorityDropPolicy(OverloadPolicy):
+    """
+    Сбрасывать событие с наименьшим приоритетом типа, среди равных —
+    самое старое.
+
+    По умолчанию (:data:`DEFAULT_UPDATE_PRIORITIES`) первыми
+    сбрасываются правки, удаления и служебные события чатов, последними
+    — новые сообщения, нажатия кнопок и ``bot_started``.
+
+    Args:
+        priorities: Приоритет по типу события; больше — важнее.
+        default: Приоритет типов, которых нет в ``priorities``.
+    """
+
+    def __init__(
+        self,
+        priorities: Mapping[UpdateType, int] | None = None,
+        *,
+        default: int = DEFAULT_UPDATE_PRIORITY,
+    ) -> None:
+        self.priorities = dict(
+            DEFAULT_UPDATE_PRIORITIES if priorities is None else priorities
+        )
+        self.default = default
+
+    def priority(self, event: UpdateUnion) -> int:
+        """Приоритет события."""
+        return self.priorities.get(event.update_type, self.default)
+
+    def select_victim(
+        self, queued: Sequence[UpdateUnion], incoming: UpdateUnion
+    ) -> UpdateUnion | None:
+        return min((*queued, incoming), key=self.priority)
+
+
+class RejectPolicy(OverloadPolicy):
+    """
+    Не принимать новые события: вебхук отвечает 503, и MAX повторит
+    доставку позже; polling ждёт места в очереди.
+    """
+
+    def select_victim(
+        self, queued: Sequence[UpdateUnion], incoming: UpdateUnion
+    ) -> UpdateUnion | None:
+        return None
+
+
+class AdmissionController:
+    """
+    Ограничение нагрузки на обработчики событий.
+
+    Подключается через ``Dispatcher(admission=...)``. Одновременно
+    выполняется не больше ``max_in_flight`` обработчиков, остальные
+    события ждут в очереди до ``max_queued``. Когда очередь заполнена,
+    ``policy`` решает, какое событие сбросить или отклонить новое.
+    События старше ``max_age`` отбрасываются при приёме и перед
+    запуском. Каждое решение учитывается в :attr:`decisions` и, если
+    у бота включены метрики, в ``ClientMetrics``.
+
+    Если задан ``worker_pool``, принятые события выполняются в нём
+    (:meth:`KeyedWorkerPool.run`), и события одного чата и
+    пользователя обрабатываются по порядку.
+
+    Args:
+        max_in_flight: Сколько обработчиков выполняется одновременно.
+        max_queued: Сколько событий может ждать запуска.
+        max_age: Максимальный возраст события в секундах (по
+            ``event.timestamp``); None — без ограничения.
+        policy: Политика при заполненной очереди; по умолчанию
+            :class:`DropOldestPolicy`.
+        retry_after: Значение ``Retry-After`` в ответе 503 вебхука.
+        metrics: Метрики для учёта решений; по умолчанию берутся
+            из бота при запуске диспетчера.
+        worker_pool: Пул воркеров для выполнения принятых событий;
+            по умолчанию берётся ``worker_pool`` диспетчера.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 100,
+        max_queued: int = 1000,
+        max_age: float | None = None,
+        policy: OverloadPolicy | None = None,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+        metrics: ClientMetrics | None = None,
+        worker_pool: KeyedWorkerPool | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight должен быть >= 1")
+        if max_queued < 0:
+            raise ValueError("max_queued не может быть отрицательным")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age должен быть > 0")
+
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_age = max_age
+        self.policy = policy or DropOldestPolicy()
+        self.retry_after = retry_after
+        self.metrics = metrics
+        self.worker_pool = worker_pool
+        self.decisions: Counter[tuple[AdmissionDecision, str]] = Counter()
+        self._queue: deque[tuple[UpdateUnion, EventHandler]] = deque()
+        self._in_flight = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._space = asyncio.Event()
+
+    @property
+    def in_flight(self) -> int:
+        """Сколько обработчиков выполняется."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Сколько событий ждут запуска."""
+        return len(self._queue)
+
+    async def submit(
+        self,
+        event: UpdateUnion,
+        handler: EventHandler,
+        *,
+        wait: bool = False,
+    ) -> bool:
+        """
+        Принять событие к обработке ``handler(event)``.
+
+        Возвращается, когда событие принято, сброшено или отклонено,
+        не дожидаясь обработки.
+
+        Args:
+            event: Событие.
+            handler: Обработчик события.
+            wait: Ждать места в очереди вместо отклонения
+                (для polling, где ответить 503 нельзя).
+
+        Returns:
+            bool: False, если событие отклонено политикой; True —
+                принято или сброшено.
+        """
+
+        if self._expired(event):
+            self._record(event, AdmissionDecision.EXPIRED)
+            return True
+
+        while True:
+            if self._in_flight < self.max_in_flight and not self._queue:
+                self._start(event, handler)
+                return True
+            if len(self._queue) < self.max_queued:
+                self._record(event, AdmissionDecision.QUEUED)
+                self._queue.append((event, handler))
+                return True
+
+            victim = self.policy.select_victim(
+                [queued for queued, _ in self._queue], event
+            )
+            if victim is event:
+                self._record(event, AdmissionDecision.SHED)
+                return True
+            if victim is not None:
+                self._evict(victim)
+                self._record(event, AdmissionDecision.QUEUED)
+                self._queue.append((event, handler))
+                return True
+            if not wait:
+                self._record(event, AdmissionDecision.REJECTED)
+                return False
+
+            self._space.clear()
+            await self._space.wait()
+
+    async def join(self) -> None:
+        """Дождаться обработки принятых событий."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _expired(self, event: UpdateUnion) -> bool:
+        if self.max_age is None:
+            return False
+        return time() - event.timestamp / 1000 > self.max_age
+
+    def _record(self, event: UpdateUnion, decision: AdmissionDecision) -> None:
+        update_type = str(event.update_type)
+        self.decisions[decision, update_type] += 1
+        if self.metrics is not None:
+            self.metrics.record_event(update_type, decision.value)
+
+    def _evict(self, victim: UpdateUnion) -> None:
+        for index, (queued, _) in enumerate(self._queue):
+            if queued is victim:
+                del self._queue[index]
+                self._record(victim, AdmissionDecision.SHED)
+                return
+
+    def _start(self, event: UpdateUnion, handler: EventHandler) -> None:
+        self._record(event, AdmissionDecision.ADMITTED)
+        self._in_flight += 1
+        task = asyncio.create_task(self._run(event, handler))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, event: UpdateUnion, handler: EventHandler) -> None:
+        try:
+            if self.worker_pool is None:
+                await handler(event)
+            else:
+                await self.worker_pool.run(event.get_ids(), handler, event)
+        except Exception as e:
+            logger_dp.exception(
+                "Необработанное исключение в обработчике события: %r", e
+            )
+        finally:
+            self._in_flight -= 1
+            self._drain()
+
+    def _drain(self) -> None:
+        while self._in_flight < self.max_in_flight and self._queue:
+            event, handler = self._queue.popleft()
+            if self._expired(event):
+                self._record(event, AdmissionDecision.EXPIRED)
+                continue
+            self._start(event, handler)
+        self._space.set()
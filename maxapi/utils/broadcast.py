@@ -0,0 +1,478 @@
+"""Массовая рассылка одного сообщения по множеству получателей."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Literal
+
+import aiofiles
+
+from ..client.deadline import deadline_scope
+from ..client.priority import RequestPriority, priority_scope
+from ..enums.api_path import ApiPath
+from ..enums.http_method import HTTPMethod
+from ..exceptions.max import CircuitBreakerOpen, MaxApiError, MaxConnection
+from ..loggers import logger_bot
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Callable,
+        Iterable,
+    )
+
+    from aiofiles.threadpool.text import AsyncTextIOWrapper
+
+    from ..bot import Bot
+    from ..enums.parse_mode import TextFormat
+    from ..methods.send_message import SendMessage
+    from ..types.attachments import Attachments
+    from ..types.attachments.attachment import Attachment
+    from ..types.attachments.upload import AttachmentUpload
+    from ..types.input_media import InputMedia, InputMediaBuffer
+    from ..types.message import NewMessageLink
+
+    ProgressCallback = Callable[["BroadcastStats"], Any]
+    ResultCallback = Callable[[int, "BroadcastStatus", Exception | None], Any]
+
+DEFAULT_BROADCAST_CONCURRENCY = 16
+
+
+class BroadcastStatus(str, Enum):
+    """Итог отправки одному получателю."""
+
+    SENT = "sent"
+    BLOCKED = "blocked"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+    RETRY = "retry"
+
+
+# Получатели с этими статусами не обрабатываются повторно при resume
+FINAL_STATUSES = frozenset(
+    {BroadcastStatus.SENT, BroadcastStatus.BLOCKED, BroadcastStatus.NOT_FOUND}
+)
+
+
+@dataclass(slots=True)
+class BroadcastStats:
+    """
+    Счётчики рассылки, обновляются по ходу работы.
+
+    Attributes:
+        sent: Доставлено.
+        blocked: Бот заблокирован или нет доступа к чату (403).
+        not_found: Чат или пользователь не найден (404).
+        failed: Не доставлено после всех попыток.
+        skipped: Пропущено, так как уже обработано в прошлом
+            запуске (по файлу checkpoint).
+        retries: Повторных попыток из-за временных ошибок.
+        started_at: Момент старта по ``time.monotonic()``.
+        finished_at: Момент завершения или None.
+    """
+
+    sent: int = 0
+    blocked: int = 0
+    not_found: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=monotonic)
+    finished_at: float | None = None
+
+    @property
+    def processed(self) -> int:
+        """Сколько получателей обработано в этом запуске."""
+        return self.sent + self.blocked + self.not_found + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Длительность рассылки в секундах."""
+        end = self.finished_at if self.finished_at is not None else monotonic()
+        return end - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Средняя скорость обработки, получателей в секунду."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def add(self, status: BroadcastStatus) -> None:
+        """Учесть итог для одного получателя."""
+        if status is BroadcastStatus.SENT:
+            self.sent += 1
+        elif status is BroadcastStatus.BLOCKED:
+            self.blocked += 1
+        elif status is BroadcastStatus.NOT_FOUND:
+            self.not_found += 1
+        elif status is BroadcastStatus.FAILED:
+            self.failed += 1
+
+
+class Broadcaster:
+    """
+    Рассылка одного сообщения по списку ``chat_id`` или ``user_id``.
+
+    Вложения загружаются один раз, тело запроса сериализуется
+    один раз и переиспользуется для всех получателей. Одновременно
+    выполняется не больше ``concurrency`` отправок; скорость
+    дополнительно ограничивает ``rate_limiter`` из
+    ``DefaultConnectionProperties``, если он задан.
+
+    Ошибки классифицируются по получателю (:meth:`classify`): 403 —
+    ``BLOCKED``, 404 — ``NOT_FOUND``, ошибки соединения, таймауты,
+    429, 5xx и ``attachment.not.ready`` повторяются до
+    ``max_attempts`` раз, остальное — ``FAILED``.
+
+    При заданном ``checkpoint`` итог каждого получателя дописывается
+    в файл (JSON Lines). Повторный запуск с тем же файлом пропускает
+    получателей со статусами ``SENT``, ``BLOCKED`` и ``NOT_FOUND``,
+    поэтому прерванная рассылка продолжается без повторной отправки.
+    Повторно могут уйти только сообщения, которые были в полёте
+    в момент падения процесса.
+
+    Пример::
+
+        broadcaster = Broadcaster(bot, text="Новости", checkpoint="news.jsonl")
+        stats = await broadcaster.run(user_ids, recipient="user_id")
+
+    Args:
+        bot: Экземпляр бота.
+        text: Текст сообщения.
+        attachments: Вложения (загружаются один раз).
+        link: Ссылка на сообщение.
+        format: Режим форматирования текста.
+        notify: Флаг уведомления.
+        disable_link_preview: Флаг генерации превью.
+        concurrency: Сколько отправок выполнять одновременно.
+        max_attempts: Попыток на получателя при временных ошибках.
+        retry_delay: Базовая пауза между попытками в секундах
+            (растёт экспоненциально).
+        checkpoint: Путь к файлу прогресса или None.
+        on_progress: Вызывается с :class:`BroadcastStats` каждые
+            ``progress_every`` получателей и в конце рассылки.
+        progress_every: Период вызова ``on_progress``.
+        on_result: Вызывается для каждого получателя с
+            ``(target, status, error)``.
+        deadline: Сколько секунд отведено на одну отправку вместе
+            с retry.
+        priority: Приоритет запросов рассылки для
+            ``priority_scheduler`` (по умолчанию фоновый).
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        text: str | None = None,
+        attachments: list[
+            Attachment | InputMedia | InputMediaBuffer | AttachmentUpload
+        ]
+        | list[Attachments]
+        | None = None,
+        link: NewMessageLink | None = None,
+        format: TextFormat | None = None,
+        *,
+        notify: bool | None = None,
+        disable_link_preview: bool | None = None,
+        concurrency: int = DEFAULT_BROADCAST_CONCURRENCY,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        checkpoint: str | Path | None = None,
+        on_progress: ProgressCallback | None = None,
+        progress_every: int = 1000,
+        on_result: ResultCallback | None = None,
+        deadline: float | None = None,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency должен быть >= 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts должен быть >= 1")
+        if progress_every < 1:
+            raise ValueError("progress_every должен быть >= 1")
+
+        # methods зависят от utils, поэтому импорт отложен
+        from ..methods.send_message import SendMessage  # noqa: PLC0415
+
+        self.bot = bot
+        self.message: SendMessage = SendMessage(
+            bot=bot,
+            text=text,
+            attachments=attachments,
+            link=link,
+            format=format,
+            notify=notify,
+            disable_link_preview=disable_link_preview,
+        )
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.checkpoint = Path(checkpoint) if checkpoint is not None else None
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+        self.on_result = on_result
+        self.deadline = deadline
+        self.priority = priority
+        self.stats = BroadcastStats()
+        self._body: bytes | None = None
+        self._input_medias: list[InputMedia | InputMediaBuffer] = []
+        self._stopped = False
+
+    async def prepare(self) -> bytes:
+        """
+        Загрузить вложения и сериализовать тело запроса.
+
+        Вызывается автоматически из :meth:`run`; повторный вызов
+        возвращает готовое тело.
+
+        Returns:
+            bytes: JSON тела запроса ``POST /messages``.
+        """
+
+        if self._body is not None:
+            return self._body
+
+        self._input_medias = self.message.input_medias()
+        body = await self.message.build_json(self.bot, self._input_medias)
+        if self._input_medias:
+            await asyncio.sleep(
+                self.bot.readiness_policy.initial_delay(self._input_medias)
+            )
+        self._body = self.bot.default_connection.json_codec.dumps_bytes(body)
+        return self._body
+
+    def stop(self) -> None:
+        """Остановить рассылку после отправок, которые уже в полёте."""
+        self._stopped = True
+
+    def classify(self, error: Exception) -> BroadcastStatus:
+        """
+        Определить итог по ошибке отправки.
+
+        Args:
+            error: Исключение из запроса.
+
+        Returns:
+            BroadcastStatus: ``RETRY`` для временных ошибок,
+                иначе итоговый статус.
+        """
+
+        if isinstance(error, MaxApiError):
+            if (
+                isinstance(error.raw, dict)
+                and error.raw.get("code") == "attachment.not.ready"
+            ):
+                return BroadcastStatus.RETRY
+            if error.code == 403:
+                return BroadcastStatus.BLOCKED
+            if error.code == 404:
+                return BroadcastStatus.NOT_FOUND
+            if error.code == 429 or error.code >= 500:
+                return BroadcastStatus.RETRY
+            return BroadcastStatus.FAILED
+        if isinstance(error, MaxConnection | asyncio.TimeoutError):
+            return BroadcastStatus.RETRY
+        return BroadcastStatus.FAILED
+
+    async def run(
+        self,
+        targets: Iterable[int] | AsyncIterable[int],
+        *,
+        recipient: Literal["chat_id", "user_id"] = "chat_id",
+    ) -> BroadcastStats:
+        """
+        Разослать сообщение получателям.
+
+        Args:
+            targets: Идентификаторы получателей (итератор или
+                асинхронный итератор, читается по мере отправки).
+            recipient: Как трактовать идентификаторы — ``chat_id``
+                или ``user_id``.
+
+        Returns:
+            BroadcastStats: Итоговые счётчики.
+        """
+
+        # задачи воркеров наследуют приоритет из контекста
+        with priority_scope(self.priority):
+            return await self._run(targets, recipient)
+
+    async def _run(
+        self,
+        targets: Iterable[int] | AsyncIterable[int],
+        recipient: str,
+    ) -> BroadcastStats:
+        body = await self.prepare()
+        done = await self._load_checkpoint()
+        self.stats = BroadcastStats()
+        self._stopped = False
+
+        params = self.bot.params.copy()
+        if self.message.disable_link_preview is not None:
+            params["disable_link_preview"] = str(
+                self.message.disable_link_preview
+            ).lower()
+
+        source = _aiter(targets)
+        source_lock = asyncio.Lock()
+        journal = await self._open_journal()
+        workers = [
+            asyncio.ensure_future(
+                self._worker(
+                    source, source_lock, done, journal, body, params, recipient
+                )
+            )
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if journal is not None:
+                await journal.close()
+            self.stats.finished_at = monotonic()
+
+        logger_bot.info(
+            "Рассылка завершена: отправлено %d, заблокировано %d, "
+            "не найдено %d, ошибок %d за %.1fс",
+            self.stats.sent,
+            self.stats.blocked,
+            self.stats.not_found,
+            self.stats.failed,
+            self.stats.elapsed,
+        )
+        if self.on_progress is not None:
+            self.on_progress(self.stats)
+        return self.stats
+
+    async def _worker(
+        self,
+        source: AsyncIterator[int],
+        source_lock: asyncio.Lock,
+        done: set[int],
+        journal: AsyncTextIOWrapper | None,
+        body: bytes,
+        params: dict[str, Any],
+        recipient: str,
+    ) -> None:
+        while not self._stopped:
+            async with source_lock:
+                target = await anext(source, None)
+            if target is None:
+                return
+            if target in done:
+                self.stats.skipped += 1
+                continue
+
+            status, error = await self._deliver(
+                target, body, {**params, recipient: target}
+            )
+            self.stats.add(status)
+            if journal is not None:
+                await journal.write(
+                    json.dumps({"target": target, "status": status.value})
+                    + "\n"
+                )
+                await journal.flush()
+            if self.on_result is not None:
+                self.on_result(target, status, error)
+            if (
+                self.on_progress is not None
+                and self.stats.processed % self.progress_every == 0
+            ):
+                self.on_progress(self.stats)
+
+    async def _deliver(
+        self, target: int, body: bytes, params: dict[str, Any]
+    ) -> tuple[BroadcastStatus, Exception | None]:
+        error: Exception | None = None
+        for attempt in range(self.max_attempts):
+            try:
+                with deadline_scope(self.deadline):
+                    await self.message.request(
+                        method=HTTPMethod.POST,
+                        path=ApiPath.MESSAGES,
+                        is_return_raw=True,
+                        params=params,
+                        data=body,
+                        headers={"Content-Type": "application/json"},
+                    )
+            except (
+                MaxConnection,
+                MaxApiError,
+                asyncio.TimeoutError,
+                TimeoutError,
+            ) as e:
+                error = e
+            else:
+                return BroadcastStatus.SENT, None
+
+            status = self.classify(error)
+            if status is not BroadcastStatus.RETRY:
+                return status, error
+            if attempt + 1 < self.max_attempts:
+                self.stats.retries += 1
+                await asyncio.sleep(self._retry_delay(error, attempt))
+
+        logger_bot.warning(
+            "Рассылка: не удалось отправить %s после %d попыток: %s",
+            target,
+            self.max_attempts,
+            error,
+        )
+        return BroadcastStatus.FAILED, error
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        if isinstance(error, CircuitBreakerOpen):
+            return max(error.retry_after, self.retry_delay)
+        if (
+            isinstance(error, MaxApiError)
+            and isinstance(error.raw, dict)
+            and error.raw.get("code") == "attachment.not.ready"
+        ):
+            return self.bot.readiness_policy.retry_delay(
+                attempt, self._input_medias
+            )
+        return float(self.retry_delay * 2**attempt)
+
+    async def _load_checkpoint(self) -> set[int]:
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return set()
+
+        done: set[int] = set()
+        async with aiofiles.open(self.checkpoint) as f:
+            async for line in f:
+                try:
+                    entry = json.loads(line)
+                    status = BroadcastStatus(entry["status"])
+                except (ValueError, KeyError, TypeError):
+                    # строка, оборванная при падении процесса
+                    continue
+                if status in FINAL_STATUSES:
+                    done.add(entry["target"])
+        return done
+
+    async def _open_journal(self) -> AsyncTextIOWrapper | None:
+        if self.checkpoint is None:
+            return None
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        return await aiofiles.open(self.checkpoint, "a")
+
+
+async def _aiter(
+    targets: Iterable[int] | AsyncIterable[int],
+) -> AsyncIterator[int]:
+    if hasattr(targets, "__aiter__"):
+        async for target in targets:
+            yield target
+    else:
+        for target in targets:
+            yield target
@@ -0,0 +1,200 @@
+"""Кеш сущностей (чатов и участников) для обогащения событий."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..bot import Bot
+    from ..types.chats import Chat, ChatMember
+
+CacheKey = tuple[Any, ...]
+
+DEFAULT_CACHE_MAX_SIZE = 10_000
+DEFAULT_CACHE_TTL = 60.0
+
+
+def chat_key(chat_id: int) -> CacheKey:
+    """Ключ чата."""
+    return ("chat", chat_id)
+
+
+def member_key(chat_id: int, user_id: int) -> CacheKey:
+    """Ключ участника чата."""
+    return ("member", chat_id, user_id)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """
+    Статистика кеша.
+
+    Attributes:
+        hits: Количество попаданий.
+        misses: Количество промахов (включая истёкшие записи).
+        evictions: Сколько записей вытеснено по лимиту размера.
+        size: Текущее количество записей.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий от всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BaseEntityCache(ABC):
+    """
+    Абстрактный кеш сущностей API.
+
+    Ключи строятся функциями :func:`chat_key` и :func:`member_key`.
+    Для своего хранилища достаточно реализовать эти методы.
+    """
+
+    @abstractmethod
+    async def get(self, key: CacheKey) -> Any | None:
+        """Вернуть значение или None, если записи нет или она истекла."""
+
+    @abstractmethod
+    async def set(self, key: CacheKey, value: Any) -> None:
+        """Сохранить значение."""
+
+    @abstractmethod
+    async def delete(self, key: CacheKey) -> None:
+        """Удалить запись, если она есть."""
+
+    @abstractmethod
+    async def delete_chat(self, chat_id: int) -> None:
+        """Удалить чат и всех закешированных участников этого чата."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Очистить кеш."""
+
+    @property
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Статистика попаданий и промахов."""
+
+
+class MemoryEntityCache(BaseEntityCache):
+    """
+    LRU-кеш сущностей в оперативной памяти с TTL.
+
+    Args:
+        max_size: Максимальное количество записей. При превышении
+            вытесняются давно не использованные.
+        ttl: Время жизни записи в секундах. None — без ограничения.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        ttl: float | None = DEFAULT_CACHE_TTL,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size должен быть >= 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl должен быть > 0")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[float | None, Any]] = (
+            OrderedDict()
+        )
+        self._stats = CacheStats()
+
+    async def get(self, key: CacheKey) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and monotonic() >= expires_at:
+            del self._entries[key]
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    async def set(self, key: CacheKey, value: Any) -> None:
+        expires_at = monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def delete(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+
+    async def delete_chat(self, chat_id: int) -> None:
+        self._entries.pop(chat_key(chat_id), None)
+        for key in [
+            key
+            for key in self._entries
+            if key[0] == "member" and key[1] == chat_id
+        ]:
+            del self._entries[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.size = len(self._entries)
+        return self._stats
+
+
+async def get_chat_cached(bot: Bot, chat_id: int) -> Chat:
+    """
+    Получить чат через кеш бота (``bot.entity_cache``).
+
+    Без кеша эквивалентно ``bot.get_chat_by_id(chat_id)``.
+    """
+
+    cache = bot.entity_cache
+    if cache is None:
+        return await bot.get_chat_by_id(chat_id)
+
+    key = chat_key(chat_id)
+    chat = await cache.get(key)
+    if chat is None:
+        chat = await bot.get_chat_by_id(chat_id)
+        await cache.set(key, chat)
+    return chat
+
+
+async def get_chat_member_cached(
+    bot: Bot, chat_id: int, user_id: int
+) -> ChatMember | None:
+    """
+    Получить участника чата через кеш бота (``bot.entity_cache``).
+
+    Отсутствие участника (None) не кешируется.
+    """
+
+    cache = bot.entity_cache
+    if cache is None:
+        return await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+
+    key = member_key(chat_id, user_id)
+    member = await cache.get(key)
+    if member is None:
+        member = await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+        if member is not None:
+            await cache.set(key, member)
+    return member
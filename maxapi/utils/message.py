@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 from json import JSONDecodeError, loads
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from ..enums.upload_type import UploadType
 from ..exceptions.max import MaxApiError, MaxUploadFileFailed
+from ..loggers import logger_bot
 from ..types.attachments.upload import AttachmentPayload, AttachmentUpload
-from ..types.input_media import InputMedia, InputMediaBuffer
+from ..types.input_media import InputMedia, InputMediaBuffer, InputMediaStream
+from .upload_cache import input_media_cache_key
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from ..bot import Bot
     from ..connection.base import BaseConnection
 
@@ -26,13 +31,15 @@ async def _get_upload_info(bot: Bot, upload_type: UploadType):
 async def _upload_input_media(
     base_connection: BaseConnection,
     upload_url: str,
-    att: InputMedia | InputMediaBuffer,
+    att: InputMedia | InputMediaBuffer | InputMediaStream,
 ) -> str:
     if isinstance(att, InputMedia):
         return await base_connection.upload_file(
             url=upload_url,
             path=att.path,
             type=att.type,
+            content_type=att.content_type,
+            progress=att.progress,
         )
 
     if isinstance(att, InputMediaBuffer):
@@ -41,6 +48,19 @@ async def _upload_input_media(
             url=upload_url,
             buffer=att.buffer,
             type=att.type,
+            content_type=att.content_type,
+            progress=att.progress,
+        )
+
+    if isinstance(att, InputMediaStream):
+        return await base_connection.upload_file_stream(
+            filename=att.filename or str(uuid4()),
+            url=upload_url,
+            source=att.source,
+            type=att.type,
+            size=att.size,
+            content_type=att.content_type,
+            progress=att.progress,
         )
 
     raise TypeError(f"Unsupported media type: {type(att)!r}")
@@ -108,22 +128,45 @@ async def _resolve_attachment_token(
 async def process_input_media(
     base_connection: BaseConnection,
     bot: Bot,
-    att: InputMedia | InputMediaBuffer,
+    att: InputMedia | InputMediaBuffer | InputMediaStream,
+    cache_hits: list[InputMedia | InputMediaBuffer] | None = None,
 ) -> AttachmentUpload:
     """
     Загружает файл вложения и формирует объект AttachmentUpload.
 
+    Если у бота задан ``upload_cache``, токен ранее загруженного
+    такого же файла берётся из кеша без обращения к серверу загрузки.
+    Потоковые вложения (``InputMediaStream``) не кешируются: ключ
+    по содержимому нельзя построить, не прочитав поток.
+
     Args:
         base_connection: Базовое соединение для
             загрузки файла.
         bot: Экземпляр бота.
         att: Объект вложения
             для загрузки.
+        cache_hits: Список, в который добавляется ``att``, если
+            токен взят из кеша.
 
     Returns:
         AttachmentUpload: Загруженное вложение с токеном.
     """
 
+    # тип определяется вне event loop (чтение файла и разбор сигнатуры)
+    await att.detect_type()
+
+    cache = bot.upload_cache
+    cache_key = None
+    if cache is not None and not isinstance(att, InputMediaStream):
+        cache_key = await input_media_cache_key(att, stat_keys=cache.stat_keys)
+        cached_token = await cache.get(cache_key)
+        if cached_token is not None:
+            if cache_hits is not None:
+                cache_hits.append(att)
+            return AttachmentUpload(
+                type=att.type, payload=AttachmentPayload(token=cached_token)
+            )
+
     upload = await _get_upload_info(bot=bot, upload_type=att.type)
     upload_file_response = await _upload_input_media(
         base_connection=base_connection,
@@ -136,7 +179,101 @@ async def process_input_media(
         upload_token=upload.token,
         upload_file_response=upload_file_response,
     )
+    if cache is not None and cache_key is not None:
+        try:
+            await cache.set(cache_key, token)
+        except Exception as e:
+            # файл уже загружен: без кеша следующая отправка загрузит
+            # его заново, но текущая не должна падать
+            logger_bot.warning("Ошибка записи в кеш загрузок: %r", e)
 
     return AttachmentUpload(
         type=att.type, payload=AttachmentPayload(token=token)
     )
+
+
+async def process_input_media_batch(
+    base_connection: BaseConnection,
+    bot: Bot,
+    attachments: Sequence[InputMedia | InputMediaBuffer],
+    cache_hits: list[InputMedia | InputMediaBuffer] | None = None,
+) -> list[AttachmentUpload]:
+    """
+    Загружает несколько вложений параллельно.
+
+    Одновременно выполняется не больше
+    ``bot.default_connection.upload_concurrency`` загрузок. Порядок
+    результата совпадает с порядком ``attachments``. Если одна из
+    загрузок завершилась ошибкой, остальные отменяются.
+
+    Args:
+        base_connection: Базовое соединение для
+            загрузки файлов.
+        bot: Экземпляр бота.
+        attachments: Вложения для загрузки.
+        cache_hits: Список, в который добавляются вложения, токены
+            которых взяты из кеша.
+
+    Returns:
+        list[AttachmentUpload]: Загруженные вложения с токенами.
+    """
+
+    if not attachments:
+        return []
+    if len(attachments) == 1:
+        return [
+            await process_input_media(
+                base_connection=base_connection,
+                bot=bot,
+                att=attachments[0],
+                cache_hits=cache_hits,
+            )
+        ]
+
+    semaphore = asyncio.Semaphore(bot.default_connection.upload_concurrency)
+
+    async def _process(att: InputMedia | InputMediaBuffer) -> AttachmentUpload:
+        async with semaphore:
+            return await process_input_media(
+                base_connection=base_connection,
+                bot=bot,
+                att=att,
+                cache_hits=cache_hits,
+            )
+
+    tasks = [asyncio.ensure_future(_process(att)) for att in attachments]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def forget_cached_uploads(
+    bot: Bot, attachments: Sequence[InputMedia | InputMediaBuffer]
+) -> bool:
+    """
+    Удаляет токены вложений из ``bot.upload_cache``.
+
+    Вызывается, когда API отклонил сообщение с токенами из кеша:
+    после удаления вложения будут загружены заново.
+
+    Args:
+        bot: Экземпляр бота.
+        attachments: Вложения, токены которых взяты из кеша.
+
+    Returns:
+        bool: True, если хотя бы один токен был в кеше.
+    """
+
+    cache = bot.upload_cache
+    if cache is None:
+        return False
+
+    forgotten = False
+    for att in attachments:
+        key = await input_media_cache_key(att, stat_keys=cache.stat_keys)
+        forgotten = await cache.delete(key) or forgotten
+    return forgotten
@@ -0,0 +1,190 @@
+"""Политики ожидания готовности загруженных вложений."""
+
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from pathlib import Path
+from statistics import median
+from typing import TYPE_CHECKING
+
+from ..enums.upload_type import UploadType
+from ..types.input_media import InputMedia
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+    from ..types.input_media import InputMediaBuffer
+
+    MediaList = Sequence[InputMedia | InputMediaBuffer]
+
+DEFAULT_INSTANT_TYPES: frozenset[UploadType] = frozenset(
+    {UploadType.IMAGE, UploadType.FILE}
+)
+
+
+def _media_size(att: InputMedia | InputMediaBuffer) -> int:
+    if isinstance(att, InputMedia):
+        try:
+            return Path(att.path).stat().st_size
+        except OSError:
+            return 0
+    return len(att.buffer)
+
+
+def size_bucket(size: int) -> int:
+    """Номер корзины размера: границы растут в 4 раза (1 КиБ, 4 КиБ…)."""
+    return max(0, (size.bit_length() - 9) // 2)
+
+
+class ReadinessPolicy(ABC):
+    """
+    Политика ожидания готовности вложений после загрузки.
+
+    Сервер обрабатывает загруженные файлы асинхронно и до окончания
+    обработки отвечает на отправку сообщения ошибкой
+    ``attachment.not.ready``. Политика решает, сколько ждать перед
+    первой отправкой и между повторами.
+    """
+
+    @abstractmethod
+    def initial_delay(self, attachments: MediaList) -> float:
+        """Пауза перед первой отправкой сообщения в секундах."""
+
+    @abstractmethod
+    def retry_delay(self, attempt: int, attachments: MediaList) -> float:
+        """
+        Пауза перед повтором после ``attachment.not.ready``.
+
+        Args:
+            attempt: Номер неудачной попытки (с 0).
+            attachments: Загруженные вложения сообщения.
+        """
+
+    def record_ready(
+        self, attachments: MediaList, elapsed: float, attempts: int
+    ) -> None:
+        """
+        Сообщить об успешной отправке.
+
+        Args:
+            attachments: Загруженные вложения сообщения.
+            elapsed: Сколько секунд клиент ждал готовности: пауза
+                перед первой отправкой и паузы между повторами, без
+                времени самих запросов.
+            attempts: Сколько попыток отправки понадобилось.
+        """
+
+        return None
+
+
+class FixedReadinessPolicy(ReadinessPolicy):
+    """
+    Фиксированные паузы: поведение по умолчанию.
+
+    Args:
+        initial_delay: Пауза перед первой отправкой в секундах.
+        retry_delay: Пауза между повторами в секундах.
+    """
+
+    def __init__(self, initial_delay: float, retry_delay: float) -> None:
+        self._initial_delay = initial_delay
+        self._retry_delay = retry_delay
+
+    def initial_delay(self, attachments: MediaList) -> float:
+        return self._initial_delay
+
+    def retry_delay(self, attempt: int, attachments: MediaList) -> float:
+        return self._retry_delay
+
+
+class AdaptiveReadinessPolicy(ReadinessPolicy):
+    """
+    Адаптивное ожидание готовности с обучением на успешных отправках.
+
+    Для типов из ``instant_types`` (по умолчанию изображения и файлы)
+    сообщение отправляется сразу. Для остальных пауза перед первой
+    отправкой — медиана времени готовности из последних успешных
+    отправок того же типа и корзины размера (:func:`size_bucket`),
+    а без истории — ``base_delay``. Повторы идут с экспоненциально
+    растущей паузой и случайным разбросом.
+
+    В историю записывается суммарная пауза до успешной отправки. Если
+    сообщение ушло с первой попытки, она уменьшается на ``shrink``,
+    поэтому оценка постепенно снижается, пока сервер не начнёт
+    отвечать ``attachment.not.ready``. Для ``instant_types`` история
+    не ведётся.
+
+    Args:
+        base_delay: Начальная пауза в секундах.
+        max_delay: Максимальная пауза в секундах.
+        multiplier: Множитель паузы между повторами.
+        jitter: Доля случайного разброса паузы (от 0 до 1).
+        instant_types: Типы вложений, которые отправляются без паузы.
+        history_size: Сколько последних замеров хранить на корзину.
+        shrink: Множитель времени при успехе с первой попытки.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_delay: float = 0.25,
+        max_delay: float = 5.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        instant_types: Collection[UploadType] = DEFAULT_INSTANT_TYPES,
+        history_size: int = 20,
+        shrink: float = 0.75,
+    ) -> None:
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("нужно 0 <= base_delay <= max_delay")
+        if multiplier < 1:
+            raise ValueError("multiplier должен быть >= 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter должен быть от 0 до 1")
+        if history_size < 1:
+            raise ValueError("history_size должен быть >= 1")
+
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.instant_types = frozenset(instant_types)
+        self.shrink = shrink
+        self._history: defaultdict[tuple[UploadType, int], deque[float]] = (
+            defaultdict(lambda: deque(maxlen=history_size))
+        )
+
+    @staticmethod
+    def _key(att: InputMedia | InputMediaBuffer) -> tuple[UploadType, int]:
+        return att.type, size_bucket(_media_size(att))
+
+    def _jittered(self, delay: float) -> float:
+        spread = delay * self.jitter
+        return delay + random.uniform(-spread, spread)  # noqa: S311
+
+    def estimate(self, att: InputMedia | InputMediaBuffer) -> float:
+        """Оценка времени готовности вложения в секундах."""
+
+        if att.type in self.instant_types:
+            return 0.0
+        history = self._history.get(self._key(att))
+        if history:
+            return min(median(history), self.max_delay)
+        return self.base_delay
+
+    def initial_delay(self, attachments: MediaList) -> float:
+        return max((self.estimate(att) for att in attachments), default=0.0)
+
+    def retry_delay(self, attempt: int, attachments: MediaList) -> float:
+        delay = min(self.base_delay * self.multiplier**attempt, self.max_delay)
+        return self._jittered(delay)
+
+    def record_ready(
+        self, attachments: MediaList, elapsed: float, attempts: int
+    ) -> None:
+        sample = elapsed * self.shrink if attempts == 1 else elapsed
+        for att in attachments:
+            if att.type not in self.instant_types:
+                self._history[self._key(att)].append(sample)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from ..enums.chat_type import ChatType
+from ..enums.update import UpdateType
 from ..exceptions.max import MaxApiError, MaxConnection
 from ..types.fetchable import ChatRef, FromUserRef
 from ..types.updates.bot_added import BotAdded
@@ -21,14 +23,36 @@ from ..types.updates.message_edited import MessageEdited
 from ..types.updates.message_removed import MessageRemoved
 from ..types.updates.user_added import UserAdded
 from ..types.updates.user_removed import UserRemoved
+from ..utils.entity_cache import (
+    chat_key,
+    get_chat_cached,
+    get_chat_member_cached,
+    member_key,
+)
 from ..utils.runtime import bind_bot
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from ..bot import Bot
+    from ..types.chats import Chat, ChatMember
     from ..types.updates import UpdateUnion
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# События, по которым _apply_update_to_cache обновляет кеш сущностей
+CACHE_UPDATE_TYPES = frozenset(
+    {
+        UpdateType.BOT_ADDED,
+        UpdateType.BOT_REMOVED,
+        UpdateType.CHAT_TITLE_CHANGED,
+        UpdateType.USER_ADDED,
+        UpdateType.USER_REMOVED,
+    }
+)
+
 _EVENTS_WITH_USER_ATTR = (
     UserAdded,
     BotAdded,
@@ -65,15 +89,27 @@ def _can_resolve_chat(event: UpdateUnion) -> bool:
     return not isinstance(event, (DialogRemoved, BotRemoved, BotStopped))
 
 
-async def _resolve_chat(event: UpdateUnion, bot: Bot) -> None:
-    """Загружает объект чата для события."""
+def _chat_to_resolve(event: UpdateUnion) -> int | None:
+    """chat_id, по которому нужно загрузить чат события, или None."""
 
     if not _can_resolve_chat(event):
+        return None
+    return _extract_chat_id(event)
+
+
+async def _resolve_chat(
+    event: UpdateUnion, bot: Bot, lookups: _BatchLookups | None = None
+) -> None:
+    """Загружает объект чата для события."""
+
+    chat_id = _chat_to_resolve(event)
+    if chat_id is None:
         return
 
-    chat_id = _extract_chat_id(event)
-    if chat_id is not None:
-        event.chat = await bot.get_chat_by_id(chat_id)
+    if lookups is None:
+        event.chat = await get_chat_cached(bot, chat_id)
+    else:
+        event.chat = await lookups.chat(chat_id)
 
 
 def _resolve_from_user_from_payload(event: UpdateUnion) -> Any | None:
@@ -91,7 +127,25 @@ def _resolve_from_user_from_payload(event: UpdateUnion) -> Any | None:
     return None
 
 
-async def _resolve_from_user(event: UpdateUnion, bot: Bot) -> None:
+def _member_to_resolve(event: UpdateUnion) -> tuple[int, int] | None:
+    """(chat_id, user_id) участника-отправителя, которого нужно загрузить."""
+
+    if _resolve_from_user_from_payload(event) is not None:
+        return None
+
+    if isinstance(event, MessageRemoved):
+        if event.chat and event.chat.type == ChatType.CHAT:
+            return event.chat_id, event.user_id
+
+    elif isinstance(event, UserRemoved) and event.admin_id:
+        return event.chat_id, event.admin_id
+
+    return None
+
+
+async def _resolve_from_user(
+    event: UpdateUnion, bot: Bot, lookups: _BatchLookups | None = None
+) -> None:
     """Определяет отправителя события."""
 
     payload_from_user = _resolve_from_user_from_payload(event)
@@ -99,45 +153,38 @@ async def _resolve_from_user(event: UpdateUnion, bot: Bot) -> None:
         event.from_user = payload_from_user
         return
 
-    if isinstance(event, MessageRemoved):
-        if event.chat and event.chat.type == ChatType.CHAT:
-            try:
-                event.from_user = await bot.get_chat_member(
-                    chat_id=event.chat_id, user_id=event.user_id
-                )
-            except MaxApiError as exc:
-                logger.warning(
-                    "Не удалось получить участника чата: code=%s chat_id=%s",
-                    exc.code,
-                    event.chat_id,
-                )
-            except MaxConnection as exc:
-                logger.warning(
-                    "get_chat_member: %s chat_id=%s",
-                    exc,
-                    event.chat_id,
-                )
-        elif event.chat and event.chat.type == ChatType.DIALOG:
-            event.from_user = event.chat
+    if (
+        isinstance(event, MessageRemoved)
+        and event.chat
+        and event.chat.type == ChatType.DIALOG
+    ):
+        event.from_user = event.chat
+        return
 
-    elif isinstance(event, UserRemoved) and event.admin_id:
-        try:
-            event.from_user = await bot.get_chat_member(
-                chat_id=event.chat_id,
-                user_id=event.admin_id,
-            )
-        except MaxApiError as exc:
-            logger.warning(
-                "Не удалось получить участника чата: code=%s chat_id=%s",
-                exc.code,
-                event.chat_id,
-            )
-        except MaxConnection as exc:
-            logger.warning(
-                "get_chat_member: %s chat_id=%s",
-                exc,
-                event.chat_id,
+    member = _member_to_resolve(event)
+    if member is None:
+        return
+
+    chat_id, user_id = member
+    try:
+        if lookups is None:
+            event.from_user = await get_chat_member_cached(
+                bot, chat_id=chat_id, user_id=user_id
             )
+        else:
+            event.from_user = await lookups.member(chat_id, user_id)
+    except MaxApiError as exc:
+        logger.warning(
+            "Не удалось получить участника чата: code=%s chat_id=%s",
+            exc.code,
+            chat_id,
+        )
+    except MaxConnection as exc:
+        logger.warning(
+            "get_chat_member: %s chat_id=%s",
+            exc,
+            chat_id,
+        )
 
 
 def _inject_bot(event: UpdateUnion, bot: Bot) -> None:
@@ -156,7 +203,8 @@ async def _fetch_from_user_for_message_removed(
         return None
 
     if chat.type == ChatType.CHAT:
-        return await bot.get_chat_member(
+        return await get_chat_member_cached(
+            bot,
             chat_id=event.chat_id,
             user_id=event.user_id,
         )
@@ -204,7 +252,8 @@ def _build_from_user_value(event: UpdateUnion, bot: Bot) -> Any | None:
         admin_id = event.admin_id
         return FromUserRef(
             bot=bot,
-            fetcher=lambda: bot.get_chat_member(
+            fetcher=lambda: get_chat_member_cached(
+                bot,
                 chat_id=event.chat_id,
                 user_id=admin_id,
             ),
@@ -230,6 +279,50 @@ def _attach_lazy_refs(event: UpdateUnion, bot: Bot) -> None:
             event.from_user = from_user
 
 
+async def _apply_update_to_cache(event: UpdateUnion, bot: Bot) -> None:
+    """
+    Обновить кеш сущностей бота по входящему событию.
+
+    Изменение названия чата обновляет закешированный чат, добавление и
+    удаление участников сбрасывает запись участника и корректирует
+    ``participants_count``, удаление бота вытесняет чат целиком.
+    Закешированный чат не изменяется на месте: в кеш записывается
+    копия, поэтому обновление доходит до любого хранилища и не
+    затрагивает чаты уже полученных событий.
+    """
+
+    cache = bot.entity_cache
+    if cache is None:
+        return
+
+    if isinstance(event, BotRemoved):
+        await cache.delete_chat(event.chat_id)
+        return
+
+    if isinstance(event, BotAdded):
+        await cache.delete(chat_key(event.chat_id))
+        return
+
+    if isinstance(event, ChatTitleChanged):
+        key = chat_key(event.chat_id)
+        chat = await cache.get(key)
+        if chat is not None:
+            await cache.set(
+                key, chat.model_copy(update={"title": event.title})
+            )
+
+    elif isinstance(event, (UserAdded, UserRemoved)):
+        await cache.delete(member_key(event.chat_id, event.user.user_id))
+        key = chat_key(event.chat_id)
+        chat = await cache.get(key)
+        if chat is not None:
+            delta = 1 if isinstance(event, UserAdded) else -1
+            count = max(0, chat.participants_count + delta)
+            await cache.set(
+                key, chat.model_copy(update={"participants_count": count})
+            )
+
+
 async def enrich_event(event_object: UpdateUnion, bot: Bot) -> UpdateUnion:
     """
     Дополняет объект события данными чата, пользователя и ссылкой на бота.
@@ -243,6 +336,7 @@ async def enrich_event(event_object: UpdateUnion, bot: Bot) -> UpdateUnion:
     """
 
     _inject_bot(event_object, bot)
+    await _apply_update_to_cache(event_object, bot)
 
     if not bot.auto_requests:
         _attach_lazy_refs(event_object, bot)
@@ -252,3 +346,128 @@ async def enrich_event(event_object: UpdateUnion, bot: Bot) -> UpdateUnion:
     await _resolve_from_user(event_object, bot)
 
     return event_object
+
+
+class _BatchLookups:
+    """
+    Запросы чатов и участников, общие для событий одного батча.
+
+    Каждый чат и участник запрашивается один раз, одновременно
+    выполняется не больше ``limit`` запросов.
+    """
+
+    def __init__(self, bot: Bot, limit: int) -> None:
+        self.bot = bot
+        self._semaphore = asyncio.Semaphore(limit)
+        self._tasks: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+
+    def chat(self, chat_id: int) -> asyncio.Task[Chat]:
+        """Запрос чата (запускается при первом обращении)."""
+        return self._task(
+            ("chat", chat_id), lambda: get_chat_cached(self.bot, chat_id)
+        )
+
+    def member(
+        self, chat_id: int, user_id: int
+    ) -> asyncio.Task[ChatMember | None]:
+        """Запрос участника чата (запускается при первом обращении)."""
+        return self._task(
+            ("member", chat_id, user_id),
+            lambda: get_chat_member_cached(
+                self.bot, chat_id=chat_id, user_id=user_id
+            ),
+        )
+
+    def forget_chat(self, chat_id: int) -> None:
+        """Забыть запрос чата: следующее обращение прочитает кеш заново."""
+        task = self._tasks.pop(("chat", chat_id), None)
+        if task is not None:
+            self._discard(task)
+
+    def close(self) -> None:
+        """Отменить незавершённые запросы и забрать их ошибки."""
+        for task in self._tasks.values():
+            self._discard(task)
+
+    @staticmethod
+    def _discard(task: asyncio.Task[Any]) -> None:
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
+
+    def _task(
+        self, key: tuple[Any, ...], factory: Callable[[], Awaitable[_T]]
+    ) -> asyncio.Task[_T]:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._limited(factory))
+            self._tasks[key] = task
+        return task
+
+    async def _limited(self, factory: Callable[[], Awaitable[_T]]) -> _T:
+        async with self._semaphore:
+            return await factory()
+
+
+async def enrich_events(
+    events: list[UpdateUnion],
+    bot: Bot,
+    *,
+    concurrency: int | None = None,
+) -> list[UpdateUnion]:
+    """
+    Дополняет события батча, как :func:`enrich_event`, но запрашивает
+    чаты и участников сразу для всего батча.
+
+    Уникальные чаты (а затем участники) всех событий загружаются
+    параллельно, не больше ``concurrency`` запросов одновременно;
+    события одного чата получают общий результат. Кеш сущностей
+    обновляется и события дополняются в исходном порядке.
+
+    Args:
+        events: События батча.
+        bot: Экземпляр бота.
+        concurrency: Сколько запросов выполнять одновременно.
+            None — ``bot.default_connection.enrich_concurrency``.
+
+    Returns:
+        list[UpdateUnion]: Те же события в том же порядке.
+    """
+
+    if not bot.auto_requests or len(events) < 2:
+        return [await enrich_event(event, bot) for event in events]
+
+    if concurrency is None:
+        concurrency = bot.default_connection.enrich_concurrency
+    lookups = _BatchLookups(bot, concurrency)
+    try:
+        for event in events:
+            chat_id = _chat_to_resolve(event)
+            if chat_id is not None:
+                lookups.chat(chat_id)
+
+        for event in events:
+            _inject_bot(event, bot)
+            await _apply_update_to_cache(event, bot)
+            chat_id = _extract_chat_id(event)
+            if (
+                bot.entity_cache is not None
+                and event.update_type in CACHE_UPDATE_TYPES
+                and chat_id is not None
+            ):
+                # кеш чата изменился: следующие события читают его заново
+                lookups.forget_chat(chat_id)
+            await _resolve_chat(event, bot, lookups)
+
+        for event in events:
+            member = _member_to_resolve(event)
+            if member is not None:
+                lookups.member(*member)
+
+        for event in events:
+            await _resolve_from_user(event, bot, lookups)
+    finally:
+        lookups.close()
+
+    return events
@@ -0,0 +1,313 @@
+"""Кеш токенов загруженных файлов для повторной отправки без загрузки."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import aiofiles
+import aiofiles.os
+
+from ..loggers import logger_bot
+from ..types.input_media import InputMedia
+
+if TYPE_CHECKING:
+    from ..enums.upload_type import UploadType
+    from ..types.input_media import InputMediaBuffer
+
+DEFAULT_UPLOAD_CACHE_MAX_SIZE = 10_000
+DEFAULT_UPLOAD_CACHE_TTL = 24 * 60 * 60.0
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_key(upload_type: UploadType, digest: str) -> str:
+    """Ключ по SHA-256 содержимого файла."""
+    return f"{upload_type.value}:sha256:{digest}"
+
+
+def stat_key(upload_type: UploadType, path: str) -> str:
+    """
+    Быстрый ключ по пути, размеру и времени изменения файла.
+
+    Не требует чтения файла, но считает разными одинаковые
+    файлы в разных местах.
+    """
+
+    resolved = Path(path).resolve()
+    st = resolved.stat()
+    return f"{upload_type.value}:stat:{resolved}:{st.st_size}:{st.st_mtime_ns}"
+
+
+async def input_media_cache_key(
+    att: InputMedia | InputMediaBuffer, *, stat_keys: bool = False
+) -> str:
+    """
+    Построить ключ кеша для вложения.
+
+    Для буфера и для файла (по умолчанию) ключ — хеш содержимого.
+    Файл и буфер больше ``_HASH_CHUNK_SIZE`` хешируются в отдельном
+    потоке, чтобы не блокировать event loop. С ``stat_keys=True`` для
+    ``InputMedia`` используется :func:`stat_key`.
+
+    Args:
+        att: Вложение.
+        stat_keys: Использовать быстрый ключ для файлов с диска.
+
+    Returns:
+        str: Ключ кеша.
+    """
+
+    if isinstance(att, InputMedia):
+        if stat_keys:
+            return await asyncio.to_thread(stat_key, att.type, att.path)
+        digest = await asyncio.to_thread(_hash_file, att.path)
+    elif len(att.buffer) > _HASH_CHUNK_SIZE:
+        digest = await asyncio.to_thread(_hash_bytes, att.buffer)
+    else:
+        digest = _hash_bytes(att.buffer)
+    return content_key(att.type, digest)
+
+
+class BaseUploadCache(ABC):
+    """
+    Абстрактный кеш токенов загрузки.
+
+    Хранит соответствие ключа файла (:func:`input_media_cache_key`)
+    и токена, полученного от сервера загрузки. Для своего хранилища
+    достаточно реализовать абстрактные методы.
+
+    Args:
+        ttl: Время жизни токена в секундах. None — без ограничения.
+        stat_keys: Использовать для файлов с диска быстрый ключ
+            по пути, размеру и времени изменения вместо хеша
+            содержимого.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float | None = DEFAULT_UPLOAD_CACHE_TTL,
+        stat_keys: bool = False,
+    ) -> None:
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl должен быть > 0")
+        self.ttl = ttl
+        self.stat_keys = stat_keys
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Вернуть токен или None, если записи нет или она истекла."""
+
+    @abstractmethod
+    async def set(self, key: str, token: str) -> None:
+        """Сохранить токен."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Удалить запись. Возвращает True, если она была."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Очистить кеш."""
+
+
+class MemoryUploadCache(BaseUploadCache):
+    """
+    LRU-кеш токенов загрузки в оперативной памяти.
+
+    Args:
+        max_size: Максимальное количество записей.
+        ttl: Время жизни токена в секундах. None — без ограничения.
+        stat_keys: Быстрые ключи для файлов с диска.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_UPLOAD_CACHE_MAX_SIZE,
+        *,
+        ttl: float | None = DEFAULT_UPLOAD_CACHE_TTL,
+        stat_keys: bool = False,
+    ) -> None:
+        super().__init__(ttl=ttl, stat_keys=stat_keys)
+        if max_size < 1:
+            raise ValueError("max_size должен быть >= 1")
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float | None, str]] = (
+            OrderedDict()
+        )
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, token = entry
+        if expires_at is not None and monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return token
+
+    async def set(self, key: str, token: str) -> None:
+        expires_at = monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, token)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class FileUploadCache(BaseUploadCache):
+    """
+    Кеш токенов загрузки в каталоге на диске.
+
+    Каждая запись — отдельный JSON-файл, поэтому кеш переживает
+    перезапуск бота и может использоваться несколькими процессами
+    на одной машине. Запись идёт через временный файл с уникальным
+    именем и атомарную замену; ошибка записи только логируется.
+
+    Args:
+        directory: Каталог кеша (создаётся при первой записи).
+        ttl: Время жизни токена в секундах. None — без ограничения.
+        stat_keys: Быстрые ключи для файлов с диска.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        ttl: float | None = DEFAULT_UPLOAD_CACHE_TTL,
+        stat_keys: bool = False,
+    ) -> None:
+        super().__init__(ttl=ttl, stat_keys=stat_keys)
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / f"{name}.json"
+
+    async def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            async with aiofiles.open(path) as f:
+                entry: dict[str, Any] = json.loads(await f.read())
+        except (OSError, ValueError):
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and time() >= expires_at:
+            with suppress(OSError):
+                await aiofiles.os.remove(path)
+            return None
+        return entry.get("token")
+
+    async def set(self, key: str, token: str) -> None:
+        expires_at = time() + self.ttl if self.ttl is not None else None
+        path = self._path(key)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.{uuid4().hex}.tmp")
+        try:
+            await aiofiles.os.makedirs(self.directory, exist_ok=True)
+            async with aiofiles.open(tmp, "w") as f:
+                await f.write(
+                    json.dumps({"token": token, "expires_at": expires_at})
+                )
+            await aiofiles.os.replace(tmp, path)
+        except OSError as e:
+            logger_bot.warning("Не удалось сохранить токен в кеш: %r", e)
+            with suppress(OSError):
+                await aiofiles.os.remove(tmp)
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await aiofiles.os.remove(self._path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+    def _clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class RedisUploadCache(BaseUploadCache):
+    """
+    Кеш токенов загрузки в Redis, общий для нескольких процессов.
+    Требует установленной библиотеки redis: pip install redis
+
+    Args:
+        redis_client: Клиент ``redis.asyncio.Redis``.
+        key_prefix: Префикс ключей.
+        ttl: Время жизни токена в секундах. None — без ограничения.
+        stat_keys: Быстрые ключи для файлов с диска.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,  # redis.asyncio.Redis
+        key_prefix: str = "maxapi:upload",
+        *,
+        ttl: float | None = DEFAULT_UPLOAD_CACHE_TTL,
+        stat_keys: bool = False,
+    ) -> None:
+        super().__init__(ttl=ttl, stat_keys=stat_keys)
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    async def get(self, key: str) -> str | None:
+        token = await self.redis.get(self._key(key))
+        if isinstance(token, bytes):
+            return token.decode()
+        return token
+
+    async def set(self, key: str, token: str) -> None:
+        if self.ttl is None:
+            await self.redis.set(self._key(key), token)
+        else:
+            await self.redis.set(
+                self._key(key), token, px=int(self.ttl * 1000)
+            )
+
+    async def delete(self, key: str) -> bool:
+        return bool(await self.redis.delete(self._key(key)))
+
+    async def clear(self) -> None:
+        keys = [
+            key async for key in self.redis.scan_iter(f"{self.key_prefix}:*")
+        ]
+        if keys:
+            await self.redis.delete(*keys)
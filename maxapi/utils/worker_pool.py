@@ -0,0 +1,189 @@
+"""Пул воркеров, сохраняющий порядок задач с одним ключом."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from ..loggers import logger_dp
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+    _Job = tuple[Hashable, Callable[..., Awaitable[Any]], tuple[Any, ...]]
+
+
+class KeyedWorkerPool:
+    """
+    Фиксированный пул воркеров с упорядоченной обработкой по ключу.
+
+    Задача с ключом ``key`` попадает в очередь воркера
+    ``hash(key) % workers``, поэтому задачи одного ключа выполняются
+    строго по очереди, а разные ключи — параллельно на разных
+    воркерах. ``Dispatcher(worker_pool=...)`` использует в качестве
+    ключа ``event.get_ids()``: события одного чата и пользователя
+    (и их FSM-контекст) обрабатываются последовательно.
+
+    ``submit`` ждёт (backpressure), пока принято ``max_in_flight``
+    невыполненных задач или ``max_per_key`` задач одного ключа.
+    Воркеры запускаются при первой задаче и останавливаются
+    :meth:`close`; после этого пул можно использовать снова.
+
+    Args:
+        workers: Число воркеров.
+        max_in_flight: Сколько задач может быть принято и не
+            выполнено одновременно.
+        max_per_key: Сколько задач одного ключа может ждать
+            выполнения.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        *,
+        max_in_flight: int = 1000,
+        max_per_key: int = 100,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers должен быть >= 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight должен быть >= 1")
+        if max_per_key < 1:
+            raise ValueError("max_per_key должен быть >= 1")
+
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.max_per_key = max_per_key
+        self._queues: list[asyncio.Queue[_Job]] = []
+        self._tasks: list[asyncio.Task[None]] = []
+        self._in_flight = 0
+        self._pending: Counter[Hashable] = Counter()
+        self._changed = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Сколько задач принято и не выполнено."""
+        return self._in_flight
+
+    def pending(self, key: Hashable) -> int:
+        """Сколько задач ключа ``key`` принято и не выполнено."""
+        return self._pending[key]
+
+    def worker_for(self, key: Hashable) -> int:
+        """Номер воркера, выполняющего задачи ключа ``key``."""
+        return hash(key) % self.workers
+
+    async def submit(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> None:
+        """
+        Поставить ``func(*args)`` в очередь воркера ключа ``key``.
+
+        Возвращается, когда задача принята, а не выполнена. Задачи
+        одного ключа выполняются в порядке вызовов ``submit``.
+        Исключения задачи логируются и не прерывают воркер.
+
+        Args:
+            key: Ключ упорядочивания.
+            func: Асинхронная функция.
+            *args: Аргументы ``func``.
+        """
+
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: (
+                    self._in_flight < self.max_in_flight
+                    and self._pending[key] < self.max_per_key
+                )
+            )
+            self._in_flight += 1
+            self._pending[key] += 1
+
+        self._start()
+        self._queues[self.worker_for(key)].put_nowait((key, func, args))
+
+    async def run(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """
+        Выполнить ``func(*args)`` в очереди ключа ``key`` и дождаться
+        результата.
+
+        В отличие от :meth:`submit`, исключение ``func`` передаётся
+        вызывающему, а не логируется пулом.
+
+        Args:
+            key: Ключ упорядочивания.
+            func: Асинхронная функция.
+            *args: Аргументы ``func``.
+
+        Returns:
+            Any: Результат ``func``.
+        """
+
+        result: asyncio.Future[Any] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+        async def job() -> None:
+            try:
+                value = await func(*args)
+            except Exception as e:
+                if not result.done():
+                    result.set_exception(e)
+            else:
+                if not result.done():
+                    result.set_result(value)
+            finally:
+                if not result.done():
+                    result.cancel()
+
+        await self.submit(key, job)
+        return await result
+
+    async def join(self) -> None:
+        """Дождаться выполнения всех принятых задач."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def close(self) -> None:
+        """Дождаться выполнения принятых задач и остановить воркеры."""
+
+        await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queues.clear()
+
+    def _start(self) -> None:
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue() for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._work(queue)) for queue in self._queues
+        ]
+
+    async def _work(self, queue: asyncio.Queue[_Job]) -> None:
+        while True:
+            key, func, args = await queue.get()
+            try:
+                await func(*args)
+            except Exception as e:
+                logger_dp.exception(
+                    "Необработанное исключение в воркере пула: %r", e
+                )
+            finally:
+                self._in_flight -= 1
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+                queue.task_done()
+                async with self._changed:
+                    self._changed.notify_all()
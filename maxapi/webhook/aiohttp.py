@@ -5,6 +5,7 @@ from http import HTTPStatus
 from secrets import compare_digest
 from typing import TYPE_CHECKING, Any
 
+from ..exceptions.dispatcher import DispatcherOverloaded
 from ..loggers import logger_dp
 from .base import DEFAULT_PATH, BaseMaxWebhook
 
@@ -74,8 +75,15 @@ class AiohttpMaxWebhook(BaseMaxWebhook):
                         status=HTTPStatus.FORBIDDEN, text="Forbidden"
                     )
 
-            event_json: dict[str, Any] = await request.json()
-            await self._dispatch(event_json)
+            event_json = self._decode(await request.read())
+            try:
+                await self._dispatch(event_json)
+            except DispatcherOverloaded as e:
+                return web.json_response(
+                    {"ok": False},
+                    status=HTTPStatus.SERVICE_UNAVAILABLE,
+                    headers=self._overloaded_headers(e),
+                )
             return web.json_response({"ok": True}, status=HTTPStatus.OK)
 
         app.router.add_post(path, _webhook_handler)
@@ -8,15 +8,23 @@ __all__ = [
 ]
 
 import asyncio
+import math
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
 
+from ..client.codec import get_json_codec
+from ..exceptions.dispatcher import DispatcherOverloaded
 from ..loggers import logger_dp
-from ..methods.types.getted_updates import process_update_webhook
-from ..types.updates import UNKNOWN_UPDATE_DISCLAIMER
+from ..methods.types.getted_updates import (
+    parse_update,
+    process_update_webhook,
+)
+from ..types.updates import UNKNOWN_UPDATE_DISCLAIMER, UpdateUnion
+from ..utils.updates import enrich_event
 
 if TYPE_CHECKING:
     from ..bot import Bot
+    from ..client.codec import JsonCodec
     from ..dispatcher import Dispatcher
 
 DEFAULT_HOST = "0.0.0.0"  # noqa: S104
@@ -35,6 +43,9 @@ class BaseMaxWebhook(ABC):
     Опциональный ``secret`` используется для проверки заголовка
     ``X-Max-Bot-Api-Secret`` и должен совпадать со значением,
     переданным в :meth:`~maxapi.Bot.subscribe_webhook`.
+
+    Тело запроса разбирается ``json_codec`` — по умолчанию тем же
+    кодеком, что задан в ``bot.default_connection``.
     """
 
     def __init__(
@@ -43,10 +54,15 @@ class BaseMaxWebhook(ABC):
         bot: "Bot",
         *,
         secret: str | None = None,
+        json_codec: "JsonCodec | str | None" = None,
     ) -> None:
         self.dp = dp
         self.bot = bot
         self.secret = secret
+        if json_codec is None:
+            conn = getattr(bot, "default_connection", None)
+            json_codec = conn.json_codec if conn is not None else None
+        self.json_codec = get_json_codec(json_codec)
         if not self.secret:
             logger_dp.warning(
                 "Webhook запущен без secret. Передайте secret= в "
@@ -60,16 +76,37 @@ class BaseMaxWebhook(ABC):
         """Инициализировать диспетчер."""
         await self.dp.startup(self.bot)
 
+    @staticmethod
+    def _overloaded_headers(exc: DispatcherOverloaded) -> dict[str, str]:
+        """Заголовки ответа 503 на отклонённое событие."""
+        return {"Retry-After": str(math.ceil(exc.retry_after))}
+
+    def _decode(self, body: bytes) -> dict[str, Any]:
+        """Разобрать тело запроса кодеком вебхука."""
+        return self.json_codec.loads(body)
+
     async def _dispatch(self, event_json: dict[str, Any]) -> bool:
         """Распарсить и диспетчеризовать входящее обновление.
 
         Преобразует сырой JSON-payload в типизированный объект
         события и передаёт диспетчеру. При нераспознанном типе
         обновления логирует предупреждение и возвращает ``False``.
+
+        С ``dp.admission`` решение о приёме принимается по
+        провалидированному событию до запросов чата и участников:
+        они выполняются только для принятых событий.
+
+        Raises:
+            DispatcherOverloaded: Если ``dp.admission`` отклонил событие;
+                вебхук отвечает 503.
         """
-        event_object = await process_update_webhook(
-            event_json=event_json, bot=self.bot
-        )
+        admission = self.dp.admission
+        if admission is not None:
+            event_object = parse_update(event_json)
+        else:
+            event_object = await process_update_webhook(
+                event_json=event_json, bot=self.bot
+            )
 
         if event_object is None:
             msg = UNKNOWN_UPDATE_DISCLAIMER.format(
@@ -78,13 +115,29 @@ class BaseMaxWebhook(ABC):
             logger_dp.warning(msg)
             return False
 
-        if self.dp.use_create_task:
+        if admission is not None:
+            if not await admission.submit(
+                event_object, self._enrich_and_handle
+            ):
+                raise DispatcherOverloaded(
+                    str(event_object.update_type), admission.retry_after
+                )
+        elif self.dp.worker_pool is not None:
+            await self.dp.worker_pool.submit(
+                event_object.get_ids(), self.dp.handle, event_object
+            )
+        elif self.dp.use_create_task:
             asyncio.create_task(self.dp.handle(event_object))
         else:
             await self.dp.handle(event_object)
 
         return True
 
+    async def _enrich_and_handle(self, event_object: UpdateUnion) -> None:
+        """Дополнить принятое событие и передать его диспетчеру."""
+        await enrich_event(event_object=event_object, bot=self.bot)
+        await self.dp.handle(event_object)
+
     @abstractmethod
     def create_app(self, path: str = DEFAULT_PATH):
         """Создать и вернуть готовое к запуску веб-приложение."""
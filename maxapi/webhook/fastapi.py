@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
+from ..exceptions.dispatcher import DispatcherOverloaded
 from .base import DEFAULT_PATH, BaseMaxWebhook
 
 if TYPE_CHECKING:
@@ -11,6 +12,8 @@ if TYPE_CHECKING:
 
     from fastapi import FastAPI
 
+    from ..client.codec import JsonCodec
+
 __all__ = ["FastAPIMaxWebhook"]
 
 
@@ -78,6 +81,7 @@ class FastAPIMaxWebhook(BaseMaxWebhook):
         bot,
         *,
         secret: str | None = None,
+        json_codec: "JsonCodec | str | None" = None,
     ) -> None:
         try:
             import fastapi  # noqa: F401, PLC0415
@@ -87,7 +91,7 @@ class FastAPIMaxWebhook(BaseMaxWebhook):
                 "Run: pip install fastapi  or  pip install maxapi[fastapi]"
             ) from exc
 
-        super().__init__(dp, bot, secret=secret)
+        super().__init__(dp, bot, secret=secret, json_codec=json_codec)
 
     @asynccontextmanager
     async def lifespan(self, app: "FastAPI") -> "AsyncGenerator[None, None]":
@@ -114,8 +118,15 @@ class FastAPIMaxWebhook(BaseMaxWebhook):
         @app.post(path, dependencies=dependencies)
         async def _webhook_route(request: Request) -> JSONResponse:
             """Обработать обновление от MAX."""
-            event_json: dict[str, Any] = await request.json()
-            await self._dispatch(event_json)
+            event_json = self._decode(await request.body())
+            try:
+                await self._dispatch(event_json)
+            except DispatcherOverloaded as e:
+                return JSONResponse(
+                    content={"ok": False},
+                    status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                    headers=self._overloaded_headers(e),
+                )
             return JSONResponse(
                 content={"ok": True}, status_code=HTTPStatus.OK
             )
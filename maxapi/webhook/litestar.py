@@ -3,6 +3,7 @@
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
+from ..exceptions.dispatcher import DispatcherOverloaded
 from .base import DEFAULT_PATH, BaseMaxWebhook
 
 if TYPE_CHECKING:
@@ -90,6 +91,7 @@ class LitestarMaxWebhook(BaseMaxWebhook):
             )
         """
         from litestar import Request, post  # noqa: PLC0415
+        from litestar.exceptions import HTTPException  # noqa: PLC0415
 
         guards = (
             [_make_secret_guard(self.secret)]
@@ -98,12 +100,20 @@ class LitestarMaxWebhook(BaseMaxWebhook):
         )
 
         dispatch = self._dispatch
+        decode = self._decode
+        overloaded_headers = self._overloaded_headers
 
         @post(path, status_code=HTTPStatus.OK, guards=guards)
         async def _webhook_handler(request: Request) -> dict[str, Any]:
             """Принять обновление и передать диспетчеру."""
-            event_json: dict[str, Any] = await request.json()
-            await dispatch(event_json)
+            event_json = decode(await request.body())
+            try:
+                await dispatch(event_json)
+            except DispatcherOverloaded as e:
+                raise HTTPException(
+                    status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                    headers=overloaded_headers(e),
+                ) from e
             return {"ok": True}
 
         return _webhook_handler
@@ -35,6 +35,7 @@ except ImportError:
 from maxapi import Bot, Dispatcher
 from maxapi.client.default import DefaultConnectionProperties
 from maxapi.enums.update import UpdateType
+from maxapi.types.input_media import clear_mime_cache
 
 pytest_plugins = ["tests.fixtures.updates"]
 
@@ -258,6 +259,14 @@ def preserve_env_vars():
         pass
 
 
+@pytest.fixture(autouse=True)
+def clear_mime_caches():
+    """Сбрасывает кеши MIME-типов: тесты подменяют puremagic."""
+    clear_mime_cache()
+    yield
+    clear_mime_cache()
+
+
 def pytest_collection_modifyitems(config, items):
     """Автоматически пропускает тесты с маркером integration,
     если не задан токен.
@@ -0,0 +1,273 @@
+"""Тесты контроля нагрузки диспетчера."""
+
+import asyncio
+from http import HTTPStatus
+from time import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import maxapi.webhook.base as integration_module
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from maxapi import Dispatcher
+from maxapi.client import ClientMetrics
+from maxapi.enums.update import UpdateType
+from maxapi.utils import (
+    AdmissionController,
+    AdmissionDecision,
+    KeyedWorkerPool,
+    PriorityDropPolicy,
+    RejectPolicy,
+)
+from maxapi.webhook.aiohttp import AiohttpMaxWebhook
+
+
+def _event(update_type=UpdateType.MESSAGE_CREATED, age=0.0):
+    event = Mock(update_type=update_type)
+    event.timestamp = int((time() - age) * 1000)
+    event.get_ids.return_value = (1, 1)
+    return event
+
+
+class DummyBot:
+    pass
+
+
+class _Gate:
+    """Обработчик, который ждёт разрешения и запоминает события."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.handled = []
+
+    async def __call__(self, event):
+        await self.release.wait()
+        self.handled.append(event)
+
+
+class TestAdmissionController:
+    async def test_limits_in_flight_and_queues(self):
+        controller = AdmissionController(max_in_flight=1, max_queued=2)
+        gate = _Gate()
+        events = [_event() for _ in range(3)]
+
+        for event in events:
+            assert await controller.submit(event, gate)
+        await asyncio.sleep(0)
+
+        assert (controller.in_flight, controller.queued) == (1, 2)
+
+        gate.release.set()
+        await controller.join()
+
+        assert gate.handled == events
+        assert controller.decisions == {
+            (AdmissionDecision.ADMITTED, "message_created"): 3,
+            (AdmissionDecision.QUEUED, "message_created"): 2,
+        }
+
+    async def test_drop_oldest_by_default(self):
+        controller = AdmissionController(max_in_flight=1, max_queued=1)
+        gate = _Gate()
+        first, oldest, newest = _event(), _event(), _event()
+
+        for event in (first, oldest, newest):
+            assert await controller.submit(event, gate)
+        gate.release.set()
+        await controller.join()
+
+        assert gate.handled == [first, newest]
+        created = str(UpdateType.MESSAGE_CREATED)
+        assert controller.decisions[AdmissionDecision.SHED, created] == 1
+        # сброшенное из очереди событие не считается запущенным
+        assert controller.decisions[AdmissionDecision.ADMITTED, created] == 2
+
+    async def test_priority_policy_sheds_edits_first(self):
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=1, policy=PriorityDropPolicy()
+        )
+        gate = _Gate()
+        running = _event()
+        edited = _event(UpdateType.MESSAGE_EDITED)
+        callback = _event(UpdateType.MESSAGE_CALLBACK)
+        late_edit = _event(UpdateType.MESSAGE_EDITED)
+
+        for event in (running, edited, callback, late_edit):
+            assert await controller.submit(event, gate)
+        gate.release.set()
+        await controller.join()
+
+        assert gate.handled == [running, callback]
+        assert (
+            controller.decisions[AdmissionDecision.SHED, "message_edited"] == 2
+        )
+
+    async def test_reject_policy(self):
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=0, policy=RejectPolicy()
+        )
+        gate = _Gate()
+
+        assert await controller.submit(_event(), gate)
+        assert not await controller.submit(_event(), gate)
+
+        waiting = asyncio.create_task(
+            controller.submit(_event(), gate, wait=True)
+        )
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        gate.release.set()
+        assert await waiting
+        await controller.join()
+
+        assert len(gate.handled) == 2
+        assert (
+            controller.decisions[AdmissionDecision.REJECTED, "message_created"]
+            == 1
+        )
+
+    async def test_expired_events_dropped(self):
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=1, max_age=10
+        )
+        gate = _Gate()
+
+        assert await controller.submit(_event(age=60), gate)
+        await controller.submit(_event(), gate)
+        queued = _event()
+        await controller.submit(queued, gate)
+        # событие успело устареть в очереди
+        queued.timestamp -= 60_000
+        gate.release.set()
+        await controller.join()
+
+        assert len(gate.handled) == 1
+        assert (
+            controller.decisions[AdmissionDecision.EXPIRED, "message_created"]
+            == 2
+        )
+
+    async def test_decisions_exported_to_metrics(self):
+        metrics = ClientMetrics()
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=0, metrics=metrics
+        )
+        gate = _Gate()
+        gate.release.set()
+
+        await controller.submit(_event(), gate)
+        await controller.submit(_event(UpdateType.MESSAGE_EDITED), gate)
+        await controller.join()
+
+        assert metrics.events == {
+            ("message_created", "admitted"): 1,
+            ("message_edited", "shed"): 1,
+        }
+        assert (
+            'maxapi_dispatcher_events_total{update_type="message_edited",'
+            'decision="shed"} 1'
+        ) in metrics.render_prometheus()
+
+    async def test_worker_pool_keeps_per_key_order(self):
+        pool = KeyedWorkerPool(2)
+        controller = AdmissionController(max_in_flight=4, worker_pool=pool)
+        active = set()
+        log = []
+
+        async def handler(event):
+            key = event.get_ids()
+            assert key not in active
+            active.add(key)
+            await asyncio.sleep(0.01)
+            log.append(event)
+            active.discard(key)
+
+        events = [_event() for _ in range(3)]
+        for event in events:
+            assert await controller.submit(event, handler)
+        await asyncio.sleep(0)
+
+        assert controller.in_flight == 3
+
+        await controller.join()
+        await pool.close()
+
+        assert log == events
+        assert controller.in_flight == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"max_in_flight": 0}, {"max_queued": -1}, {"max_age": 0}],
+    )
+    def test_invalid_limits(self, kwargs):
+        with pytest.raises(ValueError, match=next(iter(kwargs))):
+            AdmissionController(**kwargs)
+
+
+class TestDispatcherAdmission:
+    async def test_polling_submits_with_wait(self, bot):
+        admission = AdmissionController()
+        admission.submit = AsyncMock(return_value=True)
+        dp = Dispatcher(admission=admission)
+        dp.bot = bot
+        event = _event()
+
+        with patch(
+            "maxapi.dispatcher.process_update_request",
+            new=AsyncMock(return_value=[event]),
+        ):
+            await dp._dispatch_fetched_events(
+                {"marker": 1}, current_timestamp=0, skip_updates=False
+            )
+
+        admission.submit.assert_awaited_once_with(event, dp.handle, wait=True)
+
+    def test_dispatcher_worker_pool_shared(self):
+        pool = KeyedWorkerPool()
+        admission = AdmissionController()
+
+        Dispatcher(worker_pool=pool, admission=admission)
+
+        assert admission.worker_pool is pool
+
+    async def test_webhook_answers_503_when_rejected(self, monkeypatch):
+        admission = AdmissionController(retry_after=2.5)
+        admission.submit = AsyncMock(return_value=False)
+        dp = Dispatcher(admission=admission)
+        dp.startup = AsyncMock()
+        enrich = AsyncMock()
+
+        monkeypatch.setattr(
+            integration_module, "parse_update", lambda event_json: _event()
+        )
+        monkeypatch.setattr(integration_module, "enrich_event", enrich)
+        wh = AiohttpMaxWebhook(dp=dp, bot=DummyBot())
+
+        async with TestClient(TestServer(wh.create_app(path="/"))) as client:
+            resp = await client.post("/", json={})
+
+            assert resp.status == HTTPStatus.SERVICE_UNAVAILABLE
+            assert resp.headers["Retry-After"] == "3"
+        enrich.assert_not_called()
+
+    async def test_webhook_enriches_only_admitted_events(self, monkeypatch):
+        admission = AdmissionController(max_in_flight=1, max_queued=0)
+        dp = Dispatcher(admission=admission)
+        dp.handle = AsyncMock()
+        bot = DummyBot()
+        wh = AiohttpMaxWebhook(dp=dp, bot=bot)
+        enrich = AsyncMock()
+        admitted, shed = _event(), _event()
+        parsed = iter([admitted, shed])
+
+        monkeypatch.setattr(
+            integration_module, "parse_update", lambda event_json: next(parsed)
+        )
+        monkeypatch.setattr(integration_module, "enrich_event", enrich)
+
+        assert await wh._dispatch({})
+        assert await wh._dispatch({})
+        await admission.join()
+
+        enrich.assert_awaited_once_with(event_object=admitted, bot=bot)
+        dp.handle.assert_awaited_once_with(admitted)
@@ -0,0 +1,240 @@
+"""Тесты массовой рассылки."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from maxapi import Bot
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions import CircuitBreakerOpen, MaxConnection
+from maxapi.exceptions.max import MaxApiError
+from maxapi.types.attachments.upload import AttachmentPayload, AttachmentUpload
+from maxapi.types.input_media import InputMediaBuffer
+from maxapi.utils import Broadcaster, BroadcastStatus
+
+
+@pytest.fixture
+def bot(mock_bot_token):
+    return Bot(token=mock_bot_token)
+
+
+def _fake_request(errors=None):
+    """Запрос, падающий с errors[target] (списком — по очереди)."""
+
+    errors = {k: list(v) for k, v in (errors or {}).items()}
+    calls = []
+
+    async def request(self, **kwargs):
+        target = kwargs["params"].get("chat_id") or kwargs["params"].get(
+            "user_id"
+        )
+        calls.append(kwargs)
+        pending = errors.get(target)
+        if pending:
+            raise pending.pop(0)
+        return {"message": {}}
+
+    return request, calls
+
+
+class TestBroadcaster:
+    async def test_body_serialized_once(self, bot):
+        request, calls = _fake_request()
+
+        with patch.object(BaseConnection, "request", new=request):
+            stats = await Broadcaster(bot, text="hi", notify=False).run(
+                range(1, 6)
+            )
+
+        assert stats.sent == 5
+        assert {id(call["data"]) for call in calls} == {id(calls[0]["data"])}
+        assert json.loads(calls[0]["data"]) == {
+            "text": "hi",
+            "attachments": [],
+            "notify": False,
+        }
+        assert sorted(call["params"]["chat_id"] for call in calls) == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
+
+    async def test_attachments_uploaded_once(self, bot):
+        upload = AttachmentUpload(
+            type=UploadType.IMAGE, payload=AttachmentPayload(token="t")
+        )
+        request, calls = _fake_request()
+        batch = AsyncMock(return_value=[upload])
+
+        with (
+            patch.object(BaseConnection, "request", new=request),
+            patch(
+                "maxapi.methods.send_message.process_input_media_batch",
+                new=batch,
+            ),
+            patch("maxapi.utils.broadcast.asyncio.sleep", new=AsyncMock()),
+        ):
+            await Broadcaster(
+                bot,
+                attachments=[InputMediaBuffer(b"i", type=UploadType.IMAGE)],
+            ).run([1, 2, 3], recipient="user_id")
+
+        batch.assert_awaited_once()
+        assert len(calls) == 3
+        assert json.loads(calls[0]["data"])["attachments"][0]["type"] == (
+            "image"
+        )
+
+    async def test_errors_classified(self, bot):
+        request, _ = _fake_request(
+            {
+                2: [MaxApiError(code=403, raw={"code": "chat.denied"})],
+                3: [MaxApiError(code=404, raw={"code": "not.found"})],
+                4: [MaxApiError(code=400, raw={"code": "proto.payload"})],
+                5: [MaxConnection("down"), MaxApiError(code=503, raw={})],
+            }
+        )
+        results = {}
+
+        with (
+            patch.object(BaseConnection, "request", new=request),
+            patch("maxapi.utils.broadcast.asyncio.sleep", new=AsyncMock()),
+        ):
+            stats = await Broadcaster(
+                bot,
+                text="hi",
+                on_result=lambda t, s, e: results.__setitem__(t, s),
+            ).run([1, 2, 3, 4, 5])
+
+        assert results == {
+            1: BroadcastStatus.SENT,
+            2: BroadcastStatus.BLOCKED,
+            3: BroadcastStatus.NOT_FOUND,
+            4: BroadcastStatus.FAILED,
+            5: BroadcastStatus.SENT,
+        }
+        assert (stats.sent, stats.blocked, stats.not_found) == (2, 1, 1)
+        assert (stats.failed, stats.retries) == (1, 2)
+
+    async def test_retries_exhausted(self, bot):
+        request, calls = _fake_request({1: [MaxConnection("down")] * 5})
+        sleep = AsyncMock()
+
+        with (
+            patch.object(BaseConnection, "request", new=request),
+            patch("maxapi.utils.broadcast.asyncio.sleep", new=sleep),
+        ):
+            stats = await Broadcaster(
+                bot, text="hi", max_attempts=3, retry_delay=0.5
+            ).run([1])
+
+        assert stats.failed == 1
+        assert len(calls) == 3
+        assert [c.args[0] for c in sleep.await_args_list] == [0.5, 1.0]
+
+    def test_circuit_breaker_delay(self, bot):
+        broadcaster = Broadcaster(bot, retry_delay=1)
+
+        error = CircuitBreakerOpen(key="k", retry_after=7)
+
+        assert broadcaster.classify(error) is BroadcastStatus.RETRY
+        assert broadcaster._retry_delay(error, 0) == 7
+
+    async def test_concurrency_bounded(self, bot):
+        active = 0
+        peak = 0
+
+        async def request(self, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+        with patch.object(BaseConnection, "request", new=request):
+            stats = await Broadcaster(bot, text="hi", concurrency=3).run(
+                range(1, 31)
+            )
+
+        assert stats.sent == 30
+        assert peak == 3
+
+    async def test_async_targets_and_progress(self, bot):
+        request, _ = _fake_request()
+        snapshots = []
+
+        async def targets():
+            for target in range(1, 6):
+                yield target
+
+        with patch.object(BaseConnection, "request", new=request):
+            await Broadcaster(
+                bot,
+                text="hi",
+                progress_every=2,
+                on_progress=lambda s: snapshots.append(s.processed),
+            ).run(targets())
+
+        assert snapshots == [2, 4, 5]
+
+    async def test_stop(self, bot):
+        broadcaster = Broadcaster(bot, text="hi", concurrency=1)
+
+        async def request(self, **kwargs):
+            if kwargs["params"]["chat_id"] == 2:
+                broadcaster.stop()
+
+        with patch.object(BaseConnection, "request", new=request):
+            stats = await broadcaster.run(range(1, 10))
+
+        assert stats.sent == 2
+
+    def test_invalid_params(self, bot):
+        with pytest.raises(ValueError, match="concurrency"):
+            Broadcaster(bot, concurrency=0)
+
+
+class TestCheckpoint:
+    async def test_resume_skips_final_targets(self, bot, tmp_path):
+        checkpoint = tmp_path / "run.jsonl"
+        request, _ = _fake_request(
+            {
+                2: [MaxApiError(code=403, raw={})],
+                3: [MaxApiError(code=400, raw={})],
+            }
+        )
+        with patch.object(BaseConnection, "request", new=request):
+            first = await Broadcaster(
+                bot, text="hi", checkpoint=checkpoint
+            ).run([1, 2, 3])
+        assert (first.sent, first.blocked, first.failed) == (1, 1, 1)
+
+        # оборванная последняя строка не мешает продолжению
+        with checkpoint.open("a") as f:
+            f.write('{"target": 4, "sta')
+
+        request, calls = _fake_request()
+        with patch.object(BaseConnection, "request", new=request):
+            second = await Broadcaster(
+                bot, text="hi", checkpoint=checkpoint
+            ).run([1, 2, 3, 4])
+
+        assert second.skipped == 2
+        assert sorted(c["params"]["chat_id"] for c in calls) == [3, 4]
+
+
+async def test_bot_broadcast_resolves_defaults(mock_bot_token):
+    bot = Bot(token=mock_bot_token, notify=False, disable_link_preview=True)
+    request, calls = _fake_request()
+
+    with patch.object(BaseConnection, "request", new=request):
+        stats = await bot.broadcast([7], text="hi", recipient="user_id")
+
+    assert stats.sent == 1
+    assert calls[0]["params"]["user_id"] == 7
+    assert calls[0]["params"]["disable_link_preview"] == "true"
+    assert json.loads(calls[0]["data"])["notify"] is False
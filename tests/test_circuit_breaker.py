@@ -0,0 +1,165 @@
+"""Тесты circuit breaker для запросов к API."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientConnectionError
+from maxapi import Bot
+from maxapi.client import (
+    CircuitBreaker,
+    CircuitState,
+    DefaultConnectionProperties,
+)
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.exceptions import CircuitBreakerOpen, MaxConnection
+
+KEY = "api.example/messages"
+
+
+def _tick(values):
+    it = iter(values)
+    return patch(
+        "maxapi.client.circuit_breaker.monotonic", side_effect=lambda: next(it)
+    )
+
+
+def _fail(breaker, key=KEY, times=1):
+    for _ in range(times):
+        breaker.before_request(key)
+        breaker.record(key, ok=False)
+
+
+class TestCircuitBreakerStates:
+    def test_opens_after_failure_rate(self):
+        breaker = CircuitBreaker(min_requests=4, failure_threshold=0.5)
+
+        breaker.before_request(KEY)
+        breaker.record(KEY, ok=True)
+        _fail(breaker, times=2)
+        assert breaker.state(KEY) is CircuitState.CLOSED
+
+        _fail(breaker)
+        assert breaker.state(KEY) is CircuitState.OPEN
+        with pytest.raises(CircuitBreakerOpen) as exc_info:
+            breaker.before_request(KEY)
+        assert isinstance(exc_info.value, MaxConnection)
+        assert exc_info.value.key == KEY
+
+    def test_neutral_outcomes_not_counted(self):
+        breaker = CircuitBreaker(min_requests=1)
+
+        breaker.before_request(KEY)
+        breaker.record(KEY, ok=None)
+
+        assert breaker.state(KEY) is CircuitState.CLOSED
+
+    def test_old_outcomes_leave_window(self):
+        breaker = CircuitBreaker(min_requests=2, window=10)
+
+        with _tick([0, 20]):
+            _fail(breaker, times=2)
+
+        assert breaker.state(KEY) is CircuitState.CLOSED
+
+    def test_half_open_probe_closes(self):
+        breaker = CircuitBreaker(
+            min_requests=1, open_timeout=5, half_open_max_calls=1
+        )
+        with _tick([0]):
+            _fail(breaker)
+
+        with patch("maxapi.client.circuit_breaker.monotonic", return_value=6):
+            assert breaker.state(KEY) is CircuitState.HALF_OPEN
+            breaker.before_request(KEY)
+            with pytest.raises(CircuitBreakerOpen):
+                breaker.before_request(KEY)
+            breaker.record(KEY, ok=True)
+
+        assert breaker.state(KEY) is CircuitState.CLOSED
+        assert breaker.open_circuits == []
+
+    def test_half_open_probe_failure_reopens(self):
+        breaker = CircuitBreaker(min_requests=1, open_timeout=5)
+        with _tick([0]):
+            _fail(breaker)
+
+        with patch("maxapi.client.circuit_breaker.monotonic", return_value=6):
+            _fail(breaker)
+            with pytest.raises(CircuitBreakerOpen) as exc_info:
+                breaker.before_request(KEY)
+
+        assert exc_info.value.retry_after == pytest.approx(5)
+
+    def test_listeners_receive_transitions(self):
+        breaker = CircuitBreaker(min_requests=1)
+        events = []
+        breaker.add_listener(lambda *args: events.append(args))
+        breaker.add_listener(MagicMock(side_effect=RuntimeError))
+
+        _fail(breaker)
+
+        assert events == [(KEY, CircuitState.CLOSED, CircuitState.OPEN)]
+
+    def test_keys(self):
+        per_path = CircuitBreaker()
+        per_host = CircuitBreaker(per_path=False)
+        url = "https://platform-api2.max.ru"
+
+        assert per_path.key_for(url, "/chats/1/members") == (
+            "platform-api2.max.ru/chats"
+        )
+        assert per_host.key_for(url, "/chats/1") == "platform-api2.max.ru"
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError, match="failure_threshold"):
+            CircuitBreaker(failure_threshold=0)
+
+
+class TestRequestIntegration:
+    @pytest.fixture
+    def breaker_bot(self, mock_bot_token):
+        breaker = CircuitBreaker(min_requests=2, open_timeout=60)
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                max_retries=1,
+                retry_backoff_factor=0,
+                circuit_breaker=breaker,
+            ),
+        )
+        session = MagicMock()
+        session.closed = False
+        session.request = AsyncMock(side_effect=ClientConnectionError("down"))
+        bot.session = session
+        base = BaseConnection()
+        base.bot = bot
+        return base, breaker, session
+
+    async def test_fails_fast_when_open(self, breaker_bot):
+        base, breaker, session = breaker_bot
+
+        with pytest.raises(MaxConnection):
+            await base.request(method=HTTPMethod.GET, path="/me")
+        assert session.request.await_count == 2
+        assert breaker.open_circuits == ["platform-api2.max.ru/me"]
+
+        with pytest.raises(CircuitBreakerOpen):
+            await base.request(method=HTTPMethod.GET, path="/me")
+        assert session.request.await_count == 2
+
+    async def test_other_paths_unaffected(self, breaker_bot):
+        base, _, session = breaker_bot
+        with pytest.raises(MaxConnection):
+            await base.request(method=HTTPMethod.GET, path="/me")
+
+        response = MagicMock()
+        response.status = 200
+        response.ok = True
+        response.read = AsyncMock(return_value=b'{"ok": true}')
+        session.request = AsyncMock(return_value=response)
+
+        result = await base.request(
+            method=HTTPMethod.GET, path="/chats", is_return_raw=True
+        )
+        assert result == {"ok": True}
@@ -1,6 +1,18 @@
-"""Тесты SSL-настроек aiohttp-клиента."""
+"""Тесты SSL-настроек и пула соединений aiohttp-клиента."""
 
-from maxapi.client.ssl import connector_kwargs, with_default_connector
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientConnectionError, TCPConnector
+from maxapi import Bot
+from maxapi.client import DefaultConnectionProperties
+from maxapi.client.ssl import (
+    create_default_connector,
+    create_default_ssl_context,
+    default_ssl_context,
+    with_default_connector,
+)
 
 
 def test_with_default_connector_preserves_custom_connector():
@@ -12,12 +24,114 @@ def test_with_default_connector_preserves_custom_connector():
     assert result == {"connector": connector}
 
 
-def test_connector_kwargs_does_not_leak_session_kwargs():
-    """Для временной сессии возвращается только connector."""
-    connector = object()
+def test_default_ssl_context_is_cached():
+    """CA-бандл загружается один раз на процесс."""
+    default_ssl_context.cache_clear()
+    try:
+        with patch(
+            "maxapi.client.ssl.create_default_ssl_context",
+            wraps=create_default_ssl_context,
+        ) as create:
+            first = default_ssl_context()
+            second = default_ssl_context()
+
+        assert first is second
+        create.assert_called_once()
+    finally:
+        default_ssl_context.cache_clear()
 
-    result = connector_kwargs(
-        {"connector": connector, "raise_for_status": True}
+
+async def test_default_connector_uses_pool_options():
+    """Параметры пула передаются в TCPConnector."""
+    conn = DefaultConnectionProperties(
+        limit=20, limit_per_host=5, ttl_dns_cache=120, keepalive_timeout=45
     )
 
-    assert result == {"connector": connector}
+    connector = create_default_connector(conn.connector_options)
+    try:
+        assert connector.limit == 20
+        assert connector.limit_per_host == 5
+        assert connector._cached_hosts._ttl == 120
+        assert connector._keepalive_timeout == 45
+    finally:
+        await connector.close()
+
+
+async def test_default_connector_keeps_aiohttp_defaults():
+    """По умолчанию TTL DNS-кеша и keep-alive совпадают с aiohttp."""
+    conn = DefaultConnectionProperties()
+
+    connector = create_default_connector(conn.connector_options)
+    plain = TCPConnector()
+    try:
+        assert connector._cached_hosts._ttl == plain._cached_hosts._ttl
+        assert connector._keepalive_timeout == plain._keepalive_timeout
+    finally:
+        await connector.close()
+        await plain.close()
+
+
+async def test_session_accept_encoding_identity(mock_bot_token):
+    """accept_compressed=False отключает сжатые ответы."""
+    bot = Bot(
+        token=mock_bot_token,
+        default_connection=DefaultConnectionProperties(
+            accept_compressed=False
+        ),
+    )
+    session = await bot.ensure_session()
+    try:
+        assert session.headers["Accept-Encoding"] == "identity"
+        assert session.connector.limit_per_host == 0
+    finally:
+        await bot.close_session()
+
+
+def test_warm_up_connections_validation():
+    with pytest.raises(ValueError, match="warm_up_connections"):
+        DefaultConnectionProperties(warm_up_connections=-1)
+
+
+class TestWarmUp:
+    @staticmethod
+    def _session(fail_every=0):
+        calls = []
+
+        @asynccontextmanager
+        async def head(url):
+            calls.append(url)
+            if fail_every and len(calls) % fail_every == 0:
+                raise ClientConnectionError("refused")
+            response = MagicMock()
+            response.read = AsyncMock()
+            yield response
+
+        session = MagicMock()
+        session.closed = False
+        session.head = head
+        return session, calls
+
+    async def test_disabled_by_default(self, mock_bot_token):
+        bot = Bot(token=mock_bot_token)
+        bot.session, calls = self._session()
+
+        assert await bot.warm_up() == 0
+        assert calls == []
+
+    async def test_opens_configured_connections(self, mock_bot_token):
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                warm_up_connections=3
+            ),
+        )
+        bot.session, calls = self._session()
+
+        assert await bot.warm_up() == 3
+        assert calls == ["/", "/", "/"]
+
+    async def test_errors_are_swallowed(self, mock_bot_token):
+        bot = Bot(token=mock_bot_token)
+        bot.session, _ = self._session(fail_every=2)
+
+        assert await bot.warm_up(connections=4) == 2
@@ -473,19 +473,19 @@ class TestGetListAdminChatMarkerIsNotNone:
 
 
 # ===========================================================================
-# connection/base.py — temp ClientSession + mimetypes (2 lines)
+# connection/base.py — upload session + mimetypes (2 lines)
 # ===========================================================================
 
 
 class TestBaseConnectionUploadFallback:
-    """upload_file / upload_file_buffer используют временный ClientSession,
-    когда сессия отсутствует.
+    """upload_file / upload_file_buffer используют сессию загрузок бота,
+    независимо от основной сессии.
     """
 
-    async def test_upload_file_uses_temp_session_when_session_is_none(
+    async def test_upload_file_uses_upload_session_when_session_is_none(
         self, bot, tmp_path
     ):
-        """upload_file откатывается к новому ClientSession,
+        """upload_file создаёт сессию загрузок,
         когда bot.session=None.
         """
         from maxapi.connection.base import BaseConnection
@@ -497,7 +497,7 @@ class TestBaseConnectionUploadFallback:
 
         conn = BaseConnection()
         conn.bot = bot
-        bot.session = None  # force the else-branch
+        bot.session = None
 
         mock_response = AsyncMock()
         mock_response.text = AsyncMock(return_value='{"token":"abc"}')
@@ -514,7 +514,7 @@ class TestBaseConnectionUploadFallback:
         mock_session_instance.__aexit__ = AsyncMock(return_value=False)
 
         with patch(
-            "maxapi.connection.base.ClientSession",
+            "maxapi.bot.ClientSession",
             return_value=mock_session_instance,
         ):
             result = await conn.upload_file(
@@ -547,15 +547,17 @@ class TestBaseConnectionUploadFallback:
         mock_context.__aenter__.return_value = mock_response
         mock_context.__aexit__.return_value = None
 
-        bot.session = MagicMock()
-        bot.session.closed = False
-        bot.session.post = MagicMock(return_value=mock_context)
+        bot.upload_session = MagicMock()
+        bot.upload_session.closed = False
+        bot.upload_session.post = MagicMock(return_value=mock_context)
 
         fake_match = MagicMock()
         fake_match.mime_type = "image/png"
 
         with (
-            patch("maxapi.connection.base.puremagic.magic_string") as mock_pm,
+            patch(
+                "maxapi.types.input_media.puremagic.magic_string"
+            ) as mock_pm,
             patch(
                 "maxapi.connection.base.mimetypes.guess_extension"
             ) as mock_ge,
@@ -574,17 +576,17 @@ class TestBaseConnectionUploadFallback:
 
         assert result == '{"token":"xyz"}'
 
-    async def test_upload_file_buffer_uses_temp_session_when_session_is_none(
+    async def test_upload_file_buffer_uses_upload_session_when_session_is_none(
         self, bot
     ):
-        """upload_file_buffer falls back to a new ClientSession
-        when bot.session=None."""
+        """upload_file_buffer создаёт сессию загрузок,
+        когда bot.session=None."""
         from maxapi.connection.base import BaseConnection
         from maxapi.enums.upload_type import UploadType
 
         conn = BaseConnection()
         conn.bot = bot
-        bot.session = None  # force the else-branch
+        bot.session = None
 
         some_buffer = b"\x00" * 32
 
@@ -603,7 +605,7 @@ class TestBaseConnectionUploadFallback:
         mock_session_instance.__aexit__ = AsyncMock(return_value=False)
 
         with patch(
-            "maxapi.connection.base.ClientSession",
+            "maxapi.bot.ClientSession",
             return_value=mock_session_instance,
         ):
             result = await conn.upload_file_buffer(
@@ -639,12 +641,12 @@ class TestBaseConnectionUploadFallback:
         mock_context.__aenter__.return_value = mock_response
         mock_context.__aexit__.return_value = None
 
-        bot.session = MagicMock()
-        bot.session.closed = False
-        bot.session.post = MagicMock(return_value=mock_context)
+        bot.upload_session = MagicMock()
+        bot.upload_session.closed = False
+        bot.upload_session.post = MagicMock(return_value=mock_context)
 
         with patch(
-            "maxapi.connection.base.puremagic.magic_string",
+            "maxapi.types.input_media.puremagic.magic_string",
             side_effect=PureError("Could not identify file"),
         ):
             result = await conn.upload_file_buffer(
@@ -655,8 +657,8 @@ class TestBaseConnectionUploadFallback:
             )
 
         assert result == '{"token":"txt"}'
-        bot.session.post.assert_called_once()
-        form = bot.session.post.call_args.kwargs["data"]
+        bot.upload_session.post.assert_called_once()
+        form = bot.upload_session.post.call_args.kwargs["data"]
         # FormData хранит поля в ._fields как кортежи:
         # (MultiDict с name/filename, заголовки dict, значение bytes).
         field = next(f for f in form._fields if f[0].get("name") == "data")
@@ -0,0 +1,179 @@
+"""Тесты дедлайнов запросов и таймаутов по эндпоинтам."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientConnectionError, ClientTimeout
+from maxapi import Bot
+from maxapi.client import DefaultConnectionProperties, deadline_scope
+from maxapi.client.deadline import check_deadline, time_left
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.api_path import ApiPath
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions import DeadlineExceeded, MaxConnection
+from maxapi.exceptions.max import MaxApiError
+from maxapi.methods.send_message import SendMessage
+from maxapi.types.attachments.upload import AttachmentPayload, AttachmentUpload
+from maxapi.types.input_media import InputMediaBuffer
+
+
+def _ok_response():
+    response = MagicMock()
+    response.status = 200
+    response.ok = True
+    response.read = AsyncMock(return_value=b'{"ok": true}')
+    return response
+
+
+def _make_base(mock_bot_token, **conn_kwargs):
+    bot = Bot(
+        token=mock_bot_token,
+        default_connection=DefaultConnectionProperties(**conn_kwargs),
+    )
+    session = MagicMock()
+    session.closed = False
+    session.request = AsyncMock(return_value=_ok_response())
+    bot.session = session
+    base = BaseConnection()
+    base.bot = bot
+    return base, session
+
+
+class TestTimeoutProfiles:
+    def test_default_timeout_without_profiles(self):
+        conn = DefaultConnectionProperties(timeout=30)
+
+        assert conn.timeout_for(HTTPMethod.GET, "/me") is conn.timeout
+
+    def test_method_profile_has_priority(self):
+        conn = DefaultConnectionProperties(
+            timeout=30,
+            path_timeouts={
+                ApiPath.CHATS: 10,
+                (HTTPMethod.POST, ApiPath.CHATS): 3,
+            },
+        )
+
+        assert conn.timeout_for(HTTPMethod.GET, "/chats/1").total == 10
+        assert conn.timeout_for("post", "/chats/1/members").total == 3
+        assert conn.timeout_for(HTTPMethod.GET, "/me").total == 30
+
+    def test_invalid_profile(self):
+        with pytest.raises(ValueError, match="path_timeouts"):
+            DefaultConnectionProperties(path_timeouts={"/me": 0})
+
+    async def test_profile_passed_to_session(self, mock_bot_token):
+        base, session = _make_base(
+            mock_bot_token, path_timeouts={ApiPath.ANSWERS: 5}
+        )
+
+        await base.request(
+            method=HTTPMethod.POST, path=ApiPath.ANSWERS, is_return_raw=True
+        )
+        await base.request(
+            method=HTTPMethod.GET, path=ApiPath.ME, is_return_raw=True
+        )
+
+        first, second = session.request.await_args_list
+        assert first.kwargs["timeout"].total == 5
+        assert "timeout" not in second.kwargs
+
+
+class TestDeadlineScope:
+    def test_nested_scope_cannot_extend(self):
+        assert time_left() is None
+
+        with deadline_scope(1.0) as outer, deadline_scope(10.0) as inner:
+            assert inner == outer
+            assert 0 < time_left() <= 1.0
+
+        assert time_left() is None
+
+    def test_none_keeps_current(self):
+        with deadline_scope(5.0) as outer, deadline_scope(None) as inner:
+            assert inner == outer
+
+    def test_check_deadline(self):
+        with deadline_scope(0), pytest.raises(DeadlineExceeded) as exc_info:
+            check_deadline("GET /me")
+
+        assert isinstance(exc_info.value, TimeoutError)
+
+
+class TestRequestDeadline:
+    async def test_expired_deadline_fails_before_request(self, mock_bot_token):
+        base, session = _make_base(mock_bot_token)
+
+        with pytest.raises(DeadlineExceeded):
+            await base.request(method=HTTPMethod.GET, path="/me", deadline=0)
+        session.request.assert_not_awaited()
+
+    async def test_timeout_clipped_to_deadline(self, mock_bot_token):
+        base, session = _make_base(mock_bot_token, timeout=30)
+
+        await base.request(
+            method=HTTPMethod.GET, path="/me", is_return_raw=True, deadline=2
+        )
+
+        timeout = session.request.await_args.kwargs["timeout"]
+        assert isinstance(timeout, ClientTimeout)
+        assert 0 < timeout.total <= 2
+
+    async def test_retries_stop_at_deadline(self, mock_bot_token):
+        base, session = _make_base(
+            mock_bot_token, max_retries=10, retry_backoff_factor=10
+        )
+        session.request = AsyncMock(side_effect=ClientConnectionError("down"))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(DeadlineExceeded):
+            await base.request(method=HTTPMethod.GET, path="/me", deadline=0.2)
+
+        assert loop.time() - started < 1
+        assert session.request.await_count < 11
+
+    async def test_without_deadline_errors_unchanged(self, mock_bot_token):
+        base, session = _make_base(
+            mock_bot_token, max_retries=0, retry_backoff_factor=0
+        )
+        session.request = AsyncMock(side_effect=ClientConnectionError("down"))
+
+        with pytest.raises(MaxConnection):
+            await base.request(method=HTTPMethod.GET, path="/me")
+
+
+async def test_send_message_not_ready_respects_deadline(mock_bot_token):
+    bot = Bot(
+        token=mock_bot_token,
+        after_input_media_delay=10,
+        after_upload_retry_delay=10,
+    )
+    upload = AttachmentUpload(
+        type=UploadType.VIDEO, payload=AttachmentPayload(token="t")
+    )
+    not_ready = MaxApiError(code=400, raw={"code": "attachment.not.ready"})
+    sleep = AsyncMock()
+
+    with (
+        patch(
+            "maxapi.methods.send_message.process_input_media_batch",
+            new=AsyncMock(return_value=[upload]),
+        ),
+        patch.object(
+            BaseConnection, "request", new=AsyncMock(side_effect=not_ready)
+        ),
+        patch("maxapi.methods.send_message.asyncio.sleep", new=sleep),
+        pytest.raises(DeadlineExceeded),
+    ):
+        await SendMessage(
+            bot=bot,
+            chat_id=1,
+            attachments=[InputMediaBuffer(b"v", type=UploadType.VIDEO)],
+            deadline=1,
+        ).fetch()
+
+    # начальная пауза не поместилась в дедлайн, retry не ждали
+    sleep.assert_awaited_once_with(0.0)
@@ -12,9 +12,12 @@ from maxapi.enums.update import UpdateType
 from maxapi.filters import F
 from maxapi.filters.command import Command, CommandsInfo
 from maxapi.filters.handler import Handler
+from maxapi.filters.middleware import BaseMiddleware
 from maxapi.filters.state import StateFilter
 from maxapi.types.updates.bot_started import BotStarted
 from maxapi.types.updates.message_created import MessageCreated
+from maxapi.utils import MemoryEntityCache
+from maxapi.utils.updates import CACHE_UPDATE_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -1787,6 +1790,193 @@ class TestDispatchFetchedEventsConnectorError:
             )  # не должно всплывать
 
 
+# ===========================================================================
+# resolve_update_types — фильтр types для long polling
+# ===========================================================================
+
+
+class TestResolveUpdateTypes:
+    """Типы событий для get_updates выводятся из обработчиков."""
+
+    @staticmethod
+    def _with_handlers(dispatcher):
+        router = Router()
+
+        @dispatcher.message_created()
+        async def _message(event): ...
+
+        @router.message_callback()
+        async def _callback(event): ...
+
+        @dispatcher.on_started()
+        async def _started(): ...
+
+        dispatcher.include_routers(router)
+        return router
+
+    def test_types_from_all_routers(self, dispatcher):
+        self._with_handlers(dispatcher)
+
+        assert dispatcher.resolve_update_types() == [
+            UpdateType.MESSAGE_CALLBACK,
+            UpdateType.MESSAGE_CREATED,
+        ]
+
+    def test_no_handlers_means_all_types(self, dispatcher):
+        assert dispatcher.resolve_update_types() is None
+
+    def test_raw_response_handlers_disable_filter(self, dispatcher):
+        self._with_handlers(dispatcher)
+
+        @dispatcher.raw_api_response()
+        async def _raw(data): ...
+
+        assert dispatcher.resolve_update_types() is None
+
+    def test_outer_middleware_types(self, dispatcher):
+        self._with_handlers(dispatcher)
+
+        class CatchAll(BaseMiddleware):
+            pass
+
+        class StartOnly(BaseMiddleware):
+            update_types = (UpdateType.BOT_STARTED,)
+
+        dispatcher.register_outer_middleware(StartOnly())
+
+        assert UpdateType.BOT_STARTED in dispatcher.resolve_update_types()
+
+        dispatcher.register_outer_middleware(CatchAll())
+
+        assert dispatcher.resolve_update_types() is None
+
+    def test_entity_cache_keeps_invalidation_types(self, dispatcher, bot):
+        self._with_handlers(dispatcher)
+        bot.entity_cache = MemoryEntityCache()
+
+        types = dispatcher.resolve_update_types(bot)
+
+        assert set(types) >= CACHE_UPDATE_TYPES
+        assert UpdateType.MESSAGE_CREATED in types
+        assert dispatcher.resolve_update_types() == [
+            UpdateType.MESSAGE_CALLBACK,
+            UpdateType.MESSAGE_CREATED,
+        ]
+
+    async def test_start_polling_passes_types(self, dispatcher, bot):
+        self._with_handlers(dispatcher)
+        bot.get_updates = AsyncMock(return_value={"updates": []})
+
+        async def stop(*args, **kwargs):
+            dispatcher.polling = False
+
+        dispatcher._dispatch_fetched_events = stop
+
+        with patch.object(dispatcher, "_Dispatcher__ready", AsyncMock()):
+            await dispatcher.start_polling(bot)
+            bot.get_updates.assert_awaited_once_with(
+                marker=None,
+                types=[
+                    UpdateType.MESSAGE_CALLBACK,
+                    UpdateType.MESSAGE_CREATED,
+                ],
+            )
+
+            bot.get_updates.reset_mock()
+            await dispatcher.start_polling(bot, types=None)
+            bot.get_updates.assert_awaited_once_with(marker=None, types=None)
+
+
+# ===========================================================================
+# start_polling(prefetch=...) — конвейерный polling
+# ===========================================================================
+
+
+class TestPipelinedPolling:
+    """Получение следующего батча параллельно с обработкой текущего."""
+
+    @staticmethod
+    def _setup(dispatcher, bot, stop_after):
+        calls = []
+        seen = []
+
+        async def get_updates(marker, types=None):
+            calls.append(marker)
+            if len(calls) > 5:
+                await asyncio.Event().wait()  # висящий long poll
+            return {"updates": [], "marker": len(calls)}
+
+        async def handle(event):
+            await asyncio.sleep(0.01)
+            seen.append((bot.marker_updates, len(calls)))
+            if len(seen) == stop_after:
+                dispatcher.polling = False
+
+        bot.get_updates = get_updates
+        dispatcher.handle = handle
+        return calls, seen
+
+    async def test_prefetch_overlaps_dispatch_with_backpressure(
+        self, dispatcher, bot
+    ):
+        calls, seen = self._setup(dispatcher, bot, stop_after=3)
+
+        with (
+            patch.object(dispatcher, "_Dispatcher__ready", AsyncMock()),
+            patch(
+                "maxapi.dispatcher.process_update_request",
+                new=AsyncMock(return_value=[Mock()]),
+            ),
+        ):
+            dispatcher.bot = bot
+            await dispatcher.start_polling(bot, prefetch=1)
+
+        # запросы идут с собственным маркером, не дожидаясь обработки
+        assert calls[:3] == [None, 1, 2]
+        # во время первого батча: маркер не сохранён, один батч в очереди
+        # и ещё один ждёт места в ней
+        assert seen[0] == (None, 3)
+        # маркер продвигается только после обработки батча
+        assert [marker for marker, _ in seen[1:]] == [1, 2]
+        assert bot.marker_updates == 3
+
+    async def test_stop_drops_queued_batches_uncommitted(
+        self, dispatcher, bot
+    ):
+        calls, seen = self._setup(dispatcher, bot, stop_after=1)
+
+        with (
+            patch.object(dispatcher, "_Dispatcher__ready", AsyncMock()),
+            patch(
+                "maxapi.dispatcher.process_update_request",
+                new=AsyncMock(return_value=[Mock()]),
+            ),
+        ):
+            dispatcher.bot = bot
+            await dispatcher.start_polling(bot, prefetch=2)
+
+        assert len(seen) == 1
+        assert len(calls) > 1
+        assert bot.marker_updates == 1
+
+    async def test_invalid_token_propagates(self, dispatcher, bot):
+        from maxapi.exceptions.max import InvalidToken
+
+        bot.get_updates = AsyncMock(side_effect=InvalidToken("bad token"))
+
+        with (
+            patch.object(dispatcher, "_Dispatcher__ready", AsyncMock()),
+            pytest.raises(InvalidToken),
+        ):
+            await dispatcher.start_polling(bot, prefetch=1)
+
+        assert dispatcher.polling is False
+
+    async def test_negative_prefetch_rejected(self, dispatcher, bot):
+        with pytest.raises(ValueError, match="prefetch"):
+            await dispatcher.start_polling(bot, prefetch=-1)
+
+
 # ===========================================================================
 # start_polling — полный HTTP-цикл через aresponses
 # ===========================================================================
@@ -1,6 +1,7 @@
 """Тесты для метода download_file."""
 
 import inspect
+import tracemalloc
 from collections.abc import Callable
 from datetime import datetime
 from functools import wraps
@@ -121,6 +122,7 @@ def _make_mock_response(
     url=None,
     closed=False,
     released=False,
+    content_length=None,
 ):
     """Создаёт мок aiohttp-ответа для скачивания."""
     mock_response = AsyncMock(spec_set=ClientResponse)
@@ -132,6 +134,8 @@ def _make_mock_response(
     mock_response._released = released
     mock_response.status = status
     mock_response.content_type = content_type
+    mock_response.content_length = content_length
+    mock_response.headers = {}
     mock_response.__class__ = ClientResponse  # type: ignore
 
     if cd_filename is not None:
@@ -816,6 +820,97 @@ class TestDownloadFileAsBytes:
         result = await bot.download_bytes(url=url)
         assert result == b"".join(chunks)
 
+    async def test_download_bytes_preallocated_single_copy(
+        self, bot: Bot, mock_session: AsyncMock
+    ):
+        """С Content-Length пик памяти ≈ размер файла, а не вдвое больше."""
+        size = 8 * 1024 * 1024
+        chunk = b"x" * 65536
+        url = "https://example.com/file"
+        mock_response = _make_mock_response(
+            url=url,
+            chunks=[chunk] * (size // len(chunk)),
+            content_length=size,
+        )
+        mock_session.request = AsyncMock(return_value=mock_response)
+
+        tracemalloc.start()
+        try:
+            result = await bot.download_bytes(url=url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(result) == size
+        assert peak < size * 1.25
+
+    async def test_download_bytes_io_shorter_than_content_length(
+        self, bot: Bot, mock_session: AsyncMock
+    ):
+        """Оборванный по Content-Length ответ не дополняется нулями."""
+        url = "https://example.com/file"
+        mock_response = _make_mock_response(
+            url=url, chunks=[b"abc", b"de"], content_length=10
+        )
+        mock_session.request = AsyncMock(return_value=mock_response)
+
+        bio = await bot.download_bytes_io(url=url)
+
+        assert bio.getvalue() == b"abcde"
+        assert bio.tell() == 0
+
+    async def test_download_bytes_io_huge_content_length_not_preallocated(
+        self, bot: Bot, mock_session: AsyncMock
+    ):
+        """Content-Length больше лимита не выделяется заранее."""
+        url = "https://example.com/file"
+        mock_response = _make_mock_response(
+            url=url, chunks=[b"abc"], content_length=10 * 1024**3
+        )
+        mock_session.request = AsyncMock(return_value=mock_response)
+
+        tracemalloc.start()
+        try:
+            bio = await bot.download_bytes_io(url=url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert bio.getvalue() == b"abc"
+        assert peak < 1024 * 1024
+
+    async def test_download_bytes_io_error_status_not_preallocated(
+        self, bot: Bot, mock_session: AsyncMock
+    ):
+        """Статус проверяется до выделения буфера."""
+        url = "https://example.com/file"
+        mock_response = _make_mock_response(
+            url=url, ok=False, status=500, chunks=[], content_length=1024
+        )
+        mock_session.request = AsyncMock(return_value=mock_response)
+
+        with (
+            patch("maxapi.connection.base.expected_size") as size,
+            pytest.raises(DownloadFileError, match="500"),
+        ):
+            await bot.download_bytes_io(url=url)
+
+        size.assert_not_called()
+        mock_response.release.assert_called_once()
+
+    async def test_iter_download_yields_memoryviews(
+        self, bot: Bot, mock_session: AsyncMock
+    ):
+        url = "https://example.com/file"
+        mock_response = _make_mock_response(url=url, chunks=[b"ab", b"cd"])
+        mock_session.request = AsyncMock(return_value=mock_response)
+
+        chunks = [chunk async for chunk in bot.iter_download(url)]
+
+        assert all(isinstance(chunk, memoryview) for chunk in chunks)
+        assert b"".join(chunks) == b"abcd"
+        mock_response.release.assert_called_once()
+
     async def test_download_file_vs_bytes_same_content(
         self, bot: Bot, tmp_dir: Path, mock_session: AsyncMock
     ):
@@ -5,19 +5,25 @@
   - _resolve_from_user : все ветки определения отправителя
   - _inject_bot     : внедрение ссылки на бота
   - enrich_event    : сквозной пайплайн + auto_requests=False
+  - enrich_events   : батч с общими запросами чатов и участников
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from maxapi.client.default import DefaultConnectionProperties
 from maxapi.enums.chat_type import ChatType
 from maxapi.exceptions.max import MaxApiError, MaxConnection
 from maxapi.types.fetchable import ChatRef, FromUserRef
+from maxapi.utils import MemoryEntityCache
+from maxapi.utils.entity_cache import chat_key
 from maxapi.utils.updates import (
     _inject_bot,
     _resolve_chat,
     _resolve_from_user,
     enrich_event,
+    enrich_events,
 )
 
 # ---------------------------------------------------------------------------
@@ -705,3 +711,166 @@ class TestEnrichEvent:
         assert result.chat is fake_chat
         assert result.from_user is event.user
         assert result.bot is bot
+
+
+# ===========================================================================
+# enrich_events
+# ===========================================================================
+
+
+class TestEnrichEvents:
+    """Тесты батчевого дополнения событий."""
+
+    async def test_unique_chats_fetched_once_and_concurrently(
+        self, bot, fixture_user_added
+    ):
+        """Один запрос на чат, разные чаты загружаются параллельно."""
+        events = [
+            fixture_user_added.model_copy(update={"chat_id": chat_id})
+            for chat_id in (1, 2, 1, 2)
+        ]
+        active = 0
+        overlaps = []
+
+        async def get_chat_by_id(chat_id):
+            nonlocal active
+            active += 1
+            overlaps.append(active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return _make_chat()
+
+        bot.get_chat_by_id = AsyncMock(side_effect=get_chat_by_id)
+
+        result = await enrich_events(events, bot)
+
+        assert result == events
+        assert bot.get_chat_by_id.await_count == 2
+        assert max(overlaps) == 2
+        assert events[0].chat is events[2].chat
+        assert events[1].chat is events[3].chat
+        assert events[0].chat is not events[1].chat
+        assert all(event.bot is bot for event in events)
+
+    async def test_concurrency_limit(self, bot, fixture_user_added):
+        """Не больше concurrency запросов одновременно."""
+        events = [
+            fixture_user_added.model_copy(update={"chat_id": chat_id})
+            for chat_id in range(1, 5)
+        ]
+        active = 0
+        overlaps = []
+
+        async def get_chat_by_id(chat_id):
+            nonlocal active
+            active += 1
+            overlaps.append(active)
+            await asyncio.sleep(0)
+            active -= 1
+            return _make_chat()
+
+        bot.get_chat_by_id = AsyncMock(side_effect=get_chat_by_id)
+
+        await enrich_events(events, bot, concurrency=1)
+
+        assert bot.get_chat_by_id.await_count == 4
+        assert max(overlaps) == 1
+
+    async def test_concurrency_from_connection(self, bot, fixture_user_added):
+        """По умолчанию лимит берётся из enrich_concurrency."""
+        bot.default_connection = DefaultConnectionProperties(
+            enrich_concurrency=1
+        )
+        events = [
+            fixture_user_added.model_copy(update={"chat_id": chat_id})
+            for chat_id in range(1, 5)
+        ]
+        active = 0
+        overlaps = []
+
+        async def get_chat_by_id(chat_id):
+            nonlocal active
+            active += 1
+            overlaps.append(active)
+            await asyncio.sleep(0)
+            active -= 1
+            return _make_chat()
+
+        bot.get_chat_by_id = AsyncMock(side_effect=get_chat_by_id)
+
+        await enrich_events(events, bot)
+
+        assert bot.get_chat_by_id.await_count == 4
+        assert max(overlaps) == 1
+
+    def test_enrich_concurrency_validated(self):
+        """enrich_concurrency меньше 1 отклоняется."""
+        with pytest.raises(ValueError, match="enrich_concurrency"):
+            DefaultConnectionProperties(enrich_concurrency=0)
+
+    async def test_members_fetched_once(self, bot, fixture_message_removed):
+        """Одинаковые участники запрашиваются один раз."""
+        events = [
+            fixture_message_removed.model_copy(update={"user_id": user_id})
+            for user_id in (10, 10, 20)
+        ]
+        fake_member = MagicMock()
+        bot.get_chat_by_id = AsyncMock(return_value=_make_chat(ChatType.CHAT))
+        bot.get_chat_member = AsyncMock(return_value=fake_member)
+
+        await enrich_events(events, bot)
+
+        bot.get_chat_by_id.assert_awaited_once_with(
+            fixture_message_removed.chat_id
+        )
+        assert bot.get_chat_member.await_count == 2
+        assert all(event.from_user is fake_member for event in events)
+
+    async def test_member_error_leaves_from_user_empty(
+        self, bot, fixture_message_removed
+    ):
+        """Ошибка загрузки участника не прерывает батч."""
+        events = [
+            fixture_message_removed,
+            fixture_message_removed.model_copy(),
+        ]
+        bot.get_chat_by_id = AsyncMock(return_value=_make_chat(ChatType.CHAT))
+        bot.get_chat_member = AsyncMock(
+            side_effect=MaxApiError(code=404, raw={})
+        )
+
+        result = await enrich_events(events, bot)
+
+        assert [event.from_user for event in result] == [None, None]
+        bot.get_chat_member.assert_awaited_once()
+
+    async def test_cache_update_visible_to_later_events(
+        self, bot, chat_obj, fixture_chat_title_changed, fixture_user_added
+    ):
+        """События после смены названия получают обновлённый чат."""
+        chat_id = fixture_chat_title_changed.chat_id
+        chat_obj.chat_id = chat_id
+        bot.entity_cache = MemoryEntityCache()
+        await bot.entity_cache.set(chat_key(chat_id), chat_obj)
+        bot.get_chat_by_id = AsyncMock()
+        later = fixture_user_added.model_copy(update={"chat_id": chat_id})
+
+        await enrich_events([fixture_chat_title_changed, later], bot)
+
+        assert later.chat.title == fixture_chat_title_changed.title
+        assert later.chat.participants_count == chat_obj.participants_count + 1
+        assert fixture_chat_title_changed.chat.title == later.chat.title
+        bot.get_chat_by_id.assert_not_called()
+
+    async def test_auto_requests_false_enriches_sequentially(
+        self, bot, fixture_user_added
+    ):
+        """auto_requests=False — ленивые ссылки, как у enrich_event."""
+        events = [fixture_user_added, fixture_user_added.model_copy()]
+        bot.auto_requests = False
+        bot.get_chat_by_id = AsyncMock()
+
+        result = await enrich_events(events, bot)
+
+        assert all(isinstance(event.chat, ChatRef) for event in result)
+        bot.get_chat_by_id.assert_not_called()
@@ -0,0 +1,225 @@
+"""Тесты кеша сущностей и его инвалидации по событиям."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from maxapi import Bot
+from maxapi.types.fetchable import ChatRef
+from maxapi.utils import MemoryEntityCache
+from maxapi.utils.entity_cache import (
+    BaseEntityCache,
+    CacheStats,
+    chat_key,
+    get_chat_cached,
+    get_chat_member_cached,
+    member_key,
+)
+from maxapi.utils.updates import enrich_event
+
+
+class CopyingEntityCache(BaseEntityCache):
+    """Кеш, который, как внешние хранилища, хранит копии значений."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.model_copy() if value is not None else None
+
+    async def set(self, key, value):
+        self.data[key] = value.model_copy()
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def delete_chat(self, chat_id):
+        self.data.pop(chat_key(chat_id), None)
+
+    async def clear(self):
+        self.data.clear()
+
+    @property
+    def stats(self):
+        return CacheStats(size=len(self.data))
+
+
+@pytest.fixture
+def cached_bot(mock_bot_token):
+    bot = Bot(token=mock_bot_token, entity_cache=MemoryEntityCache())
+    bot.session = None
+    return bot
+
+
+class TestMemoryEntityCache:
+    def test_invalid_params(self):
+        with pytest.raises(ValueError, match="max_size"):
+            MemoryEntityCache(max_size=0)
+        with pytest.raises(ValueError, match="ttl"):
+            MemoryEntityCache(ttl=0)
+
+    async def test_hit_and_miss_stats(self):
+        cache = MemoryEntityCache()
+        assert await cache.get(chat_key(1)) is None
+        await cache.set(chat_key(1), "chat")
+        assert await cache.get(chat_key(1)) == "chat"
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_ratio == 0.5
+
+    async def test_lru_eviction(self):
+        cache = MemoryEntityCache(max_size=2)
+        await cache.set(chat_key(1), 1)
+        await cache.set(chat_key(2), 2)
+        await cache.get(chat_key(1))
+        await cache.set(chat_key(3), 3)
+
+        assert await cache.get(chat_key(2)) is None
+        assert await cache.get(chat_key(1)) == 1
+        assert cache.stats.evictions == 1
+
+    async def test_ttl_expiry(self):
+        cache = MemoryEntityCache(ttl=10)
+        with patch("maxapi.utils.entity_cache.monotonic", return_value=0):
+            await cache.set(chat_key(1), "chat")
+        with patch("maxapi.utils.entity_cache.monotonic", return_value=11):
+            assert await cache.get(chat_key(1)) is None
+        assert cache.stats.size == 0
+
+    async def test_delete_chat_drops_members(self):
+        cache = MemoryEntityCache()
+        await cache.set(chat_key(1), "chat")
+        await cache.set(member_key(1, 10), "member")
+        await cache.set(member_key(2, 10), "other")
+
+        await cache.delete_chat(1)
+
+        assert await cache.get(chat_key(1)) is None
+        assert await cache.get(member_key(1, 10)) is None
+        assert await cache.get(member_key(2, 10)) == "other"
+
+
+class TestCachedLookups:
+    async def test_chat_fetched_once(self, cached_bot, chat_obj):
+        cached_bot.get_chat_by_id = AsyncMock(return_value=chat_obj)
+
+        first = await get_chat_cached(cached_bot, chat_obj.chat_id)
+        second = await get_chat_cached(cached_bot, chat_obj.chat_id)
+
+        assert first is second is chat_obj
+        cached_bot.get_chat_by_id.assert_awaited_once_with(chat_obj.chat_id)
+
+    async def test_missing_member_not_cached(self, cached_bot):
+        cached_bot.get_chat_member = AsyncMock(return_value=None)
+
+        await get_chat_member_cached(cached_bot, chat_id=1, user_id=2)
+        await get_chat_member_cached(cached_bot, chat_id=1, user_id=2)
+
+        assert cached_bot.get_chat_member.await_count == 2
+
+    async def test_without_cache_calls_api(self, bot, chat_obj):
+        bot.get_chat_by_id = AsyncMock(return_value=chat_obj)
+
+        await get_chat_cached(bot, 1)
+        await get_chat_cached(bot, 1)
+
+        assert bot.get_chat_by_id.await_count == 2
+
+    async def test_chat_ref_uses_cache(self, cached_bot, chat_obj):
+        await cached_bot.entity_cache.set(chat_key(chat_obj.chat_id), chat_obj)
+        cached_bot.get_chat_by_id = AsyncMock()
+
+        ref = ChatRef(
+            bot=cached_bot, chat_id=chat_obj.chat_id, setter=lambda _: None
+        )
+
+        assert await ref.fetch() is chat_obj
+        cached_bot.get_chat_by_id.assert_not_called()
+
+
+class TestEnrichWithCache:
+    async def test_hot_chat_costs_no_requests(
+        self, cached_bot, fixture_message_created, chat_obj
+    ):
+        cached_bot.get_chat_by_id = AsyncMock(return_value=chat_obj)
+
+        await enrich_event(fixture_message_created, cached_bot)
+        await enrich_event(fixture_message_created, cached_bot)
+
+        cached_bot.get_chat_by_id.assert_awaited_once()
+        assert cached_bot.entity_cache.stats.size == 1
+
+    async def test_title_changed_patches_chat(
+        self, cached_bot, fixture_chat_title_changed, chat_obj
+    ):
+        chat_obj.chat_id = fixture_chat_title_changed.chat_id
+        await cached_bot.entity_cache.set(chat_key(chat_obj.chat_id), chat_obj)
+        cached_bot.get_chat_by_id = AsyncMock()
+
+        old_title = chat_obj.title
+
+        await enrich_event(fixture_chat_title_changed, cached_bot)
+
+        cached = await cached_bot.entity_cache.get(chat_key(chat_obj.chat_id))
+        assert cached.title == fixture_chat_title_changed.title
+        assert fixture_chat_title_changed.chat is cached
+        assert chat_obj.title == old_title
+        cached_bot.get_chat_by_id.assert_not_called()
+
+    async def test_title_changed_reaches_external_backend(
+        self, mock_bot_token, fixture_chat_title_changed, chat_obj
+    ):
+        cache = CopyingEntityCache()
+        bot = Bot(token=mock_bot_token, entity_cache=cache)
+        chat_obj.chat_id = fixture_chat_title_changed.chat_id
+        await cache.set(chat_key(chat_obj.chat_id), chat_obj)
+
+        await enrich_event(fixture_chat_title_changed, bot)
+
+        cached = await cache.get(chat_key(chat_obj.chat_id))
+        assert cached.title == fixture_chat_title_changed.title
+
+    async def test_user_added_updates_membership(
+        self, cached_bot, fixture_user_added, chat_obj
+    ):
+        chat_id = fixture_user_added.chat_id
+        user_id = fixture_user_added.user.user_id
+        chat_obj.chat_id = chat_id
+        cache = cached_bot.entity_cache
+        await cache.set(chat_key(chat_id), chat_obj)
+        await cache.set(member_key(chat_id, user_id), "stale")
+        cached_bot.get_chat_by_id = AsyncMock()
+
+        await enrich_event(fixture_user_added, cached_bot)
+
+        cached = await cache.get(chat_key(chat_id))
+        assert cached.participants_count == 2
+        assert chat_obj.participants_count == 1
+        assert await cache.get(member_key(chat_id, user_id)) is None
+
+    async def test_user_removed_updates_membership(
+        self, cached_bot, fixture_user_removed, chat_obj
+    ):
+        chat_id = fixture_user_removed.chat_id
+        chat_obj.chat_id = chat_id
+        await cached_bot.entity_cache.set(chat_key(chat_id), chat_obj)
+        cached_bot.get_chat_by_id = AsyncMock()
+
+        await enrich_event(fixture_user_removed, cached_bot)
+
+        cached = await cached_bot.entity_cache.get(chat_key(chat_id))
+        assert cached.participants_count == 0
+
+    async def test_bot_removed_evicts_chat(
+        self, cached_bot, fixture_bot_removed, chat_obj
+    ):
+        chat_id = fixture_bot_removed.chat_id
+        cache = cached_bot.entity_cache
+        await cache.set(chat_key(chat_id), chat_obj)
+        await cache.set(member_key(chat_id, 1), "member")
+
+        await enrich_event(fixture_bot_removed, cached_bot)
+
+        assert await cache.get(chat_key(chat_id)) is None
+        assert await cache.get(member_key(chat_id, 1)) is None
@@ -7,9 +7,7 @@ from maxapi.methods.types.getted_updates import (
 )
 
 
-async def test_process_update_request_calls_get_update_model_and_returns_list(
-    bot,
-):
+async def test_process_update_request_enriches_batch_at_once(bot):
     events = {
         "updates": [
             {"update_type": "message_created", "foo": "bar"},
@@ -20,20 +18,27 @@ async def test_process_update_request_calls_get_update_model_and_returns_list(
     # Подготавливаем два значения-эмулятора для возврата
     result1 = object()
     result2 = object()
-
-    async_mock = AsyncMock(side_effect=[result1, result2])
-
-    with patch(
-        "maxapi.methods.types.getted_updates.get_update_model", async_mock
+    enriched = [object(), object()]
+
+    with (
+        patch(
+            "maxapi.methods.types.getted_updates.UpdateUnionAdapter"
+            ".validate_python",
+            side_effect=[result1, result2],
+        ) as validate,
+        patch(
+            "maxapi.methods.types.getted_updates.enrich_events",
+            AsyncMock(return_value=enriched),
+        ) as enrich,
     ):
         res = await process_update_request(events, bot)
 
-    assert res == [result1, result2]
-    assert async_mock.call_count == 2
-    assert async_mock.call_args_list == [
-        call(events["updates"][0], bot),
-        call(events["updates"][1], bot),
+    assert res is enriched
+    assert validate.call_args_list == [
+        call(events["updates"][0]),
+        call(events["updates"][1]),
     ]
+    enrich.assert_awaited_once_with([result1, result2], bot)
 
 
 async def test_process_update_request_logs_and_skips_unknown_updates(
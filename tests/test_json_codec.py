@@ -0,0 +1,201 @@
+"""Тесты настраиваемого JSON-кодека."""
+
+import json
+import sys
+from importlib.util import find_spec
+from timeit import timeit
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import maxapi.webhook.base as integration_module
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from maxapi import Bot, Dispatcher
+from maxapi.client import DefaultConnectionProperties, JsonCodec
+from maxapi.client.codec import (
+    STDLIB_CODEC,
+    _named_codec,
+    get_json_codec,
+)
+from maxapi.connection.base import BaseConnection
+from maxapi.context import RedisContext
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.webhook.aiohttp import AiohttpMaxWebhook
+
+UPDATE_FIXTURES = (
+    "fixture_message_created",
+    "fixture_message_edited",
+    "fixture_message_removed",
+    "fixture_message_callback",
+    "fixture_message_chat_created",
+    "fixture_bot_added",
+    "fixture_bot_removed",
+    "fixture_bot_started",
+    "fixture_user_added",
+    "fixture_user_removed",
+    "fixture_chat_title_changed",
+)
+
+
+def _tracking_codec():
+    calls = {"dumps": 0, "loads": 0}
+
+    def dumps(obj):
+        calls["dumps"] += 1
+        return json.dumps(obj).encode()
+
+    def loads(data):
+        calls["loads"] += 1
+        return json.loads(data)
+
+    return JsonCodec(dumps, loads, name="tracking"), calls
+
+
+class TestGetJsonCodec:
+    def test_default_is_stdlib(self):
+        assert get_json_codec() is STDLIB_CODEC
+        assert get_json_codec("json") is STDLIB_CODEC
+
+    def test_instance_passthrough(self):
+        codec, _ = _tracking_codec()
+        assert get_json_codec(codec) is codec
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match="json_codec"):
+            get_json_codec("yaml")
+
+    def test_missing_library(self):
+        _named_codec.cache_clear()
+        with (
+            patch.dict(sys.modules, {"orjson": None}),
+            pytest.raises(ImportError, match="orjson"),
+        ):
+            get_json_codec("orjson")
+        _named_codec.cache_clear()
+
+    def test_auto_falls_back_to_stdlib(self):
+        _named_codec.cache_clear()
+        with patch("maxapi.client.codec.find_spec", return_value=None):
+            assert get_json_codec("auto") is STDLIB_CODEC
+        _named_codec.cache_clear()
+
+    def test_bytes_dumps_normalized(self):
+        codec, _ = _tracking_codec()
+        assert codec.dumps({"a": 1}) == '{"a": 1}'
+        assert codec.dumps_bytes({"a": 1}) == b'{"a": 1}'
+        assert codec.loads(memoryview(b'{"a": 1}')) == {"a": 1}
+
+
+class TestCodecWiring:
+    async def test_session_uses_codec_for_outgoing_json(self, mock_bot_token):
+        codec, _ = _tracking_codec()
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(json_codec=codec),
+        )
+        session = await bot.ensure_session()
+        try:
+            assert session.json_serialize == codec.dumps
+        finally:
+            await bot.close_session()
+
+    async def test_response_decoded_with_codec(self, mock_bot_token):
+        codec, calls = _tracking_codec()
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(json_codec=codec),
+        )
+        resp = MagicMock()
+        resp.status = 200
+        resp.ok = True
+        resp.read = AsyncMock(return_value=b'{"ok": 1}')
+        session = MagicMock()
+        session.closed = False
+        session.request = AsyncMock(return_value=resp)
+        bot.session = session
+
+        base = BaseConnection()
+        base.bot = bot
+        result = await base.request(
+            method=HTTPMethod.GET, path="/me", is_return_raw=True
+        )
+
+        assert result == {"ok": 1}
+        assert calls["loads"] == 1
+
+    async def test_webhook_uses_bot_codec(self, mock_bot_token, monkeypatch):
+        codec, calls = _tracking_codec()
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(json_codec=codec),
+        )
+        dp = Dispatcher()
+        received = {}
+
+        async def fake_process(event_json, bot):
+            received["json"] = event_json
+
+        monkeypatch.setattr(
+            integration_module, "process_update_webhook", fake_process
+        )
+
+        app = web.Application()
+        wh = AiohttpMaxWebhook(dp=dp, bot=bot)
+        wh.setup(app)
+
+        async with TestClient(TestServer(app)) as client:
+            await client.post("/", json={"update_type": "unknown"})
+
+        assert wh.json_codec is codec
+        assert calls["loads"] == 1
+        assert received["json"] == {"update_type": "unknown"}
+
+    async def test_redis_context_uses_codec(self):
+        codec, calls = _tracking_codec()
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=b'{"step": 2}')
+        context = RedisContext(1, 2, redis_client=redis, json_codec=codec)
+
+        await context.set_data({"step": 1})
+        data = await context.get_data()
+
+        assert data == {"step": 2}
+        assert calls == {"dumps": 1, "loads": 1}
+        assert redis.set.await_args.args[1] == '{"step": 1}'
+
+
+@pytest.mark.slow
+def test_codec_benchmark_on_update_fixtures(request):
+    """
+    Сравнение доступных кодеков на payload'ах из tests/fixtures.
+
+    Запуск с выводом: ``pytest tests/test_json_codec.py -m slow -s``.
+    """
+
+    payloads = [
+        request.getfixturevalue(name).model_dump(mode="json")
+        for name in UPDATE_FIXTURES
+    ]
+    encoded = [json.dumps(p).encode() for p in payloads]
+
+    codecs = [STDLIB_CODEC] + [
+        get_json_codec(name)
+        for name in ("orjson", "msgspec")
+        if find_spec(name) is not None
+    ]
+
+    number = 200
+    for codec in codecs:
+        assert [codec.loads(raw) for raw in encoded] == payloads
+
+        decode = timeit(
+            lambda c=codec: [c.loads(raw) for raw in encoded], number=number
+        )
+        encode = timeit(
+            lambda c=codec: [c.dumps(p) for p in payloads], number=number
+        )
+        per_event = 1e6 / (number * len(payloads))
+        print(  # noqa: T201
+            f"{codec.name:>8}: decode {decode * per_event:.2f} мкс/событие, "
+            f"encode {encode * per_event:.2f} мкс/событие"
+        )
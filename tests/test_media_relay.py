@@ -0,0 +1,205 @@
+"""Тесты пересылки медиа без сохранения на диск."""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import web
+from maxapi.bot import Bot
+from maxapi.client import DefaultConnectionProperties
+from maxapi.connection.upload import AsyncStreamPayload
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions.max import MaxUploadFileFailed
+from maxapi.types import InputMediaStream
+
+DATA = os.urandom(300_000)
+
+
+class _Writer:
+    def __init__(self):
+        self.data = bytearray()
+
+    async def write(self, chunk):
+        self.data += chunk
+
+
+async def _parts(data, size=1000):
+    for offset in range(0, len(data), size):
+        yield data[offset : offset + size]
+
+
+@pytest.fixture
+async def server():
+    """Файловый сервер и сервер загрузки в одном приложении."""
+
+    state = {"upload_failures": 0, "downloads": 0}
+    uploads = []
+
+    async def download(request):
+        state["downloads"] += 1
+        return web.Response(
+            body=DATA,
+            headers={
+                "Content-Type": "video/mp4",
+                "Content-Disposition": 'attachment; filename="clip.mp4"',
+            },
+        )
+
+    async def upload(request):
+        reader = await request.multipart()
+        part = await reader.next()
+        body = await part.read()  # type: ignore[union-attr]
+        if state["upload_failures"]:
+            state["upload_failures"] -= 1
+            return web.Response(status=503)
+        uploads.append(
+            {
+                "filename": part.filename,  # type: ignore[union-attr]
+                "content_type": part.headers["Content-Type"],  # type: ignore[union-attr]
+                "body": bytes(body),
+            }
+        )
+        return web.Response(text=json.dumps({"token": "file-token"}))
+
+    app = web.Application(client_max_size=len(DATA) * 2)
+    app.router.add_get("/clip", download)
+    app.router.add_post("/upload", upload)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        yield f"http://127.0.0.1:{port}", state, uploads
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+async def bot(server):
+    base, _, _ = server
+    bot = Bot(
+        token="test-token",
+        default_connection=DefaultConnectionProperties(
+            max_retries=1, retry_backoff_factor=0
+        ),
+    )
+    bot.get_upload_url = AsyncMock(  # type: ignore[method-assign]
+        return_value=SimpleNamespace(url=f"{base}/upload", token="video-token")
+    )
+    try:
+        yield bot
+    finally:
+        await bot.close_session()
+
+
+class TestAsyncStreamPayload:
+    async def test_reads_ahead_bounded(self):
+        produced = 0
+        writer = _Writer()
+
+        async def source():
+            nonlocal produced
+            for chunk in (b"a", b"b", b"c", b"d", b"e", b"f"):
+                produced += 1
+                yield chunk
+
+        async def slow_write(chunk):
+            # буфер + кусок, ждущий места в очереди, + кусок у писателя
+            await asyncio.sleep(0)
+            assert produced - len(writer.data) <= 2 + 2
+            writer.data += chunk
+
+        writer.write = slow_write  # type: ignore[method-assign]
+        payload = AsyncStreamPayload(
+            source(),
+            filename="f",
+            content_type="text/plain",
+            buffer_chunks=2,
+        )
+
+        await payload.write(writer)  # type: ignore[arg-type]
+
+        assert bytes(writer.data) == b"abcdef"
+        assert payload.size is None
+
+    async def test_source_error_propagates(self):
+        async def source():
+            yield b"a"
+            raise ValueError("boom")
+
+        payload = AsyncStreamPayload(
+            source(), filename="f", content_type="text/plain"
+        )
+
+        with pytest.raises(ValueError, match="boom"):
+            await payload.write(_Writer())  # type: ignore[arg-type]
+
+    async def test_progress_with_unknown_size(self):
+        seen = []
+        payload = AsyncStreamPayload(
+            _parts(b"x" * 2500),
+            filename="f",
+            content_type="text/plain",
+            progress=seen.append,
+        )
+
+        await payload.write(_Writer())  # type: ignore[arg-type]
+
+        assert [p.sent for p in seen] == [1000, 2000, 2500]
+        assert {p.total for p in seen} == {0}
+
+
+class TestRelayMedia:
+    async def test_relay_streams_download_into_upload(self, bot, server):
+        base, _, uploads = server
+
+        upload = await bot.relay_media(f"{base}/clip")
+
+        assert upload.type == UploadType.VIDEO
+        assert upload.payload.token == "video-token"
+        assert uploads == [
+            {
+                "filename": "clip.mp4",
+                "content_type": "video/mp4",
+                "body": DATA,
+            }
+        ]
+
+    async def test_retry_refetches_source(self, bot, server):
+        base, state, uploads = server
+        state["upload_failures"] = 1
+
+        upload = await bot.relay_media(
+            f"{base}/clip", UploadType.FILE, filename="copy.mp4"
+        )
+
+        assert upload.payload.token == "file-token"
+        assert state["downloads"] == 2
+        assert uploads[0]["filename"] == "copy.mp4"
+        assert uploads[0]["body"] == DATA
+
+
+class TestInputMediaStream:
+    async def test_factory_source(self, bot, server):
+        _, _, uploads = server
+
+        upload = await bot.upload_media(
+            InputMediaStream(lambda: _parts(b"report"), "file", "report.pdf")
+        )
+
+        assert upload.payload.token == "file-token"
+        assert uploads[0]["content_type"] == "application/pdf"
+        assert uploads[0]["body"] == b"report"
+
+    async def test_one_shot_source_not_retried(self, bot, server):
+        _, state, _ = server
+        state["upload_failures"] = 1
+
+        with pytest.raises(MaxUploadFileFailed, match="одноразовый"):
+            await bot.upload_media(
+                InputMediaStream(_parts(b"report"), "file", "report.pdf")
+            )
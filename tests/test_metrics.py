@@ -0,0 +1,199 @@
+"""Тесты метрик HTTP-клиента."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientConnectionError
+from maxapi import Bot
+from maxapi.client import (
+    ClientMetrics,
+    DefaultConnectionProperties,
+    Histogram,
+)
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.exceptions import MaxConnection
+from maxapi.exceptions.max import MaxApiError
+from maxapi.methods.send_message import SendMessage
+
+
+def _response(status=200, body=b'{"ok": true}'):
+    response = MagicMock(status=status, ok=status < 400)
+    response.read = AsyncMock(return_value=body)
+    response.headers = {}
+    return response
+
+
+@pytest.fixture
+def metrics_bot(mock_bot_token):
+    metrics = ClientMetrics(buckets=(0.1, 1.0))
+    bot = Bot(
+        token=mock_bot_token,
+        default_connection=DefaultConnectionProperties(
+            max_retries=2, retry_backoff_factor=0, metrics=metrics
+        ),
+    )
+    session = MagicMock(closed=False)
+    bot.session = session
+    base = BaseConnection()
+    base.bot = bot
+    return base, metrics, session
+
+
+class TestHistogram:
+    def test_observe_and_quantile(self):
+        hist = Histogram((1.0, 2.0, 4.0))
+
+        for value in (0.5, 1.0, 1.5, 3.0, 10.0):
+            hist.observe(value)
+
+        assert hist.counts == [2, 1, 1, 1]
+        assert hist.count == 5
+        assert hist.mean == pytest.approx(3.2)
+        assert hist.quantile(0.4) == pytest.approx(1.0)
+        assert hist.quantile(0.5) == pytest.approx(1.5)
+        assert hist.quantile(1) == 4.0
+
+    def test_empty_and_invalid(self):
+        assert Histogram().quantile(0.9) == 0.0
+        with pytest.raises(ValueError, match="q"):
+            Histogram().quantile(2)
+        with pytest.raises(ValueError, match="buckets"):
+            ClientMetrics(buckets=(1.0, 0.5))
+
+
+class TestRequestMetrics:
+    async def test_success_records_latency_status_and_bytes(self, metrics_bot):
+        base, metrics, session = metrics_bot
+        session.request = AsyncMock(return_value=_response())
+        payload = {"text": "hi"}
+
+        await base.request(
+            method=HTTPMethod.POST,
+            path="/messages",
+            is_return_raw=True,
+            json=payload,
+        )
+
+        stats = metrics.snapshot()[("POST", "/messages")]
+        assert stats.requests == 1
+        assert stats.in_flight == 0
+        assert stats.latency.count == 1
+        assert stats.responses == {"200": 1}
+        assert stats.bytes_out == len(json.dumps(payload).encode())
+        assert stats.bytes_in == len(b'{"ok": true}')
+
+        sent = session.request.await_args.kwargs
+        assert "json" not in sent
+        assert len(sent["data"]) == stats.bytes_out
+        assert json.loads(sent["data"]) == payload
+        assert sent["headers"]["Content-Type"] == "application/json"
+
+    async def test_retries_counted_by_reason(self, metrics_bot):
+        base, metrics, session = metrics_bot
+        session.request = AsyncMock(
+            side_effect=[
+                _response(503, b""),
+                ClientConnectionError("reset"),
+                _response(),
+            ]
+        )
+
+        await base.request(
+            method=HTTPMethod.GET, path="/chats/42", is_return_raw=True
+        )
+
+        stats = metrics.endpoint(HTTPMethod.GET, "/chats/7")
+        assert stats.requests == 1
+        assert stats.responses == {"503": 1, "error": 1, "200": 1}
+        assert stats.retries == {"503": 1, "connection": 1}
+
+    async def test_failed_request_still_tracked(self, metrics_bot):
+        base, metrics, session = metrics_bot
+        session.request = AsyncMock(side_effect=ClientConnectionError("down"))
+
+        with pytest.raises(MaxConnection):
+            await base.request(method=HTTPMethod.GET, path="/me")
+
+        stats = metrics.endpoint("GET", "/me")
+        assert (stats.requests, stats.in_flight) == (1, 0)
+        assert stats.responses == {"error": 3}
+
+    async def test_api_error_status_counted(self, metrics_bot):
+        base, metrics, session = metrics_bot
+        session.request = AsyncMock(
+            return_value=_response(404, b'{"code": "not.found"}')
+        )
+
+        with pytest.raises(MaxApiError):
+            await base.request(method=HTTPMethod.GET, path="/chats/1")
+
+        assert metrics.endpoint("GET", "/chats").responses == {"404": 1}
+
+    async def test_attachment_not_ready_counted(self, metrics_bot):
+        base, metrics, _ = metrics_bot
+        send = SendMessage(bot=base.bot, chat_id=1, text="hi")
+
+        with (
+            patch.object(
+                BaseConnection,
+                "request",
+                new_callable=AsyncMock,
+                side_effect=[
+                    MaxApiError(
+                        code=400, raw={"code": "attachment.not.ready"}
+                    ),
+                    MagicMock(),
+                ],
+            ),
+            patch("maxapi.methods.send_message.asyncio.sleep"),
+        ):
+            await send.fetch()
+
+        assert metrics.endpoint("POST", "/messages").retries == {
+            "attachment.not.ready": 1
+        }
+
+    async def test_disabled_by_default(self, mock_bot_token):
+        bot = Bot(token=mock_bot_token)
+
+        assert bot.metrics is None
+
+
+class TestPrometheus:
+    def test_render(self):
+        metrics = ClientMetrics(buckets=(0.1, 1.0))
+        stats = metrics.endpoint(HTTPMethod.GET, "/me")
+        stats.latency.observe(0.05)
+        stats.latency.observe(0.5)
+        stats.responses["200"] += 2
+        metrics.record_retry("POST", "/messages", "attachment.not.ready")
+
+        text = metrics.render_prometheus()
+
+        labels = 'method="GET",endpoint="/me"'
+        assert "# TYPE maxapi_request_duration_seconds histogram" in text
+        assert (
+            f'maxapi_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+            in text
+        )
+        assert (
+            f'maxapi_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+            in text
+        )
+        assert f"maxapi_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f'maxapi_responses_total{{{labels},status="200"}} 2' in text
+        assert (
+            'maxapi_retries_total{method="POST",endpoint="/messages",'
+            'reason="attachment.not.ready"} 1'
+        ) in text
+        assert text.endswith("\n")
+
+    def test_reset(self):
+        metrics = ClientMetrics()
+        metrics.endpoint("GET", "/me")
+
+        metrics.reset()
+
+        assert metrics.snapshot() == {}
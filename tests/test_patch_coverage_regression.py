@@ -35,7 +35,7 @@ async def test_send_callback_processes_input_media_attachment(mock_bot_token):
 
     with (
         patch(
-            "maxapi.methods.send_callback.process_input_media",
+            "maxapi.utils.message.process_input_media",
             new_callable=AsyncMock,
             return_value=processed,
         ) as mock_process,
@@ -99,11 +99,14 @@ async def test_base_connection_dispatches_raw_response_on_error(
     mock_bot_token,
 ):
     bot = Bot(token=mock_bot_token)
-    bot.dispatcher = SimpleNamespace(handle_raw_response=AsyncMock())
+    bot.dispatcher = SimpleNamespace(
+        handle_raw_response=AsyncMock(),
+        has_raw_response_handlers=lambda: True,
+    )
     response = MagicMock()
     response.status = 400
     response.ok = False
-    response.json = AsyncMock(return_value={"error": "bad"})
+    response.read = AsyncMock(return_value=b'{"error": "bad"}')
     session = MagicMock()
     session.closed = False
     session.request = AsyncMock(return_value=response)
@@ -133,11 +136,14 @@ async def test_base_connection_dispatches_raw_response_on_success(
     mock_bot_token,
 ):
     bot = Bot(token=mock_bot_token)
-    bot.dispatcher = SimpleNamespace(handle_raw_response=AsyncMock())
+    bot.dispatcher = SimpleNamespace(
+        handle_raw_response=AsyncMock(),
+        has_raw_response_handlers=lambda: True,
+    )
     response = MagicMock()
     response.status = 200
     response.ok = True
-    response.json = AsyncMock(return_value={"ok": True})
+    response.read = AsyncMock(return_value=b'{"ok": true}')
     session = MagicMock()
     session.closed = False
     session.request = AsyncMock(return_value=response)
@@ -0,0 +1,174 @@
+"""Тесты приоритетов исходящих запросов."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from maxapi import Bot, Dispatcher
+from maxapi.client import (
+    DefaultConnectionProperties,
+    PriorityScheduler,
+    RequestPriority,
+    priority_scope,
+)
+from maxapi.client.priority import current_priority
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.utils import Broadcaster
+
+INTERACTIVE = RequestPriority.INTERACTIVE
+BACKGROUND = RequestPriority.BACKGROUND
+
+
+async def _order(scheduler, lanes):
+    """Занять все слоты и вернуть порядок обслуживания ``lanes``."""
+
+    for _ in range(scheduler.max_concurrency):
+        await scheduler.acquire()
+    served = []
+
+    async def wait(lane, index):
+        await scheduler.acquire(lane)
+        served.append((lane, index))
+        scheduler.release()
+
+    tasks = [
+        asyncio.ensure_future(wait(lane, i)) for i, lane in enumerate(lanes)
+    ]
+    await asyncio.sleep(0)
+    for _ in range(scheduler.max_concurrency):
+        scheduler.release()
+    await asyncio.gather(*tasks)
+    return served
+
+
+class TestPriorityScope:
+    def test_nested_scope_overrides(self):
+        assert current_priority() is RequestPriority.DEFAULT
+
+        with priority_scope(BACKGROUND), priority_scope(INTERACTIVE):
+            assert current_priority() is INTERACTIVE
+
+        with priority_scope(BACKGROUND), priority_scope(None) as priority:
+            assert priority is BACKGROUND
+
+        assert current_priority() is RequestPriority.DEFAULT
+
+
+class TestPriorityScheduler:
+    async def test_interactive_served_first(self):
+        scheduler = PriorityScheduler(1)
+
+        served = await _order(scheduler, [BACKGROUND] * 3 + [INTERACTIVE])
+
+        assert served[0] == (INTERACTIVE, 3)
+        assert scheduler.active == 0
+
+    async def test_background_not_starved(self):
+        scheduler = PriorityScheduler(
+            1, weights={INTERACTIVE: 2, BACKGROUND: 1}
+        )
+
+        served = await _order(scheduler, [INTERACTIVE] * 4 + [BACKGROUND])
+
+        lanes = [lane for lane, _ in served]
+        assert lanes.index(BACKGROUND) == 2
+
+    async def test_lane_from_context(self):
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire()
+
+        with priority_scope(INTERACTIVE):
+            waiter = asyncio.ensure_future(scheduler.acquire())
+            await asyncio.sleep(0)
+
+        assert scheduler.waiting(INTERACTIVE) == 1
+        scheduler.release()
+        await waiter
+        assert scheduler.active == 1
+
+    async def test_cancelled_waiter_releases_queue(self):
+        scheduler = PriorityScheduler(1)
+        await scheduler.acquire()
+        waiter = asyncio.ensure_future(scheduler.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert scheduler.waiting() == 0
+        scheduler.release()
+        assert scheduler.active == 0
+
+    def test_invalid_params(self):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            PriorityScheduler(0)
+        with pytest.raises(ValueError, match="веса"):
+            PriorityScheduler(weights={BACKGROUND: 0})
+
+
+class TestIntegration:
+    async def test_request_uses_slot_and_priority(self, mock_bot_token):
+        scheduler = PriorityScheduler(2)
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                priority_scheduler=scheduler
+            ),
+        )
+        response = MagicMock(status=200, ok=True)
+        response.read = AsyncMock(return_value=b'{"ok": true}')
+        session = MagicMock(closed=False)
+        session.request = AsyncMock(return_value=response)
+        bot.session = session
+        base = BaseConnection()
+        base.bot = bot
+        lanes = []
+        acquire = scheduler.acquire
+
+        async def spy(priority=None):
+            lanes.append(priority)
+            await acquire(priority)
+
+        with patch.object(scheduler, "acquire", new=spy):
+            await base.request(
+                method=HTTPMethod.GET,
+                path="/me",
+                is_return_raw=True,
+                priority=INTERACTIVE,
+            )
+            with priority_scope(BACKGROUND):
+                await base.request(
+                    method=HTTPMethod.GET, path="/me", is_return_raw=True
+                )
+
+        assert lanes == [INTERACTIVE, BACKGROUND]
+        assert scheduler.active == 0
+
+    async def test_dispatcher_handle_is_interactive(self):
+        dp = Dispatcher()
+        seen = []
+
+        async def handle_event(event_object):
+            seen.append(current_priority())
+
+        with patch.object(dp, "_handle_event", new=handle_event):
+            await dp.handle(MagicMock())
+
+        assert seen == [INTERACTIVE]
+
+    async def test_broadcast_is_background(self, mock_bot_token):
+        bot = Bot(token=mock_bot_token)
+        seen = []
+
+        async def request(self, **kwargs):
+            seen.append(current_priority())
+
+        with (
+            patch.object(BaseConnection, "request", new=request),
+            priority_scope(INTERACTIVE),
+        ):
+            await Broadcaster(bot, text="hi").run([1, 2])
+
+        assert seen == [BACKGROUND, BACKGROUND]
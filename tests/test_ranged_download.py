@@ -0,0 +1,170 @@
+"""Тесты параллельного скачивания по диапазонам."""
+
+import asyncio
+import os
+
+import pytest
+from aiohttp import web
+from maxapi.bot import Bot
+from maxapi.client import DefaultConnectionProperties
+from maxapi.connection.download import ByteRange, plan_ranges
+from maxapi.exceptions.download_file import DownloadFileError
+
+DATA = os.urandom(100_000)
+
+
+@pytest.fixture
+def bot():
+    return Bot(
+        token="test-token",
+        default_connection=DefaultConnectionProperties(
+            max_retries=1, retry_backoff_factor=0
+        ),
+    )
+
+
+@pytest.fixture
+async def server():
+    """Сервер файла; ``state`` управляет поведением, ``ranges`` — лог."""
+
+    state = {"accept_ranges": True, "honor_range": True, "broken": set()}
+    ranges = []
+
+    async def handler(request):
+        header = request.headers.get("Range")
+        ranges.append(header)
+        if header is None or not state["honor_range"]:
+            headers = {}
+            if state["accept_ranges"]:
+                headers["Accept-Ranges"] = "bytes"
+            return web.Response(body=DATA, headers=headers)
+
+        start, end = (int(x) for x in header.removeprefix("bytes=").split("-"))
+        body = DATA[start : end + 1]
+        response = web.StreamResponse(
+            status=206,
+            headers={
+                "Content-Range": f"bytes {start}-{end}/{len(DATA)}",
+                "Content-Length": str(len(body)),
+            },
+        )
+        await response.prepare(request)
+        if start in state["broken"]:
+            # обрыв посреди диапазона
+            state["broken"].discard(start)
+            await response.write(body[: len(body) // 2])
+            # даём клиенту прочитать отданную половину
+            await asyncio.sleep(0.05)
+            request.transport.close()
+            return response
+        await response.write(body)
+        return response
+
+    app = web.Application()
+    app.router.add_get("/video.mp4", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    try:
+        yield f"http://127.0.0.1:{port}/video.mp4", state, ranges
+    finally:
+        await runner.cleanup()
+
+
+async def _download(bot, url, tmp_path, **kwargs):
+    try:
+        return await bot.download_file(
+            url, tmp_path, parallel=4, min_parallel_size=1, **kwargs
+        )
+    finally:
+        await bot.close_session()
+
+
+def test_plan_ranges():
+    ranges = plan_ranges(10, 3)
+
+    assert ranges == [ByteRange(0, 3), ByteRange(4, 7), ByteRange(8, 9)]
+    assert ranges[1].header == "bytes=4-7"
+    assert plan_ranges(2, 4) == [ByteRange(0, 0), ByteRange(1, 1)]
+
+
+class TestRangedDownload:
+    async def test_parallel_download(self, bot, server, tmp_path):
+        url, _, ranges = server
+
+        path = await _download(bot, url, tmp_path)
+
+        assert path.read_bytes() == DATA
+        assert sorted(r for r in ranges if r) == sorted(
+            r.header for r in plan_ranges(len(DATA), 4)
+        )
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["video.mp4"]
+
+    async def test_small_file_single_stream(self, bot, server, tmp_path):
+        url, _, ranges = server
+
+        path = await bot.download_file(
+            url, tmp_path, parallel=4, min_parallel_size=len(DATA) + 1
+        )
+        await bot.close_session()
+
+        assert path.read_bytes() == DATA
+        assert ranges == [None]
+
+    async def test_no_accept_ranges(self, bot, server, tmp_path):
+        url, state, ranges = server
+        state["accept_ranges"] = False
+
+        path = await _download(bot, url, tmp_path)
+
+        assert path.read_bytes() == DATA
+        assert ranges == [None]
+
+    async def test_range_ignored_falls_back(self, bot, server, tmp_path):
+        url, state, _ = server
+        state["honor_range"] = False
+
+        path = await _download(bot, url, tmp_path)
+
+        assert path.read_bytes() == DATA
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["video.mp4"]
+
+    async def test_range_retries_from_offset(self, bot, server, tmp_path):
+        url, state, ranges = server
+        second = plan_ranges(len(DATA), 4)[1]
+        state["broken"].add(second.start)
+
+        path = await _download(bot, url, tmp_path)
+
+        assert path.read_bytes() == DATA
+        retried = [r for r in ranges if r and r.endswith(f"-{second.end}")]
+        assert len(retried) == 2
+        assert retried[1] != second.header
+
+    async def test_resume_after_failure(self, bot, server, tmp_path):
+        url, state, ranges = server
+        second = plan_ranges(len(DATA), 4)[1]
+        bot.default_connection.max_retries = 0
+        state["broken"].add(second.start)
+
+        with pytest.raises(DownloadFileError):
+            await _download(bot, url, tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "video.mp4.part",
+            "video.mp4.part.state.json",
+        ]
+
+        ranges.clear()
+        path = await _download(bot, url, tmp_path)
+
+        assert path.name == "video.mp4"
+        assert path.read_bytes() == DATA
+        # докачан только хвост оборванного диапазона
+        resumed_from = second.start + (second.end - second.start + 1) // 2
+        assert [r for r in ranges if r] == [
+            f"bytes={resumed_from}-{second.end}"
+        ]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["video.mp4"]
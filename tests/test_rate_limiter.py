@@ -0,0 +1,200 @@
+"""Тесты клиентского ограничения частоты запросов."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from maxapi import Bot
+from maxapi.client import DefaultConnectionProperties, RateLimiter
+from maxapi.client.endpoints import endpoint_label, resolve_api_path
+from maxapi.client.rate_limiter import TokenBucket, parse_retry_after
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.api_path import ApiPath
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.exceptions.max import MaxApiError
+
+
+def _make_response(status, *, json_data=None, headers=None):
+    resp = MagicMock()
+    resp.status = status
+    resp.ok = 200 <= status < 300
+    resp.read = AsyncMock(return_value=json.dumps(json_data or {}).encode())
+    resp.headers = headers or {}
+    return resp
+
+
+class TestEndpoints:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            (ApiPath.UPDATES, ApiPath.UPDATES),
+            ("/chats/123/members", ApiPath.CHATS),
+            ("/messages?chat_id=1", ApiPath.MESSAGES),
+            ("/unknown/1", None),
+        ],
+    )
+    def test_resolve_api_path(self, path, expected):
+        assert resolve_api_path(path) is expected
+
+    def test_endpoint_label_for_unknown_path(self):
+        assert endpoint_label("/custom/path?x=1") == "/custom/path"
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("3") == 3.0
+
+    def test_missing_uses_default(self):
+        assert parse_retry_after(None, default=1.5) == 1.5
+
+    def test_garbage_uses_default(self):
+        assert parse_retry_after("soon", default=2.0) == 2.0
+
+    def test_http_date(self):
+        value = format_datetime(
+            datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True
+        )
+        assert 25 < parse_retry_after(value) <= 30
+
+    def test_negative_clamped(self):
+        assert parse_retry_after("-5") == 0.0
+
+
+class TestTokenBucket:
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError, match="rate"):
+            TokenBucket(0)
+
+    async def test_burst_passes_without_wait(self):
+        bucket = TokenBucket(rate=100, burst=3)
+        waits = [await bucket.acquire() for _ in range(3)]
+        assert max(waits) < 0.005
+        assert bucket.stats.acquired == 3
+        assert bucket.stats.delayed == 0
+
+    async def test_paces_after_burst(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        started = monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        # 1 токен сразу + 3 по 20мс
+        assert monotonic() - started >= 0.05
+        assert bucket.stats.delayed >= 2
+        assert bucket.stats.max_wait > 0
+
+    async def test_pause_blocks_until_retry_after(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+        bucket.pause(0.05)
+        started = monotonic()
+        await bucket.acquire()
+        assert monotonic() - started >= 0.045
+        assert bucket.stats.throttled == 1
+
+
+class TestRateLimiter:
+    async def test_path_bucket_is_separate(self):
+        limiter = RateLimiter(path_rates={ApiPath.UPDATES: 1})
+        await limiter.acquire("/updates")
+        # Другой эндпоинт не ограничен
+        waited = await asyncio.wait_for(limiter.acquire("/messages"), 0.1)
+        assert waited < 0.01
+        assert set(limiter.stats()) == {"/updates"}
+
+    async def test_global_and_path_stats(self):
+        limiter = RateLimiter(100, path_rates={"/chats/1": 100})
+        await limiter.acquire("/chats/42")
+        stats = limiter.stats()
+        assert stats["*"].acquired == 1
+        assert stats["/chats"].acquired == 1
+
+    def test_on_rate_limited_without_bucket(self):
+        limiter = RateLimiter(path_rates={ApiPath.UPDATES: 2})
+        assert limiter.on_rate_limited("/messages", 1.0) is False
+        assert limiter.on_rate_limited("/updates", 1.0) is True
+
+
+class TestDefaultConnectionRateLimit:
+    def test_disabled_by_default(self):
+        assert DefaultConnectionProperties().rate_limiter is None
+
+    def test_configured(self):
+        conn = DefaultConnectionProperties(
+            rate_limit=30, path_rate_limits={ApiPath.UPDATES: 2}
+        )
+        assert isinstance(conn.rate_limiter, RateLimiter)
+        assert set(conn.rate_limiter.stats()) == {"*", "/updates"}
+
+
+class TestRequestWithRateLimit:
+    @pytest.fixture
+    def bot(self, mock_bot_token):
+        conn = DefaultConnectionProperties(
+            rate_limit=1000, max_retries=2, retry_backoff_factor=0.01
+        )
+        bot = Bot(token=mock_bot_token, default_connection=conn)
+        session = MagicMock()
+        session.closed = False
+        session.close = AsyncMock()
+        bot.session = session
+        return bot
+
+    async def test_retry_on_429_honours_retry_after(self, bot):
+        limited = _make_response(429, headers={"Retry-After": "0.05"})
+        success = _make_response(200, json_data={"ok": True})
+        bot.session.request = AsyncMock(side_effect=[limited, success])
+
+        base = BaseConnection()
+        base.bot = bot
+
+        started = monotonic()
+        result = await base.request(
+            method=HTTPMethod.GET, path="/me", is_return_raw=True
+        )
+
+        assert result == {"ok": True}
+        assert monotonic() - started >= 0.045
+        assert bot.session.request.call_count == 2
+        stats = bot.default_connection.rate_limiter.stats()["*"]
+        assert stats.throttled == 1
+        assert stats.acquired == 2
+
+    async def test_429_exhausted_raises(self, bot):
+        limited = _make_response(
+            429, json_data={"code": "too.many.requests"}, headers={}
+        )
+        bot.session.request = AsyncMock(return_value=limited)
+        bot.default_connection.rate_limiter.on_rate_limited = MagicMock(
+            return_value=True
+        )
+
+        base = BaseConnection()
+        base.bot = bot
+
+        with pytest.raises(MaxApiError) as exc_info:
+            await base.request(
+                method=HTTPMethod.GET, path="/me", is_return_raw=True
+            )
+
+        assert exc_info.value.code == 429
+        # 1 попытка + max_retries повторов
+        assert bot.session.request.call_count == 3
+
+    async def test_429_without_limiter_is_not_retried(self, mock_bot_token):
+        bot = Bot(token=mock_bot_token)
+        session = MagicMock()
+        session.closed = False
+        session.request = AsyncMock(return_value=_make_response(429))
+        bot.session = session
+
+        base = BaseConnection()
+        base.bot = bot
+
+        with pytest.raises(MaxApiError):
+            await base.request(
+                method=HTTPMethod.GET, path="/me", is_return_raw=True
+            )
+        assert session.request.call_count == 1
@@ -0,0 +1,136 @@
+"""Тесты политик ожидания готовности вложений."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from maxapi import Bot
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions.max import MaxApiError
+from maxapi.methods.send_message import SendMessage
+from maxapi.types.attachments.upload import AttachmentPayload, AttachmentUpload
+from maxapi.types.input_media import InputMediaBuffer
+from maxapi.utils import (
+    AdaptiveReadinessPolicy,
+    FixedReadinessPolicy,
+)
+from maxapi.utils.readiness import size_bucket
+
+IMAGE = InputMediaBuffer(b"i" * 2048, type=UploadType.IMAGE)
+VIDEO = InputMediaBuffer(b"v" * 2048, type=UploadType.VIDEO)
+
+
+class TestDefaultPolicy:
+    def test_bot_default_uses_fixed_delays(self, mock_bot_token):
+        bot = Bot(
+            token=mock_bot_token,
+            after_input_media_delay=3.0,
+            after_upload_retry_delay=1.5,
+        )
+
+        policy = bot.readiness_policy
+
+        assert isinstance(policy, FixedReadinessPolicy)
+        assert policy.initial_delay([VIDEO]) == 3.0
+        assert policy.retry_delay(4, [VIDEO]) == 1.5
+
+    def test_custom_policy(self, mock_bot_token):
+        policy = AdaptiveReadinessPolicy()
+        bot = Bot(token=mock_bot_token, readiness_policy=policy)
+
+        assert bot.readiness_policy is policy
+
+
+class TestAdaptiveReadinessPolicy:
+    def test_instant_types_skip_initial_delay(self):
+        policy = AdaptiveReadinessPolicy(base_delay=0.5)
+
+        assert policy.initial_delay([IMAGE]) == 0.0
+        assert policy.initial_delay([IMAGE, VIDEO]) == 0.5
+
+    def test_retry_delay_grows_with_jitter(self):
+        policy = AdaptiveReadinessPolicy(
+            base_delay=0.25, max_delay=1.0, jitter=0.5
+        )
+
+        with patch("maxapi.utils.readiness.random.uniform", return_value=0):
+            delays = [policy.retry_delay(i, [VIDEO]) for i in range(4)]
+        assert delays == [0.25, 0.5, 1.0, 1.0]
+
+        for _ in range(50):
+            assert 0.125 <= policy.retry_delay(0, [VIDEO]) <= 0.375
+
+    def test_learns_per_type_and_size(self):
+        policy = AdaptiveReadinessPolicy(base_delay=0.25)
+        big_video = InputMediaBuffer(b"v" * 1_000_000, type=UploadType.VIDEO)
+
+        for elapsed in (3.0, 4.0, 5.0):
+            policy.record_ready([big_video], elapsed=elapsed, attempts=3)
+
+        assert policy.initial_delay([big_video]) == 4.0
+        assert policy.initial_delay([VIDEO]) == 0.25
+
+    def test_first_try_success_shrinks_estimate(self):
+        policy = AdaptiveReadinessPolicy()
+
+        policy.record_ready([VIDEO], elapsed=2.0, attempts=1)
+
+        assert policy.estimate(VIDEO) == 1.5
+
+    def test_instant_types_ignore_history(self):
+        policy = AdaptiveReadinessPolicy()
+
+        policy.record_ready([IMAGE, VIDEO], elapsed=2.0, attempts=2)
+
+        assert policy.estimate(IMAGE) == 0.0
+        assert policy.estimate(VIDEO) == 2.0
+
+    def test_invalid_params(self):
+        with pytest.raises(ValueError, match="jitter"):
+            AdaptiveReadinessPolicy(jitter=2)
+
+    def test_size_buckets(self):
+        assert size_bucket(0) == 0
+        assert size_bucket(1024) < size_bucket(1024 * 1024)
+        assert size_bucket(1024 * 1024) == size_bucket(1024 * 1024 + 1)
+
+
+async def test_send_message_uses_policy(mock_bot_token):
+    policy = MagicMock(wraps=AdaptiveReadinessPolicy(base_delay=0.1))
+    bot = Bot(token=mock_bot_token, readiness_policy=policy)
+    upload = AttachmentUpload(
+        type=UploadType.VIDEO, payload=AttachmentPayload(token="t")
+    )
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    with (
+        patch(
+            "maxapi.methods.send_message.process_input_media_batch",
+            new=AsyncMock(return_value=[upload]),
+        ),
+        patch.object(
+            BaseConnection,
+            "request",
+            new=AsyncMock(
+                side_effect=[
+                    MaxApiError(
+                        code=400, raw={"code": "attachment.not.ready"}
+                    ),
+                    MagicMock(),
+                ]
+            ),
+        ),
+        patch("maxapi.methods.send_message.asyncio.sleep", new=fake_sleep),
+    ):
+        await SendMessage(bot=bot, chat_id=1, attachments=[VIDEO]).fetch()
+
+    assert sleeps[0] == 0.1
+    policy.retry_delay.assert_called_once_with(0, [VIDEO])
+    policy.record_ready.assert_called_once()
+    assert policy.record_ready.call_args.kwargs == {
+        "elapsed": sum(sleeps),
+        "attempts": 2,
+    }
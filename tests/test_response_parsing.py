@@ -0,0 +1,157 @@
+"""Тесты разбора ответов API из байтов в модели."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from maxapi import Bot, Dispatcher, Router
+from maxapi.client import DefaultConnectionProperties, JsonCodec
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.exceptions.max import MaxApiError
+from maxapi.types.chats import Chat
+
+CHAT_PAYLOAD = {
+    "chat_id": 7,
+    "type": "chat",
+    "status": "active",
+    "last_event_time": 0,
+    "participants_count": 2,
+    "is_public": False,
+}
+
+
+def _response(status, body):
+    resp = MagicMock()
+    resp.status = status
+    resp.ok = 200 <= status < 300
+    resp.read = AsyncMock(return_value=body)
+    return resp
+
+
+@pytest.fixture
+def counting_bot(mock_bot_token):
+    calls = []
+
+    def loads(data):
+        calls.append(data)
+        return json.loads(data)
+
+    codec = JsonCodec(json.dumps, loads, name="counting")
+    bot = Bot(
+        token=mock_bot_token,
+        default_connection=DefaultConnectionProperties(json_codec=codec),
+    )
+    session = MagicMock()
+    session.closed = False
+    bot.session = session
+    bot.loads_calls = calls
+    return bot
+
+
+def _connection(bot):
+    base = BaseConnection()
+    base.bot = bot
+    return base
+
+
+class TestModelFastPath:
+    async def test_model_validated_from_bytes(self, counting_bot):
+        counting_bot.session.request = AsyncMock(
+            return_value=_response(200, json.dumps(CHAT_PAYLOAD).encode())
+        )
+
+        chat = await _connection(counting_bot).request(
+            method=HTTPMethod.GET, path="/chats/7", model=Chat
+        )
+
+        assert isinstance(chat, Chat)
+        assert chat.chat_id == 7
+        assert chat.bot is counting_bot
+        assert counting_bot.loads_calls == []
+
+    async def test_dispatcher_without_raw_handlers_keeps_fast_path(
+        self, counting_bot
+    ):
+        counting_bot.dispatcher = Dispatcher()
+        counting_bot.session.request = AsyncMock(
+            return_value=_response(200, json.dumps(CHAT_PAYLOAD).encode())
+        )
+
+        with patch("asyncio.create_task") as create_task:
+            await _connection(counting_bot).request(
+                method=HTTPMethod.GET, path="/chats/7", model=Chat
+            )
+
+        create_task.assert_not_called()
+        assert counting_bot.loads_calls == []
+
+    async def test_raw_handlers_receive_dict(self, counting_bot):
+        dp = Dispatcher()
+        router = Router()
+        received = []
+
+        @router.raw_api_response()
+        async def on_raw(event):
+            received.append(event)
+
+        dp.include_routers(router)
+        counting_bot.dispatcher = dp
+        counting_bot.session.request = AsyncMock(
+            return_value=_response(200, json.dumps(CHAT_PAYLOAD).encode())
+        )
+
+        with patch("asyncio.create_task") as create_task:
+            chat = await _connection(counting_bot).request(
+                method=HTTPMethod.GET, path="/chats/7", model=Chat
+            )
+        await create_task.call_args.args[0]
+
+        assert chat.chat_id == 7
+        assert len(counting_bot.loads_calls) == 1
+        assert received == [CHAT_PAYLOAD]
+
+
+class TestRawAndErrorBodies:
+    async def test_empty_body_returns_none(self, counting_bot):
+        counting_bot.session.request = AsyncMock(
+            return_value=_response(200, b"")
+        )
+
+        result = await _connection(counting_bot).request(
+            method=HTTPMethod.POST, path="/answers", is_return_raw=True
+        )
+
+        assert result is None
+
+    async def test_non_json_error_body(self, counting_bot):
+        counting_bot.session.request = AsyncMock(
+            return_value=_response(400, b"<html>Bad Request</html>")
+        )
+
+        with pytest.raises(MaxApiError) as exc_info:
+            await _connection(counting_bot).request(
+                method=HTTPMethod.GET, path="/me", is_return_raw=True
+            )
+
+        assert exc_info.value.code == 400
+        assert exc_info.value.raw == {"error": "<html>Bad Request</html>"}
+
+
+class TestHasRawResponseHandlers:
+    def test_empty_dispatcher(self):
+        assert Dispatcher().has_raw_response_handlers() is False
+
+    def test_nested_router_handler(self):
+        dp = Dispatcher()
+        parent = Router("parent")
+        child = Router("child")
+
+        @child.raw_api_response()
+        async def on_raw(event):
+            pass
+
+        parent.include_routers(child)
+        dp.include_routers(parent)
+
+        assert dp.has_raw_response_handlers() is True
@@ -1,5 +1,6 @@
 """Тесты retry-механизма для серверных ошибок (502, 503, 504)."""
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -23,9 +24,8 @@ def _make_response(status, *, ok=None, json_data=None):
     resp = MagicMock()
     resp.status = status
     resp.ok = ok if ok is not None else (200 <= status < 300)
-    resp.read = AsyncMock()
-    if json_data is not None:
-        resp.json = AsyncMock(return_value=json_data)
+    body = json.dumps(json_data).encode() if json_data is not None else b""
+    resp.read = AsyncMock(return_value=body)
     return resp
 
 
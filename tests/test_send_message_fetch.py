@@ -1,8 +1,11 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 from maxapi.connection.base import BaseConnection
+from maxapi.enums.upload_type import UploadType
 from maxapi.methods.send_message import SendMessage
 from maxapi.types.attachments.buttons.callback_button import CallbackButton
+from maxapi.types.attachments.upload import AttachmentPayload, AttachmentUpload
+from maxapi.types.input_media import InputMediaBuffer
 from maxapi.utils.inline_keyboard import InlineKeyboardBuilder
 
 
@@ -27,3 +30,45 @@ async def test_send_message_fetch_skips_empty_inline_keyboard(bot):
     assert len(attachments) == 1
     assert attachments[0]["type"] == "inline_keyboard"
     assert attachments[0]["payload"]["buttons"][0][0]["text"] == "ok"
+
+
+async def test_send_message_fetch_keeps_order_with_uploads(bot):
+    bot.after_input_media_delay = 0
+    uploads = [
+        AttachmentUpload(
+            type=UploadType.IMAGE, payload=AttachmentPayload(token=f"t{i}")
+        )
+        for i in range(2)
+    ]
+    method = SendMessage(
+        bot=bot,
+        chat_id=1,
+        attachments=[
+            InputMediaBuffer(b"a", type=UploadType.IMAGE),
+            InlineKeyboardBuilder()
+            .row(CallbackButton(text="ok", payload="payload"))
+            .as_markup(),
+            InputMediaBuffer(b"b", type=UploadType.IMAGE),
+        ],
+    )
+
+    with (
+        patch(
+            "maxapi.methods.send_message.process_input_media_batch",
+            new=AsyncMock(return_value=uploads),
+        ) as batch,
+        patch.object(
+            BaseConnection, "request", new=AsyncMock(return_value=Mock())
+        ) as mocked_request,
+    ):
+        await method.fetch()
+
+    assert len(batch.call_args.kwargs["attachments"]) == 2
+    attachments = mocked_request.call_args.kwargs["json"]["attachments"]
+    assert [a["type"] for a in attachments] == [
+        "image",
+        "inline_keyboard",
+        "image",
+    ]
+    assert attachments[0]["payload"]["token"] == "t0"
+    assert attachments[2]["payload"]["token"] == "t1"
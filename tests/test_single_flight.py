@@ -0,0 +1,225 @@
+"""Тесты объединения одинаковых параллельных GET-запросов."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from maxapi import Bot
+from maxapi.client import DefaultConnectionProperties, SingleFlight
+from maxapi.client.single_flight import make_request_key
+from maxapi.enums.http_method import HTTPMethod
+from maxapi.types.chats import Chat
+
+
+def _chat_payload(chat_id):
+    return {
+        "chat_id": chat_id,
+        "type": "chat",
+        "status": "active",
+        "last_event_time": 0,
+        "participants_count": 2,
+        "is_public": False,
+    }
+
+
+@pytest.fixture
+def coalescing_bot(mock_bot_token):
+    bot = Bot(
+        token=mock_bot_token,
+        default_connection=DefaultConnectionProperties(
+            coalesce_get_requests=True
+        ),
+    )
+    session = MagicMock()
+    session.closed = False
+    bot.session = session
+    return bot
+
+
+def _slow_response(payload):
+    async def _request(**kwargs):
+        await asyncio.sleep(0.01)
+        resp = MagicMock()
+        resp.status = 200
+        resp.ok = True
+        resp.read = AsyncMock(return_value=json.dumps(payload).encode())
+        return resp
+
+    return _request
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(
+            *(flight.do("k", work) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert flight.shared == 4
+        assert len(flight) == 0
+
+    async def test_error_is_shared_and_key_released(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flight) == 0
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == 42
+
+
+class TestMakeRequestKey:
+    def test_same_params_same_key(self):
+        key1 = make_request_key(
+            "GET",
+            "/chats/1",
+            Chat,
+            bot_key=1,
+            is_return_raw=False,
+            kwargs={"params": {"a": 1, "b": [1, 2]}},
+        )
+        key2 = make_request_key(
+            "GET",
+            "/chats/1",
+            Chat,
+            bot_key=1,
+            is_return_raw=False,
+            kwargs={"params": {"b": [1, 2], "a": 1}},
+        )
+        assert key1 == key2
+
+    def test_body_disables_coalescing(self):
+        assert (
+            make_request_key(
+                "GET",
+                "/chats/1",
+                Chat,
+                bot_key=1,
+                is_return_raw=False,
+                kwargs={"json": {}},
+            )
+            is None
+        )
+
+    def test_unhashable_param_disables_coalescing(self):
+        assert (
+            make_request_key(
+                "GET",
+                "/chats",
+                Chat,
+                bot_key=1,
+                is_return_raw=False,
+                kwargs={"params": {"x": {"nested": 1}}},
+            )
+            is None
+        )
+
+
+class TestRequestCoalescing:
+    def test_disabled_by_default(self):
+        assert DefaultConnectionProperties().single_flight is None
+
+    async def test_get_chat_by_id_coalesced(self, coalescing_bot):
+        coalescing_bot.session.request = AsyncMock(
+            side_effect=_slow_response(_chat_payload(7))
+        )
+
+        chats = await asyncio.gather(
+            *(coalescing_bot.get_chat_by_id(7) for _ in range(10))
+        )
+
+        assert coalescing_bot.session.request.call_count == 1
+        assert all(chat is chats[0] for chat in chats)
+        assert chats[0].chat_id == 7
+
+    async def test_different_ids_not_coalesced(self, coalescing_bot):
+        coalescing_bot.session.request = AsyncMock(
+            side_effect=_slow_response(_chat_payload(7))
+        )
+
+        await asyncio.gather(
+            coalescing_bot.get_chat_by_id(7),
+            coalescing_bot.get_chat_by_id(8),
+        )
+
+        assert coalescing_bot.session.request.call_count == 2
+
+    async def test_different_bots_not_coalesced(self, mock_bot_token):
+        properties = DefaultConnectionProperties(coalesce_get_requests=True)
+        session = MagicMock(closed=False)
+        session.request = AsyncMock(
+            side_effect=_slow_response(_chat_payload(7))
+        )
+        bots = [
+            Bot(token=token, default_connection=properties)
+            for token in (mock_bot_token, "other-token")
+        ]
+        for bot in bots:
+            bot.session = session
+
+        chats = await asyncio.gather(*(bot.get_chat_by_id(7) for bot in bots))
+
+        assert session.request.call_count == 2
+        assert chats[0] is not chats[1]
+
+    async def test_post_not_coalesced(self, coalescing_bot):
+        coalescing_bot.session.request = AsyncMock(
+            side_effect=_slow_response({"success": True})
+        )
+
+        await asyncio.gather(
+            *(
+                coalescing_bot.request(
+                    method=HTTPMethod.POST,
+                    path="/answers",
+                    is_return_raw=True,
+                    params={},
+                )
+                for _ in range(3)
+            )
+        )
+
+        assert coalescing_bot.session.request.call_count == 3
+
+    async def test_updates_not_coalesced(self, coalescing_bot):
+        coalescing_bot.session.request = AsyncMock(
+            side_effect=_slow_response({"updates": [], "marker": 1})
+        )
+
+        await asyncio.gather(
+            coalescing_bot.get_updates(), coalescing_bot.get_updates()
+        )
+
+        assert coalescing_bot.session.request.call_count == 2
@@ -0,0 +1,185 @@
+"""Тесты потоковой загрузки файлов с прогрессом и повторами."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aiohttp import ClientConnectionError, ClientSession, web
+from aiohttp.test_utils import TestServer
+from maxapi.client import DefaultConnectionProperties
+from maxapi.connection.base import BaseConnection
+from maxapi.connection.upload import StreamPayload, UploadProgress
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions.max import MaxConnection, MaxUploadFileFailed
+
+
+class _Writer:
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, chunk):
+        self.chunks.append(bytes(chunk))
+
+
+def _connection(session, **conn_kwargs):
+    conn = BaseConnection()
+    bot = Mock()
+    bot.default_connection = DefaultConnectionProperties(
+        retry_backoff_factor=0, **conn_kwargs
+    )
+    bot.ensure_upload_session = AsyncMock(return_value=session)
+    conn.bot = bot
+    return conn
+
+
+def _response(status, text='{"token":"t"}'):
+    response = AsyncMock()
+    response.status = status
+    response.text = AsyncMock(return_value=text)
+    cm = AsyncMock()
+    cm.__aenter__.return_value = response
+    cm.__aexit__.return_value = False
+    return cm
+
+
+class TestStreamPayload:
+    async def test_file_streamed_in_chunks(self, tmp_path):
+        data = bytes(range(256)) * 40
+        path = tmp_path / "big.bin"
+        path.write_bytes(data)
+        events = []
+
+        payload = StreamPayload(
+            str(path),
+            filename="big.bin",
+            content_type="application/octet-stream",
+            chunk_size=1024,
+            progress=events.append,
+        )
+        writer = _Writer()
+        await payload.write(writer)
+
+        assert payload.size == len(data)
+        assert b"".join(writer.chunks) == data
+        assert max(len(c) for c in writer.chunks) <= 1024
+        expected = [*range(1024, len(data), 1024), len(data)]
+        assert [e.sent for e in events] == expected
+        assert events[-1].fraction == 1.0
+        assert events[-1].filename == "big.bin"
+
+    async def test_buffer_with_async_callback(self):
+        events = []
+
+        async def on_progress(progress: UploadProgress):
+            events.append(progress)
+
+        payload = StreamPayload(
+            b"x" * 10,
+            filename="a.txt",
+            content_type="text/plain",
+            chunk_size=4,
+            progress=on_progress,
+            attempt=3,
+        )
+        writer = _Writer()
+        await payload.write(writer)
+
+        assert writer.chunks == [b"xxxx", b"xxxx", b"xx"]
+        assert [e.sent for e in events] == [4, 8, 10]
+        assert {e.attempt for e in events} == {3}
+        assert payload.decode() == "x" * 10
+
+    def test_progress_fraction_for_empty_file(self):
+        progress = UploadProgress(filename="e", sent=0, total=0, elapsed=0)
+        assert progress.fraction == 1.0
+        assert progress.speed == 0.0
+
+
+class TestUploadRetries:
+    async def test_retry_rebuilds_payload(self, tmp_path):
+        path = tmp_path / "doc.txt"
+        path.write_bytes(b"hello")
+        session = Mock()
+        session.post = Mock(
+            side_effect=[
+                ClientConnectionError("reset"),
+                _response(502),
+                _response(200),
+            ]
+        )
+        events = []
+
+        result = await _connection(session).upload_file(
+            url="https://upload.example/",
+            path=str(path),
+            type=UploadType.FILE,
+            progress=events.append,
+        )
+
+        assert result == '{"token":"t"}'
+        payloads = [
+            call.kwargs["data"]._fields[0][2]
+            for call in session.post.call_args_list
+        ]
+        assert len({id(p) for p in payloads}) == 3
+        assert [p._attempt for p in payloads] == [1, 2, 3]
+
+    async def test_exhausted_server_errors(self):
+        session = Mock()
+        session.post = Mock(side_effect=lambda **_: _response(503))
+
+        with pytest.raises(MaxUploadFileFailed, match="HTTP 503"):
+            await _connection(session, max_retries=1).upload_file_buffer(
+                filename="f",
+                url="https://upload.example/",
+                buffer=b"data",
+                type=UploadType.FILE,
+            )
+
+        assert session.post.call_count == 2
+
+    async def test_exhausted_connection_errors(self):
+        session = Mock()
+        session.post = Mock(side_effect=ClientConnectionError("down"))
+
+        with pytest.raises(MaxConnection):
+            await _connection(session, max_retries=0).upload_file_buffer(
+                filename="f",
+                url="https://upload.example/",
+                buffer=b"data",
+                type=UploadType.FILE,
+            )
+
+
+async def test_streamed_upload_received_by_server(tmp_path):
+    data = b"0123456789" * 50_000
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+    received = {}
+
+    async def handler(request: web.Request):
+        received["length"] = request.content_length
+        reader = await request.multipart()
+        part = await reader.next()
+        received["filename"] = part.filename
+        received["content_type"] = part.headers["Content-Type"]
+        received["data"] = await part.read()
+        return web.Response(text='{"token":"t"}')
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    events = []
+
+    async with TestServer(app) as server, ClientSession() as session:
+        result = await _connection(session).upload_file(
+            url=str(server.make_url("/")),
+            path=str(path),
+            type=UploadType.VIDEO,
+            progress=events.append,
+        )
+
+    assert result == '{"token":"t"}'
+    assert received["data"] == data
+    assert received["filename"] == "video.mp4"
+    assert received["content_type"] == "video/mp4"
+    assert received["length"] is not None
+    assert events[-1].sent == len(data)
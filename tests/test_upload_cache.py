@@ -0,0 +1,293 @@
+"""Тесты кеша токенов загрузки."""
+
+import asyncio
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from maxapi import Bot
+from maxapi.connection.base import BaseConnection
+from maxapi.enums.upload_type import UploadType
+from maxapi.exceptions.max import MaxApiError
+from maxapi.methods.send_message import SendMessage
+from maxapi.types.input_media import InputMedia, InputMediaBuffer
+from maxapi.utils import (
+    FileUploadCache,
+    MemoryUploadCache,
+    RedisUploadCache,
+)
+from maxapi.utils.message import process_input_media
+from maxapi.utils.upload_cache import input_media_cache_key
+
+
+def _bot(cache):
+    bot = Mock()
+    bot.upload_cache = cache
+    bot.get_upload_url = AsyncMock(
+        return_value=SimpleNamespace(url="https://upload.local", token=None)
+    )
+    return bot
+
+
+def _connection(*tokens):
+    base_connection = Mock()
+    base_connection.upload_file_buffer = AsyncMock(
+        side_effect=[f'{{"token":"{token}"}}' for token in tokens]
+    )
+    base_connection.upload_file = base_connection.upload_file_buffer
+    return base_connection
+
+
+class TestCacheKeys:
+    async def test_same_content_same_key(self, tmp_path):
+        path = tmp_path / "logo.png"
+        path.write_bytes(b"logo")
+
+        from_file = await input_media_cache_key(
+            InputMedia(str(path), type=UploadType.IMAGE)
+        )
+        from_buffer = await input_media_cache_key(
+            InputMediaBuffer(b"logo", type=UploadType.IMAGE)
+        )
+
+        assert from_file == from_buffer
+
+    async def test_upload_type_is_part_of_key(self):
+        image = await input_media_cache_key(
+            InputMediaBuffer(b"x", type=UploadType.IMAGE)
+        )
+        file = await input_media_cache_key(
+            InputMediaBuffer(b"x", type=UploadType.FILE)
+        )
+
+        assert image != file
+
+    async def test_large_buffer_hashed_in_thread(self):
+        small = InputMediaBuffer(b"x", type=UploadType.FILE)
+        large = InputMediaBuffer(
+            b"x" * (2 * 1024 * 1024), type=UploadType.FILE
+        )
+
+        with patch(
+            "maxapi.utils.upload_cache.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as to_thread:
+            await input_media_cache_key(small)
+            to_thread.assert_not_called()
+
+            key = await input_media_cache_key(large)
+
+        to_thread.assert_called_once()
+        assert key == await input_media_cache_key(
+            InputMediaBuffer(large.buffer, type=UploadType.FILE)
+        )
+
+    async def test_stat_key_changes_with_mtime(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"v1")
+        media = InputMedia(str(path), type=UploadType.FILE)
+
+        first = await input_media_cache_key(media, stat_keys=True)
+        os.utime(path, ns=(0, 1_000_000_000))
+        second = await input_media_cache_key(media, stat_keys=True)
+
+        assert first != second
+        assert ":stat:" in first
+
+
+class TestMemoryUploadCache:
+    async def test_ttl_and_lru(self):
+        cache = MemoryUploadCache(max_size=2, ttl=10)
+        with patch("maxapi.utils.upload_cache.monotonic", return_value=0):
+            await cache.set("a", "ta")
+            await cache.set("b", "tb")
+            assert await cache.get("a") == "ta"
+            await cache.set("c", "tc")
+            assert await cache.get("b") is None
+        with patch("maxapi.utils.upload_cache.monotonic", return_value=11):
+            assert await cache.get("a") is None
+
+    async def test_delete_reports_existing(self):
+        cache = MemoryUploadCache()
+        await cache.set("a", "ta")
+
+        assert await cache.delete("a") is True
+        assert await cache.delete("a") is False
+
+    def test_invalid_ttl(self):
+        with pytest.raises(ValueError, match="ttl"):
+            MemoryUploadCache(ttl=0)
+
+
+class TestFileUploadCache:
+    async def test_persists_between_instances(self, tmp_path):
+        await FileUploadCache(tmp_path).set("key", "token")
+
+        cache = FileUploadCache(tmp_path)
+        assert await cache.get("key") == "token"
+        assert await cache.delete("key") is True
+        assert await cache.get("key") is None
+
+    async def test_directory_created_on_first_write(self, tmp_path):
+        directory = tmp_path / "nested" / "cache"
+        cache = FileUploadCache(directory)
+
+        assert not directory.exists()
+        assert await cache.get("key") is None
+        assert await cache.delete("key") is False
+
+        await cache.set("key", "token")
+
+        assert await cache.get("key") == "token"
+
+    async def test_concurrent_writes_same_key(self, tmp_path):
+        caches = [FileUploadCache(tmp_path) for _ in range(5)]
+
+        await asyncio.gather(
+            *(cache.set("key", f"t{i}") for i, cache in enumerate(caches))
+        )
+
+        assert await caches[0].get("key") in {f"t{i}" for i in range(5)}
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    async def test_failed_write_is_not_fatal(self, tmp_path):
+        cache = FileUploadCache(tmp_path)
+
+        with patch(
+            "maxapi.utils.upload_cache.aiofiles.os.replace",
+            side_effect=FileNotFoundError,
+        ):
+            await cache.set("key", "token")
+
+        assert await cache.get("key") is None
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    async def test_expired_entry(self, tmp_path):
+        cache = FileUploadCache(tmp_path, ttl=5)
+        with patch("maxapi.utils.upload_cache.time", return_value=100):
+            await cache.set("key", "token")
+        with patch("maxapi.utils.upload_cache.time", return_value=106):
+            assert await cache.get("key") is None
+
+        await cache.set("other", "token")
+        await cache.clear()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRedisUploadCache:
+    async def test_set_get_delete(self):
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=b"token")
+        redis.delete = AsyncMock(return_value=1)
+        cache = RedisUploadCache(redis, ttl=60)
+
+        await cache.set("key", "token")
+        assert await cache.get("key") == "token"
+        assert await cache.delete("key") is True
+
+        redis.set.assert_awaited_once_with(
+            "maxapi:upload:key", "token", px=60_000
+        )
+        redis.get.assert_awaited_once_with("maxapi:upload:key")
+
+
+class TestProcessInputMediaWithCache:
+    async def test_cache_write_error_keeps_upload(self):
+        cache = MemoryUploadCache()
+        cache.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        base_connection = _connection("t1")
+        media = InputMediaBuffer(b"logo", type=UploadType.FILE)
+
+        uploaded = await process_input_media(
+            base_connection, _bot(cache), media
+        )
+
+        assert uploaded.payload.token == "t1"
+
+    async def test_second_send_skips_upload(self):
+        cache = MemoryUploadCache()
+        bot = _bot(cache)
+        base_connection = _connection("t1")
+        media = InputMediaBuffer(b"logo", type=UploadType.FILE)
+
+        first = await process_input_media(base_connection, bot, media)
+        second = await process_input_media(base_connection, bot, media)
+
+        assert first.payload.token == second.payload.token == "t1"
+        bot.get_upload_url.assert_awaited_once()
+        base_connection.upload_file_buffer.assert_awaited_once()
+
+
+async def test_send_message_reuploads_rejected_cached_token(mock_bot_token):
+    cache = MemoryUploadCache()
+    bot = Bot(token=mock_bot_token, upload_cache=cache)
+    media = InputMediaBuffer(b"logo", type=UploadType.FILE)
+    await cache.set(await input_media_cache_key(media), "stale")
+
+    sent_tokens = []
+
+    async def request(self, *, json, **_):
+        token = json["attachments"][0]["payload"]["token"]
+        sent_tokens.append(token)
+        if token == "stale":
+            raise MaxApiError(code=400, raw={"code": "attachment.invalid"})
+        return Mock()
+
+    with (
+        patch.object(
+            BaseConnection,
+            "upload_file_buffer",
+            new=AsyncMock(return_value='{"token":"fresh"}'),
+        ),
+        patch.object(
+            Bot,
+            "get_upload_url",
+            new=AsyncMock(
+                return_value=SimpleNamespace(url="https://u", token=None)
+            ),
+        ),
+        patch.object(BaseConnection, "request", new=request),
+    ):
+        await SendMessage(
+            bot=bot,
+            chat_id=1,
+            attachments=[media],
+            sleep_after_input_media=False,
+        ).fetch()
+
+    assert sent_tokens == ["stale", "fresh"]
+    assert await cache.get(await input_media_cache_key(media)) == "fresh"
+
+
+async def test_send_message_does_not_reupload_fresh_token(mock_bot_token):
+    cache = MemoryUploadCache()
+    bot = Bot(token=mock_bot_token, upload_cache=cache)
+    media = InputMediaBuffer(b"logo", type=UploadType.FILE)
+    upload = AsyncMock(return_value='{"token":"fresh"}')
+    request = AsyncMock(
+        side_effect=MaxApiError(code=400, raw={"code": "text.invalid"})
+    )
+
+    with (
+        patch.object(BaseConnection, "upload_file_buffer", new=upload),
+        patch.object(
+            Bot,
+            "get_upload_url",
+            new=AsyncMock(
+                return_value=SimpleNamespace(url="https://u", token=None)
+            ),
+        ),
+        patch.object(BaseConnection, "request", new=request),
+        pytest.raises(MaxApiError),
+    ):
+        await SendMessage(
+            bot=bot,
+            chat_id=1,
+            attachments=[media],
+            sleep_after_input_media=False,
+        ).fetch()
+
+    upload.assert_awaited_once()
+    request.assert_awaited_once()
+    assert await cache.get(await input_media_cache_key(media)) == "fresh"
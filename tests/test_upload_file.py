@@ -2,8 +2,10 @@
 
 from unittest.mock import AsyncMock, Mock, patch
 
+import puremagic
 import pytest
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
+from maxapi import Bot
 from maxapi.client.default import DefaultConnectionProperties
 from maxapi.connection.base import BaseConnection
 from maxapi.enums.upload_type import UploadType
@@ -11,11 +13,11 @@ from maxapi.types.input_media import InputMedia, InputMediaBuffer
 
 
 def _make_connection_with_bot(*, session=None):
-    """Создаёт BaseConnection с замоканным ботом."""
+    """Создаёт BaseConnection с замоканным ботом и сессией загрузок."""
     conn = BaseConnection()
     bot = Mock()
     bot.default_connection = DefaultConnectionProperties()
-    bot.session = session
+    bot.ensure_upload_session = AsyncMock(return_value=session)
     conn.bot = bot
     return conn, bot
 
@@ -84,119 +86,108 @@ class TestUploadFileMimetypesFallback:
         mock_session.post.assert_called_once()
 
 
-class TestUploadFileTempSession:
-    """Тесты для fallback ClientSession с timeout в upload_file."""
+class TestUploadSession:
+    """Тесты отдельной сессии загрузок бота."""
 
     @pytest.mark.asyncio
-    async def test_temp_session_with_timeout_when_no_session(self, tmp_path):
-        """Если bot.session is None, создаётся временная сессия с timeout."""
+    async def test_upload_posts_through_upload_session(self, tmp_path):
+        """upload_file отправляет файл через ensure_upload_session."""
         test_file = tmp_path / "doc.pdf"
         test_file.write_bytes(b"fake-pdf")
 
         mock_response = AsyncMock()
         mock_response.text = AsyncMock(return_value='{"token":"t"}')
 
-        conn, bot = _make_connection_with_bot(session=None)
-        expected_timeout = bot.default_connection.timeout
-
         mock_cm = AsyncMock()
         mock_cm.__aenter__.return_value = mock_response
         mock_cm.__aexit__.return_value = False
 
-        mock_temp_session = AsyncMock()
-        mock_temp_session.post = Mock(return_value=mock_cm)
-
-        with patch(
-            "maxapi.connection.base.ClientSession",
-        ) as mock_cs_cls:
-            mock_cs_cls.return_value.__aenter__ = AsyncMock(
-                return_value=mock_temp_session
-            )
-            mock_cs_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-            await conn.upload_file(
-                url="https://upload.example.com",
-                path=str(test_file),
-                type=UploadType.FILE,
-            )
-
-            mock_cs_cls.assert_called_once()
-            kwargs = mock_cs_cls.call_args.kwargs
-            assert kwargs["timeout"] is expected_timeout
-            assert "connector" in kwargs
-            mock_temp_session.post.assert_called_once()
+        upload_session = AsyncMock(spec=ClientSession)
+        upload_session.post = Mock(return_value=mock_cm)
 
-    @pytest.mark.asyncio
-    async def test_temp_session_with_timeout_when_session_closed(
-        self, tmp_path
-    ):
-        """Если bot.session.closed=True, создаётся временная сессия."""
-        test_file = tmp_path / "doc.txt"
-        test_file.write_bytes(b"data")
-
-        mock_response = AsyncMock()
-        mock_response.text = AsyncMock(return_value='{"token":"t"}')
-
-        closed_session = Mock(spec=ClientSession)
-        closed_session.closed = True
+        conn, bot = _make_connection_with_bot(session=upload_session)
 
-        conn, bot = _make_connection_with_bot(session=closed_session)
-        expected_timeout = bot.default_connection.timeout
+        result = await conn.upload_file(
+            url="https://upload.example.com",
+            path=str(test_file),
+            type=UploadType.FILE,
+        )
 
-        mock_cm = AsyncMock()
-        mock_cm.__aenter__.return_value = mock_response
-        mock_cm.__aexit__.return_value = False
+        assert result == '{"token":"t"}'
+        bot.ensure_upload_session.assert_awaited_once()
+        upload_session.post.assert_called_once()
 
-        mock_temp_session = AsyncMock()
-        mock_temp_session.post = Mock(return_value=mock_cm)
+    @pytest.mark.asyncio
+    async def test_upload_session_is_reused(self, mock_bot_token):
+        """Сессия загрузок создаётся один раз и переиспользуется."""
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                upload_timeout=42, upload_limit=3, upload_limit_per_host=2
+            ),
+        )
+        try:
+            first = await bot.ensure_upload_session()
+            second = await bot.ensure_upload_session()
 
-        with patch(
-            "maxapi.connection.base.ClientSession",
-        ) as mock_cs_cls:
-            mock_cs_cls.return_value.__aenter__ = AsyncMock(
-                return_value=mock_temp_session
-            )
-            mock_cs_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-            await conn.upload_file(
-                url="https://upload.example.com",
-                path=str(test_file),
-                type=UploadType.FILE,
-            )
+            assert first is second
+            assert first is not await bot.ensure_session()
+            assert first.timeout.total == 42
+            assert first.connector.limit == 3
+            assert first.connector.limit_per_host == 2
+            assert "Authorization" not in first.headers
+        finally:
+            await bot.close_session()
 
-            mock_cs_cls.assert_called_once()
-            kwargs = mock_cs_cls.call_args.kwargs
-            assert kwargs["timeout"] is expected_timeout
-            assert "connector" in kwargs
+        assert first.closed
 
     @pytest.mark.asyncio
-    async def test_uses_existing_session_when_open(self, tmp_path):
-        """Если bot.session открыта, используется она, а не temp."""
-        test_file = tmp_path / "img.jpg"
-        test_file.write_bytes(b"jpeg-data")
-
-        mock_response = AsyncMock()
-        mock_response.text = AsyncMock(return_value='{"token":"t"}')
-
-        mock_cm = AsyncMock()
-        mock_cm.__aenter__.return_value = mock_response
-        mock_cm.__aexit__.return_value = False
+    async def test_upload_session_uses_connection_kwargs(self, mock_bot_token):
+        """Параметры сессии (trust_env и т.д.) доходят до загрузок."""
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                upload_timeout=42, trust_env=True
+            ),
+        )
+        try:
+            upload_session = await bot.ensure_upload_session()
 
-        mock_session = AsyncMock(spec=ClientSession)
-        mock_session.closed = False
-        mock_session.post = Mock(return_value=mock_cm)
+            assert upload_session.trust_env is True
+            assert upload_session.timeout.total == 42
+        finally:
+            await bot.close_session()
 
-        conn, _bot = _make_connection_with_bot(session=mock_session)
+    @pytest.mark.asyncio
+    async def test_upload_session_recreated_after_close(self, mock_bot_token):
+        """После close_session создаётся новая сессия загрузок."""
+        bot = Bot(token=mock_bot_token)
+        first = await bot.ensure_upload_session()
+        await bot.close_session()
+
+        second = await bot.ensure_upload_session()
+        try:
+            assert second is not first
+            assert not second.closed
+        finally:
+            await bot.close_session()
 
-        with patch(
-            "maxapi.connection.base.ClientSession",
-        ) as mock_cs_cls:
-            await conn.upload_file(
-                url="https://upload.example.com",
-                path=str(test_file),
-                type=UploadType.IMAGE,
-            )
+    @pytest.mark.asyncio
+    async def test_custom_connector_is_shared_not_owned(self, mock_bot_token):
+        """Пользовательский connector не закрывается сессией загрузок."""
+        connector = TCPConnector()
+        bot = Bot(
+            token=mock_bot_token,
+            default_connection=DefaultConnectionProperties(
+                connector=connector
+            ),
+        )
+        upload_session = await bot.ensure_upload_session()
+        assert upload_session.connector is connector
+        await upload_session.close()
 
-            mock_cs_cls.assert_not_called()
-            mock_session.post.assert_called_once()
+        assert not connector.closed
+        await connector.close()
 
 
 def assert_invalid_type_error(exc_info, invalid_value: str) -> None:
@@ -434,3 +425,78 @@ class TestInputMediaBufferTypeValidation:
         media = InputMedia(path=test_file)
 
         assert media.type == UploadType.FILE
+
+
+class TestTypeDetection:
+    """Тесты ленивого кешируемого определения типа."""
+
+    def test_constructor_does_not_read_file(self, tmp_path):
+        """Без type файл при создании InputMedia не читается."""
+        media = InputMedia(path=str(tmp_path / "missing.bin"))
+
+        with pytest.raises(FileNotFoundError):
+            _ = media.type
+
+    def test_content_type_hint_skips_sniffing(self, tmp_path):
+        """content_type задаёт тип без разбора сигнатуры."""
+        with patch(
+            "maxapi.types.input_media.puremagic.magic_string"
+        ) as mock_pm:
+            media = InputMedia(
+                path=str(tmp_path / "clip"), content_type="video/mp4"
+            )
+            buffer = InputMediaBuffer(b"data", content_type="image/png")
+
+            assert media.type == UploadType.VIDEO
+            assert buffer.type == UploadType.IMAGE
+
+        mock_pm.assert_not_called()
+
+    async def test_detect_type_cached_by_stat(self, tmp_path):
+        """Повторное определение для неизменённого файла берётся из кеша."""
+        test_file = tmp_path / "image"
+        test_file.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100)
+
+        with patch(
+            "maxapi.types.input_media.puremagic.magic_string",
+            wraps=puremagic.magic_string,
+        ) as mock_pm:
+            first = await InputMedia(path=str(test_file)).detect_type()
+            second = await InputMedia(path=str(test_file)).detect_type()
+            assert mock_pm.call_count == 1
+
+            test_file.write_bytes(b"%PDF-1.4\n" + b"\x00" * 200)
+            third = await InputMedia(path=str(test_file)).detect_type()
+
+        assert first == second == UploadType.IMAGE
+        assert third == UploadType.FILE
+        assert mock_pm.call_count == 2
+
+    async def test_buffer_detect_type_and_upload_share_sniff(self):
+        """Тип и MIME буфера определяются одним разбором сигнатуры."""
+        buffer = b"GIF89a" + b"\x00" * 100
+        mock_response = AsyncMock()
+        mock_response.text = AsyncMock(return_value='{"token":"t"}')
+        mock_cm = AsyncMock()
+        mock_cm.__aenter__.return_value = mock_response
+        mock_session = AsyncMock(spec=ClientSession)
+        mock_session.post = Mock(return_value=mock_cm)
+        conn, _bot = _make_connection_with_bot(session=mock_session)
+
+        with patch(
+            "maxapi.types.input_media.puremagic.magic_string",
+            wraps=puremagic.magic_string,
+        ) as mock_pm:
+            media = InputMediaBuffer(buffer, filename="anim")
+            assert await media.detect_type() == UploadType.IMAGE
+            await conn.upload_file_buffer(
+                filename="anim",
+                url="https://upload.example.com",
+                buffer=buffer,
+                type=media.type,
+            )
+
+        assert mock_pm.call_count == 1
+        form = mock_session.post.call_args.kwargs["data"]
+        field = next(f for f in form._fields if f[0].get("name") == "data")
+        assert field[0].get("filename") == "anim.gif"
@@ -1,13 +1,16 @@
+import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from maxapi.client import DefaultConnectionProperties
 from maxapi.enums.upload_type import UploadType
 from maxapi.exceptions.max import MaxUploadFileFailed
 from maxapi.types.input_media import InputMediaBuffer
 from maxapi.utils.message import (
     _extract_upload_token_from_response,
     process_input_media,
+    process_input_media_batch,
 )
 
 
@@ -67,6 +70,7 @@ class TestProcessInputMedia:
             )
         )
         bot.session = None
+        bot.upload_cache = None
 
         media = InputMediaBuffer(
             buffer=b"test-data",
@@ -99,6 +103,7 @@ class TestProcessInputMedia:
                 token=None,
             )
         )
+        bot.upload_cache = None
         media = InputMediaBuffer(
             buffer=b"video-bytes",
             filename="video.mp4",
@@ -114,3 +119,95 @@ class TestProcessInputMedia:
                 bot=bot,
                 att=media,
             )
+
+
+class TestProcessInputMediaBatch:
+    @staticmethod
+    def _bot(concurrency):
+        bot = Mock()
+        bot.upload_cache = None
+        bot.default_connection = DefaultConnectionProperties(
+            upload_concurrency=concurrency
+        )
+        bot.get_upload_url = AsyncMock(
+            return_value=SimpleNamespace(
+                url="https://upload.local", token=None
+            )
+        )
+        return bot
+
+    async def test_runs_concurrently_and_keeps_order(self):
+        active = 0
+        peak = 0
+
+        async def upload(*, filename, **_):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            # Первые файлы загружаются дольше последних.
+            await asyncio.sleep(0.01 * (5 - int(filename)))
+            active -= 1
+            return f'{{"token":"t{filename}"}}'
+
+        base_connection = Mock()
+        base_connection.upload_file_buffer = AsyncMock(side_effect=upload)
+        media = [
+            InputMediaBuffer(
+                buffer=b"data", filename=str(i), type=UploadType.FILE
+            )
+            for i in range(5)
+        ]
+
+        uploaded = await process_input_media_batch(
+            base_connection=base_connection,
+            bot=self._bot(3),
+            attachments=media,
+        )
+
+        assert [u.payload.token for u in uploaded] == [
+            f"t{i}" for i in range(5)
+        ]
+        assert peak == 3
+
+    async def test_failure_cancels_remaining(self):
+        cancelled = []
+
+        async def upload(*, filename, **_):
+            if filename == "0":
+                raise MaxUploadFileFailed("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(filename)
+                raise
+            return '{"token":"t"}'
+
+        base_connection = Mock()
+        base_connection.upload_file_buffer = AsyncMock(side_effect=upload)
+        media = [
+            InputMediaBuffer(
+                buffer=b"data", filename=str(i), type=UploadType.FILE
+            )
+            for i in range(3)
+        ]
+
+        with pytest.raises(MaxUploadFileFailed, match="boom"):
+            await process_input_media_batch(
+                base_connection=base_connection,
+                bot=self._bot(4),
+                attachments=media,
+            )
+
+        assert sorted(cancelled) == ["1", "2"]
+
+    async def test_empty(self):
+        assert (
+            await process_input_media_batch(
+                base_connection=Mock(), bot=Mock(), attachments=[]
+            )
+            == []
+        )
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError, match="upload_concurrency"):
+            DefaultConnectionProperties(upload_concurrency=0)
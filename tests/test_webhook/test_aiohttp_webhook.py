@@ -2,12 +2,14 @@
 
 import asyncio
 from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock
 
 import maxapi.webhook.base as integration_module
 import pytest
 from aiohttp import web
 from aiohttp.test_utils import TestClient, TestServer
 from maxapi import Dispatcher
+from maxapi.utils import KeyedWorkerPool
 from maxapi.webhook.aiohttp import AiohttpMaxWebhook
 
 
@@ -126,6 +128,26 @@ async def test_use_create_task_schedules_handle_as_task(monkeypatch):
     assert len(tasks_created) == 1
 
 
+async def test_worker_pool_receives_event_by_ids(monkeypatch):
+    """С worker_pool событие передаётся в пул с ключом get_ids()."""
+    pool = KeyedWorkerPool(2)
+    pool.submit = AsyncMock()
+    dp = Dispatcher(worker_pool=pool)
+    _patch_startup(dp)
+
+    event = Mock()
+    event.get_ids.return_value = (1, 2)
+    _patch_process(monkeypatch, return_value=event)
+
+    wh = AiohttpMaxWebhook(dp=dp, bot=DummyBot())
+
+    async with TestClient(TestServer(wh.create_app(path="/"))) as client:
+        resp = await client.post("/", json={"update_type": "MESSAGE_CREATED"})
+        assert resp.status == HTTPStatus.OK
+
+    pool.submit.assert_awaited_once_with((1, 2), dp.handle, event)
+
+
 # ---------------------------------------------------------------------------
 # create_app
 # ---------------------------------------------------------------------------
@@ -2,10 +2,13 @@ import pytest
 
 pytest.importorskip("fastapi")
 
+from unittest.mock import AsyncMock
+
 import maxapi.webhook.base as integration_module
 from fastapi.testclient import TestClient
 from maxapi import Dispatcher
 from maxapi.types.updates import UNKNOWN_UPDATE_DISCLAIMER
+from maxapi.utils import AdmissionController
 from maxapi.webhook.fastapi import (
     DEFAULT_PATH,
     FastAPIMaxWebhook,
@@ -192,3 +195,23 @@ async def test_handle_webhook_custom_path_serves_at_that_path(monkeypatch):
 
     resp_root = client.post("/", json=payload)
     assert resp_root.status_code == 404
+
+
+async def test_handle_webhook_overloaded_returns_503(monkeypatch):
+    """Если admission отклонил событие, ручка отвечает 503 с Retry-After."""
+    admission = AdmissionController(retry_after=5)
+    admission.submit = AsyncMock(return_value=False)
+    dp = Dispatcher(admission=admission)
+    dp.startup = AsyncMock()
+
+    monkeypatch.setattr(
+        integration_module, "parse_update", lambda event_json: DummyEvent()
+    )
+
+    webhook = FastAPIMaxWebhook(dp=dp, bot=DummyBot())
+    client = TestClient(webhook.create_app(path=DEFAULT_PATH))
+
+    resp = client.post("/", json={"update_type": "MESSAGE_CREATED"})
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "5"
@@ -2,12 +2,14 @@
 
 import asyncio
 from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock
 
 import maxapi.webhook.base as integration_module
 import pytest
 from litestar import Litestar
 from litestar.testing import TestClient
 from maxapi import Dispatcher
+from maxapi.utils import AdmissionController
 from maxapi.webhook.litestar import LitestarMaxWebhook
 
 
@@ -314,3 +316,24 @@ async def test_run_raises_import_error_without_uvicorn(monkeypatch):
     wh = LitestarMaxWebhook(dp=dp, bot=DummyBot())
     with pytest.raises(ImportError, match="uvicorn is not installed"):
         await wh.run()
+
+
+async def test_overloaded_returns_503(monkeypatch):
+    """Если admission отклонил событие, ручка отвечает 503 с Retry-After."""
+    admission = AdmissionController(retry_after=5)
+    admission.submit = AsyncMock(return_value=False)
+    dp = Dispatcher(admission=admission)
+    _patch_startup(dp)
+
+    event = Mock(update_type="message_created")
+    monkeypatch.setattr(
+        integration_module, "parse_update", lambda event_json: event
+    )
+
+    wh = LitestarMaxWebhook(dp=dp, bot=DummyBot())
+
+    with TestClient(wh.create_app(path="/")) as client:
+        resp = client.post("/", json={"update_type": "MESSAGE_CREATED"})
+
+    assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert resp.headers["Retry-After"] == "5"
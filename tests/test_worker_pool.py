@@ -0,0 +1,153 @@
+"""Тесты пула воркеров с упорядочиванием по ключу."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from maxapi.dispatcher import Dispatcher
+from maxapi.utils import KeyedWorkerPool
+
+
+async def _wait_until(predicate):
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("условие не выполнилось")
+
+
+class TestKeyedWorkerPool:
+    async def test_same_key_serial_other_keys_parallel(self):
+        pool = KeyedWorkerPool(2)
+        log = []
+        active = set()
+        overlaps = []
+
+        async def job(key, n):
+            assert key not in active
+            active.add(key)
+            overlaps.append(len(active))
+            await asyncio.sleep(0.01)
+            log.append((key, n))
+            active.discard(key)
+
+        # ключи 0 и 1 попадают к разным воркерам
+        for n in range(3):
+            await pool.submit(0, job, 0, n)
+            await pool.submit(1, job, 1, n)
+        await pool.close()
+
+        assert [n for key, n in log if key == 0] == [0, 1, 2]
+        assert [n for key, n in log if key == 1] == [0, 1, 2]
+        assert max(overlaps) == 2
+
+    async def test_in_flight_cap_blocks_submit(self):
+        pool = KeyedWorkerPool(4, max_in_flight=2)
+        release = asyncio.Event()
+
+        await pool.submit("a", release.wait)
+        await pool.submit("b", release.wait)
+        blocked = asyncio.create_task(pool.submit("c", release.wait))
+        await asyncio.sleep(0)
+
+        assert pool.in_flight == 2
+        assert not blocked.done()
+
+        release.set()
+        await blocked
+        await pool.close()
+
+        assert pool.in_flight == 0
+
+    async def test_per_key_cap_blocks_only_that_key(self):
+        pool = KeyedWorkerPool(4, max_per_key=1)
+        release = asyncio.Event()
+
+        await pool.submit("hot", release.wait)
+        blocked = asyncio.create_task(pool.submit("hot", release.wait))
+        await pool.submit("other", AsyncMock())
+        await asyncio.sleep(0)
+
+        assert not blocked.done()
+        assert pool.pending("hot") == 1
+
+        release.set()
+        await blocked
+        await pool.close()
+
+        assert pool.pending("hot") == 0
+
+    async def test_job_error_does_not_stop_worker(self):
+        pool = KeyedWorkerPool(1)
+        done = AsyncMock()
+
+        await pool.submit("k", AsyncMock(side_effect=RuntimeError("boom")))
+        await pool.submit("k", done)
+        await pool.close()
+
+        done.assert_awaited_once()
+
+    async def test_close_stops_workers_and_pool_restarts(self):
+        pool = KeyedWorkerPool(2)
+        job = AsyncMock()
+
+        await pool.submit("k", job)
+        await pool.close()
+
+        assert pool._tasks == []
+
+        await pool.submit("k", job)
+        await pool.close()
+
+        assert job.await_count == 2
+
+    async def test_run_returns_result_and_raises(self):
+        pool = KeyedWorkerPool(1)
+
+        assert await pool.run("k", AsyncMock(return_value=42)) == 42
+        with pytest.raises(RuntimeError, match="boom"):
+            await pool.run("k", AsyncMock(side_effect=RuntimeError("boom")))
+        await pool.close()
+
+        assert pool.in_flight == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"workers": 0}, {"max_in_flight": 0}, {"max_per_key": 0}],
+    )
+    def test_invalid_limits(self, kwargs):
+        with pytest.raises(ValueError, match=next(iter(kwargs))):
+            KeyedWorkerPool(**kwargs)
+
+
+class TestDispatcherWorkerPool:
+    async def test_events_submitted_by_ids(self, bot):
+        pool = KeyedWorkerPool(2)
+        dp = Dispatcher(worker_pool=pool)
+        dp.bot = bot
+        events = [Mock(timestamp=0), Mock(timestamp=0)]
+        events[0].get_ids.return_value = (1, 10)
+        events[1].get_ids.return_value = (2, 20)
+        handled = []
+
+        async def handle(event):
+            handled.append(event)
+
+        dp.handle = handle
+
+        with patch(
+            "maxapi.dispatcher.process_update_request",
+            new=AsyncMock(return_value=events),
+        ):
+            await dp._dispatch_fetched_events(
+                {"updates": [], "marker": 5},
+                current_timestamp=0,
+                skip_updates=False,
+            )
+
+        await _wait_until(lambda: len(handled) == 2)
+        assert bot.marker_updates == 5
+
+        await dp.stop_polling()
+
+        assert pool._tasks == []